@@ -1,13 +1,26 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from io import BytesIO
 import os
-from utils.pdf_processor import PDFProcessor
+import time
+import hashlib
+import threading
+import subprocess
+import sys
+import uuid
+from collections import OrderedDict
+import importlib.util
+from concurrent.futures import as_completed, wait
+from contextlib import nullcontext
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from utils.document_processor import DocumentProcessor
 from utils.nlp_processor import NLPProcessor
 from utils.scoring_engine import ScoringEngine
-from utils.report_generator import ReportGenerator
+from utils.batch_scheduler import MicroBatchScheduler
+from utils.work_scheduler import FairWorkScheduler
+from utils.metrics_store import MetricsStore, RunMetrics, SCORE_BUCKETS
+from utils.idf_store import IDFStore
+from utils.job_artifacts import JobArtifactStore
+from utils.job_queue import JobQueue, QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED, FINISHED_STATES
+from utils.instrumentation import instrumentation
 from sample_data.job_descriptions import SAMPLE_JOB_DESCRIPTIONS
 
 # Page configuration
@@ -18,21 +31,103 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Number of ranking results kept per session across reruns
+MAX_CACHED_RANKINGS = 5
+
+# Batches larger than this switch to aggregate charts
+LARGE_BATCH_THRESHOLD = 50
+
+# Default estimated similarity above which two resumes count as duplicates
+DEFAULT_DUPLICATE_THRESHOLD = 0.8
+
+# Admission limits for a single ranking run; shared deployments can tighten them
+MAX_UPLOAD_FILES = int(os.environ.get("RESUME_RANKER_MAX_FILES", 500))
+MAX_FILE_SIZE_MB = float(os.environ.get("RESUME_RANKER_MAX_FILE_MB", 10))
+MAX_UPLOAD_SIZE_MB = float(os.environ.get("RESUME_RANKER_MAX_UPLOAD_MB", 200))
+
+# Micro-batching knobs of the shared scoring scheduler; process-wide, so set by the deployment
+SCHEDULER_MAX_BATCH_SIZE = int(os.environ.get("RESUME_RANKER_MAX_BATCH_SIZE", 32))
+SCHEDULER_MAX_WAIT_MS = float(os.environ.get("RESUME_RANKER_MAX_WAIT_MS", 50))
+
+# Extraction workers shared by every session on this server
+WORK_SCHEDULER_WORKERS = int(os.environ.get("RESUME_RANKER_WORKERS", min(4, os.cpu_count() or 1)))
+
+# A job worker process is started at most this often while background jobs wait
+WORKER_START_INTERVAL_SECONDS = 30
+
+# Rows per page in the results table and detailed analysis
+RESULTS_PAGE_SIZE = 50
+
+# Display names for the score components, in table order
+SCORE_COLUMNS = {
+    'overall_score': 'Overall Score',
+    'keyword_score': 'Keyword Match',
+    'skills_score': 'Skills Match',
+    'experience_score': 'Experience Score',
+    'tfidf_similarity': 'TF-IDF Similarity'
+}
+COMPONENT_COLUMNS = list(SCORE_COLUMNS.values())[1:]
+
+# Display names for score components that only some relevance models produce
+OPTIONAL_SCORE_COLUMNS = {
+    'bm25_score': 'BM25 Relevance'
+}
+
+def component_columns(frame):
+    """Component columns of a score frame, with the lexical one of the model the results were ranked with"""
+    if OPTIONAL_SCORE_COLUMNS['bm25_score'] in frame.columns:
+        return [
+            OPTIONAL_SCORE_COLUMNS['bm25_score'] if column == SCORE_COLUMNS['tfidf_similarity'] else column
+            for column in COMPONENT_COLUMNS
+        ]
+    return COMPONENT_COLUMNS
+
 # Initialize processors with error handling
 @st.cache_resource
 def initialize_processors():
-    """Initialize and cache the NLP processor to avoid reloading models"""
+    """Initialize and cache the processors; heavy models and libraries load on first use"""
     try:
+        nlp_processor = NLPProcessor()
+        idf_store = IDFStore()
+        
+        # Sample and saved job descriptions are prepared once, in the background, and persisted
+        job_artifacts = JobArtifactStore(nlp_processor, ScoringEngine())
+        
+        # Shared by every session; sessions derive engines with their own settings from it
+        scoring_engine = ScoringEngine(idf_store=idf_store, job_artifacts=job_artifacts)
+        job_artifacts.build_in_background(
+            list(SAMPLE_JOB_DESCRIPTIONS.values()) + list(job_artifacts.saved_jobs().values())
+        )
+        
+        # Expired jobs are also purged by workers, but none may run for a while
+        job_queue = JobQueue()
+        job_queue.purge()
         return {
-            'pdf_processor': PDFProcessor(),
-            'nlp_processor': NLPProcessor(),
-            'scoring_engine': ScoringEngine(),
-            'report_generator': ReportGenerator()
+            'document_processor': DocumentProcessor(),
+            'nlp_processor': nlp_processor,
+            'scoring_engine': scoring_engine,
+            'batch_scheduler': MicroBatchScheduler(
+                nlp_processor,
+                scoring_engine,
+                max_batch_size=SCHEDULER_MAX_BATCH_SIZE,
+                max_wait_ms=SCHEDULER_MAX_WAIT_MS
+            ),
+            'work_scheduler': FairWorkScheduler(max_workers=WORK_SCHEDULER_WORKERS),
+            'metrics_store': MetricsStore(),
+            'idf_store': idf_store,
+            'job_artifacts': job_artifacts,
+            'job_queue': job_queue
         }
     except Exception as e:
         st.error(f"Failed to initialize processors: {str(e)}")
         return None
 
+@st.cache_resource
+def get_report_generator():
+    """Build the report generator, importing ReportLab only when a report is first requested"""
+    from utils.report_generator import ReportGenerator
+    return ReportGenerator()
+
 # Try to initialize processors
 try:
     processors = initialize_processors()
@@ -51,41 +146,222 @@ def main():
         st.header("Navigation")
         page = st.selectbox(
             "Choose a page:",
-            ["Resume Ranking", "Analytics Dashboard", "About"]
+            ["Resume Ranking", "My Jobs", "Analytics Dashboard", "About"]
         )
+        
+        scoring_settings()
+        scheduler_settings()
+        deduplication_settings()
+        instrumentation_settings()
     
     if page == "Resume Ranking":
         resume_ranking_page()
+    elif page == "My Jobs":
+        my_jobs_page()
     elif page == "Analytics Dashboard":
         analytics_dashboard()
     else:
         about_page()
 
+def scheduler_settings():
+    """Sidebar settings and metrics of the micro-batching scoring scheduler"""
+    if not processors:
+        return
+    
+    scheduler = processors['batch_scheduler']
+    
+    with st.expander("⚙️ Scoring Scheduler"):
+        # The scheduler is shared by every session, so its knobs are deployment settings
+        st.caption(
+            f"Max batch size: {scheduler.max_batch_size} · Max wait: {scheduler.max_wait_ms:g} ms "
+            f"(set with RESUME_RANKER_MAX_BATCH_SIZE and RESUME_RANKER_MAX_WAIT_MS)"
+        )
+        
+        metrics = scheduler.get_metrics()
+        st.caption(
+            f"Queue depth: {metrics['queue_depth']} (peak {metrics['max_queue_depth']}) · "
+            f"Batches: {metrics['batches_processed']} · "
+            f"Avg batch: {metrics['avg_batch_size']:.1f} · "
+            f"Avg batch time: {metrics['avg_batch_ms']:.0f} ms · "
+            f"Avg queue wait: {metrics['avg_queue_wait_ms']:.0f} ms"
+        )
+        
+        work_metrics = processors['work_scheduler'].get_metrics()
+        st.caption(
+            f"Extraction workers: {work_metrics['busy_workers']}/{work_metrics['max_workers']} busy · "
+            f"Pending files: {work_metrics['pending']} from {work_metrics['queued_sessions']} session(s) · "
+            f"Avg wait: {work_metrics['avg_wait_ms']:.0f} ms"
+        )
+
+def scoring_settings():
+    """Sidebar control for the relevance model behind the semantic score component"""
+    if not processors:
+        return
+    
+    scoring_engine = get_scoring_engine()
+    models = {'tfidf': "TF-IDF cosine", 'bm25': "BM25+"}
+    
+    with st.expander("🎯 Scoring Model"):
+        model = st.radio(
+            "Relevance model",
+            list(models),
+            index=list(models).index(scoring_engine.relevance_model),
+            format_func=models.get,
+            help="BM25+ scores every resume against the job description in one pass, "
+                 "with length normalization so long resumes are not favored"
+        )
+        
+        vectorizations = {
+            'fitted': "Fitted vocabulary",
+            'hashing': "Hashing (streaming)",
+            'global': "Global IDF (historical corpus)"
+        }
+        vectorization = st.radio(
+            "TF-IDF vectorization",
+            list(vectorizations),
+            index=list(vectorizations).index(scoring_engine.vectorization),
+            format_func=vectorizations.get,
+            help="Hashing needs no vocabulary: IDF comes from running document frequencies of "
+                 "every distinct resume uploaded so far, counted for the whole upload before scoring. "
+                 "Global IDF uses statistics learned from past resumes, so scores are "
+                 "comparable across runs"
+        )
+        
+        update_idf_store = scoring_engine.update_idf_store
+        if vectorization == 'global':
+            update_idf_store = st.toggle(
+                "Learn from new resumes",
+                value=update_idf_store,
+                help="Add scored resumes to the historical corpus after ranking"
+            )
+            try:
+                stats = processors['idf_store'].get_stats()
+                if stats['num_docs']:
+                    st.caption(f"{stats['num_docs']:,} resumes, {stats['vocabulary_size']:,} terms")
+                else:
+                    st.caption("The corpus is empty; fitted TF-IDF is used until resumes are added. "
+                               "Build it with `python -m utils.idf_store build <folder>`.")
+            except Exception as e:
+                st.warning(f"Could not read IDF statistics: {str(e)}")
+    
+    # The cached engine is shared by every session, so this session's settings live in a
+    # derived engine (the same one while the settings are unchanged)
+    st.session_state['scoring_engine'] = scoring_engine.with_options(
+        relevance_model=model,
+        vectorization=vectorization,
+        update_idf_store=update_idf_store
+    )
+
+def get_scoring_engine():
+    """Scoring engine with this session's settings"""
+    return st.session_state.get('scoring_engine') or processors['scoring_engine']
+
+def deduplication_settings():
+    """Sidebar controls for near-duplicate resume detection"""
+    with st.expander("🔁 Duplicate Detection"):
+        st.toggle(
+            "Group near-duplicate resumes",
+            value=True,
+            key='dedup_enabled',
+            help="Score one copy of resumes submitted several times and list the copies with it"
+        )
+        st.slider(
+            "Similarity threshold",
+            min_value=0.5,
+            max_value=1.0,
+            value=DEFAULT_DUPLICATE_THRESHOLD,
+            step=0.05,
+            key='dedup_threshold',
+            help="Estimated share of overlapping text at which two resumes count as duplicates"
+        )
+
+def get_duplicate_threshold():
+    """Similarity threshold for duplicate detection in this session, or None if disabled"""
+    if not st.session_state.get('dedup_enabled', True):
+        return None
+    return st.session_state.get('dedup_threshold', DEFAULT_DUPLICATE_THRESHOLD)
+
+def instrumentation_settings():
+    """Sidebar controls for stage timers and per-run profiling"""
+    with st.expander("🔬 Instrumentation"):
+        # The timings are process-wide: only an actual change of the toggle is applied,
+        # and every session shows the current state
+        st.session_state['record_timings'] = instrumentation.enabled
+        st.toggle(
+            "Record stage timings",
+            key='record_timings',
+            on_change=lambda: instrumentation.enable(st.session_state['record_timings']),
+            help="Applies to every session on this server"
+        )
+        
+        st.selectbox(
+            "Profile each run",
+            ["Off", "cProfile", "pyinstrument"],
+            key='profile_mode',
+            help="Captures a profile of every ranking run; view it on the Analytics Dashboard"
+        )
+
 def resume_ranking_page():
     st.header("📄 Resume Ranking")
     
+    # Load the SpaCy model in the background while the user fills in the form
+    nlp_processor = processors['nlp_processor']
+    nlp_processor.load_model_async()
+    if nlp_processor.model_loaded and nlp_processor.fallback_warning:
+        st.warning(nlp_processor.fallback_warning)
+    
     # Job Description Input
     st.subheader("1. Job Description")
     
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        # Option to use sample job descriptions
-        use_sample = st.checkbox("Use sample job description")
+        job_artifacts = processors['job_artifacts']
+        saved_jobs = job_artifacts.saved_jobs()
         
-        if use_sample:
+        # Sample job descriptions, then the user's saved library
+        sources = ["Enter manually", "Sample job description"] + (["Saved job description"] if saved_jobs else [])
+        source = st.radio("Job description source", sources, horizontal=True)
+        
+        if source == "Sample job description":
             selected_job = st.selectbox(
                 "Select a sample job description:",
                 list(SAMPLE_JOB_DESCRIPTIONS.keys())
             )
             job_description = SAMPLE_JOB_DESCRIPTIONS[selected_job]
             st.text_area("Job Description:", value=job_description, height=200, disabled=True)
+        elif source == "Saved job description":
+            selected_job = st.selectbox("Select a saved job description:", list(saved_jobs))
+            job_description = saved_jobs[selected_job]
+            st.text_area("Job Description:", value=job_description, height=200, disabled=True)
+            if st.button("🗑️ Remove from library"):
+                job_artifacts.delete_job(selected_job)
+                st.rerun()
         else:
             job_description = st.text_area(
                 "Enter job description:",
                 height=200,
                 placeholder="Paste the job description here..."
             )
+            
+            if job_description:
+                name_col, save_col = st.columns([3, 1])
+                with name_col:
+                    job_name = st.text_input(
+                        "Save as",
+                        value=next((line.strip() for line in job_description.splitlines() if line.strip()), "")[:60],
+                        help="Saved job descriptions are prepared once and can be reused without reprocessing"
+                    )
+                with save_col:
+                    st.write("")
+                    st.write("")
+                    if st.button("💾 Save to library", disabled=not job_name.strip()):
+                        try:
+                            with st.spinner("Preparing job description..."):
+                                job_artifacts.save_job(job_name.strip(), job_description)
+                            st.success(f"Saved \"{job_name.strip()}\"")
+                        except Exception as e:
+                            st.error(f"Could not save job description: {str(e)}")
     
     with col2:
         st.info("💡 **Tips:**\n\n• Include key skills and requirements\n• Mention specific technologies\n• Add experience requirements\n• Include soft skills")
@@ -94,254 +370,1117 @@ def resume_ranking_page():
     st.subheader("2. Upload Resumes")
     
     uploaded_files = st.file_uploader(
-        "Choose PDF resume files",
-        type=['pdf'],
+        "Choose resume files",
+        type=processors['document_processor'].supported_types,
         accept_multiple_files=True,
-        help="Upload multiple PDF resumes to rank against the job description"
+        help=f"Upload up to {MAX_UPLOAD_FILES} resumes as PDF, DOCX, TXT or RTF ({MAX_FILE_SIZE_MB:g} MB each, "
+             f"{MAX_UPLOAD_SIZE_MB:g} MB in total) to rank against the job description"
     )
     
+    upload_problems = check_upload_limits(uploaded_files or [])
+    for problem in upload_problems:
+        st.error(problem)
+    
+    ranking_key = ranking_cache_key(job_description, uploaded_files) if job_description and uploaded_files else None
+    
     # Processing and Results
-    if st.button("🚀 Analyze Resumes", type="primary", disabled=not (job_description and uploaded_files)):
+    can_analyze = bool(job_description and uploaded_files) and not upload_problems
+    analyze_col, background_col = st.columns(2)
+    with analyze_col:
+        analyze = st.button("🚀 Analyze Resumes", type="primary", disabled=not can_analyze)
+    with background_col:
+        run_in_background = st.button(
+            "🕒 Run in Background",
+            disabled=not can_analyze,
+            help="Queue the ranking on the server; it keeps running if you close the page "
+                 "and the results appear under My Jobs"
+        )
+    
+    if run_in_background:
+        submit_background_job(job_description, uploaded_files)
+    
+    if analyze:
         if job_description and uploaded_files:
-            with st.spinner("Processing resumes... This may take a moment."):
-                results = process_resumes(job_description, uploaded_files)
+            if get_cached_ranking(ranking_key) is None:
+                results = process_resumes_progressively(job_description, uploaded_files)
                 
-            if results:
-                display_results(results, job_description)
+                if results:
+                    store_ranking(ranking_key, job_description, results)
+            
+            st.session_state['active_ranking'] = ranking_key
         else:
             st.warning("Please provide both job description and resume files.")
+    
+    # Show the ranking for the current inputs, or the last one analysed if the
+    # uploads were cleared (e.g. after navigating to another page and back)
+    active_key = st.session_state.get('active_ranking')
+    if ranking_key is not None and active_key != ranking_key:
+        active_key = ranking_key if get_cached_ranking(ranking_key) is not None else None
+    
+    ranking = get_cached_ranking(active_key)
+    if ranking is not None:
+        display_results(ranking['results'], ranking['job_description'], ranking)
+
+def check_upload_limits(uploaded_files):
+    """
+    Check an upload against the per-run admission limits
+    
+    Args:
+        uploaded_files (list): Streamlit uploaded file objects
+    
+    Returns:
+        list: Messages describing each exceeded limit (empty if the upload is accepted)
+    """
+    problems = []
+    if len(uploaded_files) > MAX_UPLOAD_FILES:
+        problems.append(f"{len(uploaded_files)} files uploaded; at most {MAX_UPLOAD_FILES} can be ranked at once.")
+    
+    oversized = [f.name for f in uploaded_files if f.size > MAX_FILE_SIZE_MB * 1024 * 1024]
+    if oversized:
+        problems.append(
+            f"{len(oversized)} file(s) exceed {MAX_FILE_SIZE_MB:g} MB: {', '.join(oversized[:5])}"
+            + ("..." if len(oversized) > 5 else "")
+        )
+    
+    total_mb = sum(f.size for f in uploaded_files) / (1024 * 1024)
+    if total_mb > MAX_UPLOAD_SIZE_MB:
+        problems.append(f"The upload is {total_mb:.0f} MB; at most {MAX_UPLOAD_SIZE_MB:g} MB can be ranked at once.")
+    
+    return problems
+
+def get_session_id():
+    """Identifier of the current browser session, used to schedule its work fairly"""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "default"
+
+def extract_in_session(script_ctx, uploaded_file, run_metrics):
+    """Extract a resume on a shared worker, with extraction warnings shown in the submitting session"""
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, script_ctx)
+    try:
+        return processors['document_processor'].extract_text(uploaded_file, metrics=run_metrics)
+    finally:
+        add_script_run_ctx(thread, None)
+
+def get_owner_token():
+    """
+    Token identifying this user's background jobs
+    
+    Kept in the page address, so bookmarking the page keeps access to the jobs
+    across visits and browser restarts.
+    """
+    owner = st.query_params.get('owner')
+    if not owner:
+        owner = st.session_state.get('job_owner') or uuid.uuid4().hex
+        st.query_params['owner'] = owner
+    st.session_state['job_owner'] = owner
+    return owner
+
+@st.cache_resource
+def get_worker_launcher():
+    """Process-wide record of the job worker started by this server"""
+    return {'lock': threading.Lock(), 'process': None, 'started_at': 0.0}
+
+def ensure_job_worker():
+    """Start a background worker process if jobs are waiting and no worker is alive"""
+    job_queue = processors['job_queue']
+    launcher = get_worker_launcher()
+    
+    with launcher['lock']:
+        process = launcher['process']
+        if process is not None and process.poll() is None:
+            return
+        # A worker that keeps failing at startup is not restarted on every rerun
+        if time.time() - launcher['started_at'] < WORKER_START_INTERVAL_SECONDS:
+            return
+        
+        try:
+            if job_queue.live_workers() or not job_queue.has_work():
+                return
+            
+            log_path = os.path.join(os.path.dirname(job_queue.db_path), "job_worker.log")
+            with open(log_path, 'a') as log:
+                # Own session, so the worker outlives a restart of the app server
+                launcher['process'] = subprocess.Popen(
+                    [sys.executable, '-m', 'utils.job_worker'],
+                    cwd=os.path.dirname(os.path.abspath(__file__)),
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
+            launcher['started_at'] = time.time()
+        except Exception as e:
+            st.warning(f"Could not start the background worker: {str(e)}")
 
-def process_resumes(job_description, uploaded_files):
-    """Process uploaded resumes and return ranking results"""
+def submit_background_job(job_description, uploaded_files):
+    """Queue a ranking with this session's settings for a background worker"""
+    scoring_engine = get_scoring_engine()
+    settings = {
+        'scoring': {
+            'relevance_model': scoring_engine.relevance_model,
+            'vectorization': scoring_engine.vectorization,
+            'update_idf_store': scoring_engine.update_idf_store
+        },
+        'duplicate_threshold': get_duplicate_threshold()
+    }
+    
     try:
-        if not processors:
-            st.error("System not properly initialized. Please refresh the page.")
-            return None
+        job_id = processors['job_queue'].submit(
+            get_owner_token(),
+            job_description,
+            [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files],
+            settings
+        )
+    except Exception as e:
+        st.error(f"Could not queue the job: {str(e)}")
+        return
+    
+    ensure_job_worker()
+    st.success(
+        f"Job `{job_id}` queued with {len(uploaded_files)} resume(s). Follow it under **My Jobs**; "
+        f"it keeps running if you close this page."
+    )
+
+def ranking_cache_key(job_description, uploaded_files):
+    """
+    Build a cache key from the job description and the content of every uploaded file
+    
+    Args:
+        job_description (str): Job description text
+        uploaded_files (list): Streamlit uploaded file objects
+        
+    Returns:
+        str: Hex digest identifying this ranking request
+    """
+    digest = hashlib.sha256(job_description.encode('utf-8'))
+    digest.update(repr(get_duplicate_threshold()).encode('utf-8'))
+    if processors:
+        scoring_engine = get_scoring_engine()
+        digest.update(scoring_engine.relevance_model.encode('utf-8'))
+        digest.update(scoring_engine.vectorization.encode('utf-8'))
+    for uploaded_file in uploaded_files:
+        digest.update(hashlib.sha256(uploaded_file.getvalue()).digest())
+    return digest.hexdigest()
+
+def get_cached_ranking(key):
+    """Return the cached ranking entry for a key, marking it as recently used"""
+    cache = st.session_state.get('ranking_cache')
+    if key is None or not cache or key not in cache:
+        return None
+    
+    cache.move_to_end(key)
+    return cache[key]
+
+def store_ranking(key, job_description, results):
+    """Store ranking results in the session, evicting the least recently used entries"""
+    cache = st.session_state.setdefault('ranking_cache', OrderedDict())
+    if key in cache:
+        discard_report(cache[key])
+    cache[key] = {
+        'job_description': job_description,
+        'results': results,
+        'report': None
+    }
+    cache.move_to_end(key)
+    
+    while len(cache) > MAX_CACHED_RANKINGS:
+        _, evicted = cache.popitem(last=False)
+        discard_report(evicted)
+
+def discard_job_snapshots(job_id):
+    """
+    Drop cached rankings of earlier progress of a background job
+    
+    A running job is cached once per number of finished files; only the latest
+    snapshot is kept, so batch reports cover each job once.
+    """
+    cache = st.session_state.get('ranking_cache')
+    if not cache:
+        return
+    for key in [key for key in cache if key.startswith(f"job:{job_id}:")]:
+        discard_report(cache.pop(key))
+
+def discard_report(ranking):
+    """Delete the temporary report and export files belonging to a cached ranking, if any"""
+    discard_file(ranking.get('report'))
+    ranking['report'] = None
+    for path in ranking.pop('exports', {}).values():
+        discard_file(path)
+
+def discard_file(path):
+    """Delete a temporary file, ignoring files that are already gone"""
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def process_resumes_progressively(job_description, uploaded_files):
+    """Process resumes while showing live progress, per-file status and a partial ranking"""
+    import pandas as pd
+    
+    if not processors:
+        st.error("System not properly initialized. Please refresh the page.")
+        return None
+    
+    total = len(uploaded_files)
+    statuses = {i: {'File': f.name, 'Status': '⏳ Queued'} for i, f in enumerate(uploaded_files)}
+    results = []
+    
+    progress_bar = st.progress(0.0, text=f"Processing 0 of {total} resumes...")
+    ranking_placeholder = st.empty()
+    with st.expander("📂 File Status", expanded=total <= 20):
+        status_placeholder = st.empty()
+    
+    last_refresh = 0.0
+    with profiling_context() as profile_run:
+        for event in iter_process_resumes(job_description, uploaded_files):
+            if event['status'] == 'waiting':
+                queue = event['queue']
+                progress_bar.progress(
+                    event['completed'] / total,
+                    text=f"Waiting for a free worker: {queue['position']} session(s) ahead, "
+                         f"{queue['busy_workers']} of {queue['max_workers']} workers busy..."
+                )
+                continue
+            
+            index = event['index']
+            if event['status'] == 'extracted':
+                statuses[index]['Status'] = '📄 Extracted, scoring...'
+            elif event['status'] == 'scored':
+                statuses[index]['Status'] = f"✅ Scored ({event['result']['scores']['overall_score']:.1f}%)"
+                results.append(event['result'])
+            elif event['status'] == 'duplicate':
+                statuses[index]['Status'] = f"🔁 Duplicate of {event['duplicate_of']} ({event['similarity']:.0%})"
+            else:
+                statuses[index]['Status'] = f"❌ {event['error']}"
             
-        results = []
+            # Redraw at most a few times per second so large batches stay responsive
+            now = time.perf_counter()
+            finished = event['completed'] == total
+            if finished or now - last_refresh > 0.25:
+                last_refresh = now
+                progress_bar.progress(
+                    event['completed'] / total,
+                    text=f"Processed {event['completed']} of {total} resumes..."
+                )
+                status_placeholder.dataframe(
+                    pd.DataFrame(list(statuses.values())),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                if results and not finished:
+                    ranking_placeholder.dataframe(
+                        build_results_table(sorted(results, key=lambda x: x['scores']['overall_score'], reverse=True)),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+    
+    progress_bar.empty()
+    ranking_placeholder.empty()
+    if profile_run is not None:
+        st.session_state['last_profile_report'] = profile_run.report
+    
+    results.sort(key=lambda x: x['scores']['overall_score'], reverse=True)
+    return results
+
+def profiling_context():
+    """Return the profiler selected in the sidebar for this run, or a no-op context yielding None"""
+    profile_mode = st.session_state.get('profile_mode', 'Off')
+    if profile_mode == 'Off':
+        return nullcontext()
+    
+    if profile_mode == 'pyinstrument' and importlib.util.find_spec('pyinstrument') is None:
+        st.warning("pyinstrument is not installed; falling back to cProfile.")
+        profile_mode = 'cProfile'
+    
+    return instrumentation.profile(mode=profile_mode.lower())
+
+def iter_process_resumes(job_description, uploaded_files):
+    """
+    Generator pipeline that extracts, scores and yields resumes as they finish
+    
+    Each uploaded file produces an 'extracted' event followed by a 'scored' event,
+    or a single 'failed' or 'duplicate' event. While the session waits for a
+    worker, 'waiting' events carry its 'queue' status. Scored results are yielded as soon
+    as their batch completes, so the first candidates are available long before
+    the last file has been extracted. Near-duplicates of an earlier upload are not
+    scored; they are listed in the 'duplicates' of the earlier upload's result.
+    BM25+ and hashing vectorization weigh terms by statistics over the whole
+    upload, so with those settings scoring starts once every file has been extracted.
+    
+    Args:
+        job_description (str): Original job description text
+        uploaded_files (list): Streamlit uploaded file objects
         
-        # Process each resume
-        for uploaded_file in uploaded_files:
+    Yields:
+        dict: Event with 'index', 'filename', 'status', 'completed' and either
+            'result' (scored), 'error' (failed) or 'duplicate_of' and 'similarity' (duplicate)
+    """
+    from utils.deduplication import NearDuplicateDetector
+    
+    scheduler = processors['batch_scheduler']
+    scoring_engine = get_scoring_engine()
+    run_metrics = RunMetrics(len(uploaded_files))
+    pending = {}
+    completed = 0
+    
+    # Duplicates found so far, keyed by the upload index of the copy that is scored
+    threshold = get_duplicate_threshold()
+    detector = NearDuplicateDetector(threshold=threshold) if threshold is not None else None
+    duplicates = {}
+    
+    # Resumes wait here until the upload's statistics are known, when scores depend on them
+    upload_texts = []
+    deferred = [] if scoring_engine.uses_upload_statistics else None
+    
+    def collect(futures):
+        nonlocal completed
+        for future in futures:
+            index, filename, resume_text = pending.pop(future)
+            completed += 1
             try:
-                # Extract text from PDF
-                resume_text = processors['pdf_processor'].extract_text(uploaded_file)
-                
-                if resume_text:
-                    # Preprocess text
-                    processed_resume = processors['nlp_processor'].preprocess_text(resume_text)
-                    processed_job_desc = processors['nlp_processor'].preprocess_text(job_description)
-                    
-                    # Calculate scores
-                    scores = processors['scoring_engine'].calculate_scores(
-                        processed_resume, 
-                        processed_job_desc,
-                        resume_text,
-                        job_description
-                    )
-                    
-                    results.append({
-                        'filename': uploaded_file.name,
-                        'resume_text': resume_text,
-                        'processed_text': processed_resume,
-                        'scores': scores
-                    })
-                else:
-                    st.warning(f"Could not extract text from {uploaded_file.name}")
-                    
+                scored = future.result()
             except Exception as e:
-                st.warning(f"Error processing {uploaded_file.name}: {str(e)}")
+                run_metrics.record_failure()
+                yield {'index': index, 'filename': filename, 'status': 'failed',
+                       'error': str(e), 'completed': completed}
                 continue
+            
+            run_metrics.record_success(scored['scores']['overall_score'])
+            for stage, seconds in scored['timings'].items():
+                run_metrics.record_stage(stage, seconds)
+            
+            yield {
+                'index': index,
+                'filename': filename,
+                'status': 'scored',
+                'completed': completed,
+                'result': {
+                    'filename': filename,
+                    'resume_text': resume_text,
+                    'processed_text': scored['processed_text'],
+                    'scores': scored['scores'],
+                    'matched_keywords': scored['matched_keywords'],
+                    # Shared list, so duplicates found after scoring still appear on the result
+                    'duplicates': duplicates.setdefault(index, [])
+                }
+            }
+    
+    # Extract text on the shared worker pool, which serves this session's files in turn
+    # with other sessions' so one large upload cannot hold every worker
+    work_scheduler = processors['work_scheduler']
+    session_id = get_session_id()
+    script_ctx = get_script_run_ctx()
+    extractions = [
+        work_scheduler.submit(session_id, extract_in_session, script_ctx, uploaded_file, run_metrics)
+        for uploaded_file in uploaded_files
+    ]
+    
+    # Dedup and queue each resume for batched scoring in upload order
+    try:
+        for index, (uploaded_file, extraction) in enumerate(zip(uploaded_files, extractions)):
+            # Report this session's place in the queue while none of its files are being worked on
+            while not extraction.done():
+                wait([extraction], timeout=0.5)
+                queue = work_scheduler.get_status(session_id)
+                if not extraction.done() and not queue['running']:
+                    yield {'index': index, 'filename': uploaded_file.name, 'status': 'waiting',
+                           'queue': queue, 'completed': completed}
+            
+            try:
+                resume_text = extraction.result()
+            except Exception as e:
+                resume_text = None
+                error = str(e)
+            else:
+                error = "Could not extract text"
+            
+            if resume_text:
+                upload_texts.append(resume_text)
+            
+            representative = None
+            if resume_text and detector is not None:
+                started = time.perf_counter()
+                representative, similarity = detector.add(index, resume_text)
+                run_metrics.record_stage('dedup', time.perf_counter() - started)
+            
+            if representative is not None:
+                completed += 1
+                duplicate_of = uploaded_files[representative].name
+                duplicates.setdefault(representative, []).append({
+                    'filename': uploaded_file.name,
+                    'similarity': similarity
+                })
+                yield {'index': index, 'filename': uploaded_file.name, 'status': 'duplicate',
+                       'duplicate_of': duplicate_of, 'similarity': similarity, 'completed': completed}
+            elif resume_text and deferred is not None:
+                deferred.append((index, uploaded_file.name, resume_text))
+                yield {'index': index, 'filename': uploaded_file.name, 'status': 'extracted', 'completed': completed}
+            elif resume_text:
+                future = scheduler.submit(resume_text, job_description, scoring_engine)
+                pending[future] = (index, uploaded_file.name, resume_text)
+                yield {'index': index, 'filename': uploaded_file.name, 'status': 'extracted', 'completed': completed}
+            else:
+                completed += 1
+                run_metrics.record_failure()
+                yield {'index': index, 'filename': uploaded_file.name, 'status': 'failed',
+                       'error': error, 'completed': completed}
+            
+            # Hand back whatever has already been scored
+            yield from collect([future for future in list(pending) if future.done()])
         
-        # Sort by overall score
-        results.sort(key=lambda x: x['scores']['overall_score'], reverse=True)
-        return results
+        if deferred:
+            bm25_stats = scoring_engine.prepare_upload(upload_texts)
+            for index, filename, resume_text in deferred:
+                future = scheduler.submit(resume_text, job_description, scoring_engine, bm25_stats=bm25_stats)
+                pending[future] = (index, filename, resume_text)
         
+        # Drain the remaining work in completion order
+        yield from collect(as_completed(list(pending)))
+    finally:
+        # Files not yet extracted when the run is abandoned (e.g. the page reran) are dropped
+        work_scheduler.cancel_session(session_id)
+    
+    # Persist run telemetry for the analytics dashboard
+    try:
+        processors['metrics_store'].record_run(run_metrics)
     except Exception as e:
-        st.error(f"Error processing resumes: {str(e)}")
-        return None
+        st.warning(f"Could not record processing metrics: {str(e)}")
+
+def build_score_frame(results):
+    """
+    Build one numeric DataFrame holding every candidate's scores
+    
+    Args:
+        results (list): Ranked results
+        
+    Returns:
+        DataFrame: Rank, Candidate, Duplicates and one column per score component
+    """
+    import pandas as pd
+    import numpy as np
+    
+    # Optional components (such as BM25) get a column when any result has them
+    columns = list(SCORE_COLUMNS) + [
+        key for key in OPTIONAL_SCORE_COLUMNS if any(key in result['scores'] for result in results)
+    ]
+    frame = pd.DataFrame(
+        [result['scores'] for result in results],
+        columns=columns
+    ).rename(columns={**SCORE_COLUMNS, **OPTIONAL_SCORE_COLUMNS})
+    
+    candidates = pd.Series([result['filename'] for result in results], dtype=object)
+    frame.insert(0, 'Duplicates', [len(result.get('duplicates') or []) for result in results])
+    frame.insert(0, 'Candidate', candidates.map(lambda filename: os.path.splitext(filename)[0]))
+    frame.insert(0, 'Rank', np.arange(1, len(frame) + 1))
+    
+    return frame
+
+def format_results_table(frame):
+    """Format the numeric score columns of a score frame as percentages for display"""
+    table = frame.copy()
+    for column in list(SCORE_COLUMNS.values()) + list(OPTIONAL_SCORE_COLUMNS.values()):
+        if column in table:
+            table[column] = table[column].map('{:.1f}%'.format)
+    return table
+
+def build_results_table(results):
+    """Build the display table for ranked results"""
+    return format_results_table(build_score_frame(results))
+
+def paginate(total, page_size, key):
+    """
+    Render a page selector when there are more rows than fit on one page
+    
+    Returns:
+        tuple: (start, end) row indices of the selected page
+    """
+    if total <= page_size:
+        return 0, total
+    
+    pages = (total + page_size - 1) // page_size
+    page = st.number_input(f"Page (1-{pages})", min_value=1, max_value=pages, value=1, key=key)
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+    st.caption(f"Showing {start + 1}-{end} of {total} candidates")
+    
+    return start, end
 
-def display_results(results, job_description):
+def display_results(results, job_description, ranking=None):
     """Display ranking results with visualizations and insights"""
     st.subheader("📊 Ranking Results")
     
+    # One numeric frame drives the table and every chart
+    if ranking is not None:
+        if 'frame' not in ranking:
+            ranking['frame'] = build_score_frame(results)
+        frame = ranking['frame']
+    else:
+        frame = build_score_frame(results)
+    
     # Create results dataframe
-    df_results = pd.DataFrame([
-        {
-            'Rank': i + 1,
-            'Candidate': result['filename'].replace('.pdf', ''),
-            'Overall Score': f"{result['scores']['overall_score']:.1f}%",
-            'Keyword Match': f"{result['scores']['keyword_score']:.1f}%",
-            'Skills Match': f"{result['scores']['skills_score']:.1f}%",
-            'Experience Score': f"{result['scores']['experience_score']:.1f}%",
-            'TF-IDF Similarity': f"{result['scores']['tfidf_similarity']:.1f}%"
-        }
-        for i, result in enumerate(results)
-    ])
+    df_results = format_results_table(frame)
+    
+    duplicate_count = int(frame['Duplicates'].sum())
+    if duplicate_count:
+        st.info(
+            f"🔁 {duplicate_count} near-duplicate submission(s) were grouped with "
+            f"{int((frame['Duplicates'] > 0).sum())} candidate(s) and not scored separately."
+        )
     
     # Display ranking table
+    start, end = paginate(len(df_results), RESULTS_PAGE_SIZE, key='results_table_page')
     st.dataframe(
-        df_results,
+        df_results.iloc[start:end],
         use_container_width=True,
         hide_index=True
     )
     
     # Visualization
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Overall scores bar chart
-        fig_bar = px.bar(
-            x=[result['filename'].replace('.pdf', '') for result in results],
-            y=[result['scores']['overall_score'] for result in results],
-            title="Overall Scores Comparison",
-            labels={'x': 'Candidates', 'y': 'Score (%)'},
-            color=[result['scores']['overall_score'] for result in results],
-            color_continuous_scale='Viridis'
-        )
-        fig_bar.update_layout(showlegend=False, xaxis_tickangle=-45)
-        st.plotly_chart(fig_bar, use_container_width=True)
-    
-    with col2:
-        # Radar chart for top candidate
-        if results:
-            top_candidate = results[0]
-            scores = top_candidate['scores']
-            
-            categories = ['Keyword Match', 'Skills Match', 'Experience', 'TF-IDF Similarity']
-            values = [
-                scores['keyword_score'],
-                scores['skills_score'], 
-                scores['experience_score'],
-                scores['tfidf_similarity']
-            ]
-            
-            fig_radar = go.Figure()
-            fig_radar.add_trace(go.Scatterpolar(
-                r=values,
-                theta=categories,
-                fill='toself',
-                name=top_candidate['filename'].replace('.pdf', '')
-            ))
-            
-            fig_radar.update_layout(
-                polar=dict(
-                    radialaxis=dict(visible=True, range=[0, 100])
-                ),
-                title=f"Top Candidate: {top_candidate['filename'].replace('.pdf', '')}"
-            )
-            st.plotly_chart(fig_radar, use_container_width=True)
+    if len(frame) > LARGE_BATCH_THRESHOLD:
+        display_large_batch_charts(frame)
+    elif len(frame):
+        display_small_batch_charts(frame)
     
     # Detailed analysis for each candidate
     st.subheader("🔍 Detailed Analysis")
     
-    for i, result in enumerate(results):
-        with st.expander(f"#{i+1} - {result['filename'].replace('.pdf', '')} (Score: {result['scores']['overall_score']:.1f}%)"):
+    start, end = paginate(len(results), RESULTS_PAGE_SIZE, key='details_page')
+    for i in range(start, end):
+        result = results[i]
+        duplicates = result.get('duplicates') or []
+        duplicate_note = f" · {len(duplicates)} duplicate(s)" if duplicates else ""
+        with st.expander(f"#{i+1} - {os.path.splitext(result['filename'])[0]} (Score: {result['scores']['overall_score']:.1f}%){duplicate_note}"):
             
             col1, col2 = st.columns([2, 1])
             
             with col1:
                 st.write("**Key Insights:**")
                 
-                # Extract key insights
-                insights = processors['scoring_engine'].get_insights(
-                    result['processed_text'], 
-                    job_description,
-                    result['scores']
-                )
-                
-                for insight in insights:
+                for insight in get_result_insights(result, job_description):
                     st.write(f"• {insight}")
                 
-                # Show matched keywords
-                matched_keywords = processors['scoring_engine'].get_matched_keywords(
-                    result['resume_text'], 
-                    job_description
-                )
+                matched_keywords = get_result_keywords(result, job_description)
                 
                 if matched_keywords:
                     st.write("**Matched Keywords:**")
                     keyword_badges = " ".join([f"`{kw}`" for kw in matched_keywords[:10]])
                     st.markdown(keyword_badges)
+                
+                if duplicates:
+                    st.write("**Duplicate Submissions:**")
+                    for duplicate in duplicates:
+                        st.write(f"• {duplicate['filename']} ({duplicate['similarity']:.0%} similar)")
             
             with col2:
                 st.write("**Score Breakdown:**")
-                score_data = {
-                    'Metric': ['Keyword Match', 'Skills Match', 'Experience', 'TF-IDF Similarity'],
-                    'Score': [
-                        result['scores']['keyword_score'],
-                        result['scores']['skills_score'],
-                        result['scores']['experience_score'],
-                        result['scores']['tfidf_similarity']
-                    ]
-                }
-                st.bar_chart(pd.DataFrame(score_data).set_index('Metric'))
+                # Charts are only built for candidates the user actually inspects
+                if st.toggle("Show chart", key=f"score_breakdown_{i}_{result['filename']}"):
+                    breakdown = frame.iloc[i][component_columns(frame)].rename('Score').to_frame()
+                    st.bar_chart(breakdown)
+    
+    # Fast exports for when only the numbers are needed
+    export_results_section(results, job_description, ranking)
     
     # Generate and download HR report
     st.subheader("📋 HR Report")
     
+    report_path = ranking['report'] if ranking is not None else None
+    
     if st.button("Generate HR Report", type="secondary"):
-        with st.spinner("Generating comprehensive HR report..."):
-            report_buffer = processors['report_generator'].generate_report(
-                results, 
-                job_description, 
-                df_results
+        # Reports are written to a temp file on a background worker so large pools stay responsive
+        progress = {'fraction': 0.0}
+        progress_bar = st.progress(0.0, text="Generating comprehensive HR report...")
+        future = get_report_generator().generate_report_async(
+            results,
+            job_description,
+            progress_callback=lambda fraction: progress.update(fraction=fraction)
+        )
+        
+        while not future.done():
+            progress_bar.progress(progress['fraction'], text="Generating comprehensive HR report...")
+            time.sleep(0.2)
+        progress_bar.empty()
+        
+        try:
+            new_report_path = future.result()
+        except Exception as e:
+            st.error(f"Error generating HR report: {str(e)}")
+        else:
+            if ranking is not None:
+                discard_file(ranking['report'])
+                ranking['report'] = new_report_path
+            report_path = new_report_path
+            st.success("HR Report generated successfully!")
+    
+    batch_reports_section()
+    
+    if report_path is not None and os.path.exists(report_path):
+        with open(report_path, 'rb') as report_file:
+            report_bytes = report_file.read()
+        if ranking is None:
+            os.remove(report_path)
+        
+        st.download_button(
+            label="📥 Download HR Report (PDF)",
+            data=report_bytes,
+            file_name="resume_ranking_report.pdf",
+            mime="application/pdf"
+        )
+
+def batch_reports_section():
+    """Build HR reports for every job description ranked in this session as one zip archive"""
+    cache = st.session_state.get('ranking_cache')
+    if not cache:
+        return
+    
+    # A job description ranked against several uploads gets one report, from its latest ranking;
+    # the cache is ordered from least to most recently used
+    latest = {entry['job_description']: entry for entry in cache.values()}
+    if len(latest) < 2:
+        return
+    
+    if st.button(f"Generate Reports for All {len(latest)} Job Descriptions (ZIP)", key='batch_reports'):
+        requisitions = [
+            {
+                'name': next((line.strip() for line in entry['job_description'].splitlines() if line.strip()), 'Job')[:60],
+                'job_description': entry['job_description'],
+                'results': entry['results']
+            }
+            for entry in latest.values()
+        ]
+        
+        progress_bar = st.progress(0.0, text="Generating HR reports...")
+        try:
+            archive_path = get_report_generator().generate_batch_reports(
+                requisitions,
+                progress_callback=lambda fraction: progress_bar.progress(fraction, text="Generating HR reports...")
             )
+        except Exception as e:
+            st.error(f"Error generating HR reports: {str(e)}")
+            return
+        finally:
+            progress_bar.empty()
+        
+        with open(archive_path, 'rb') as archive_file:
+            archive_bytes = archive_file.read()
+        os.remove(archive_path)
+        
+        st.download_button(
+            label="📥 Download All HR Reports (ZIP)",
+            data=archive_bytes,
+            file_name="resume_ranking_reports.zip",
+            mime="application/zip",
+            key='download_batch_reports'
+        )
+
+def display_small_batch_charts(frame):
+    """Per-candidate bar chart and top-candidate radar chart for small batches"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Overall scores bar chart
+        fig_bar = px.bar(
+            frame,
+            x='Candidate',
+            y='Overall Score',
+            title="Overall Scores Comparison",
+            labels={'Candidate': 'Candidates', 'Overall Score': 'Score (%)'},
+            color='Overall Score',
+            color_continuous_scale='Viridis'
+        )
+        fig_bar.update_layout(showlegend=False, xaxis_tickangle=-45)
+        st.plotly_chart(fig_bar, use_container_width=True)
+    
+    with col2:
+        # Radar chart for top candidate
+        top_candidate = frame.iloc[0]
+        components = component_columns(frame)
+        
+        fig_radar = go.Figure()
+        fig_radar.add_trace(go.Scatterpolar(
+            r=top_candidate[components].tolist(),
+            theta=[column.replace(' Score', '') for column in components],
+            fill='toself',
+            name=top_candidate['Candidate']
+        ))
+        
+        fig_radar.update_layout(
+            polar=dict(
+                radialaxis=dict(visible=True, range=[0, 100])
+            ),
+            title=f"Top Candidate: {top_candidate['Candidate']}"
+        )
+        st.plotly_chart(fig_radar, use_container_width=True)
+
+def display_large_batch_charts(frame):
+    """Aggregate charts that stay fast and readable for hundreds or thousands of candidates"""
+    import plotly.express as px
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Score distribution instead of one bar per candidate
+        fig_hist = px.histogram(
+            frame,
+            x='Overall Score',
+            nbins=40,
+            title=f"Overall Score Distribution ({len(frame)} candidates)",
+            labels={'Overall Score': 'Score (%)'}
+        )
+        fig_hist.update_layout(yaxis_title="Candidates", bargap=0.05)
+        st.plotly_chart(fig_hist, use_container_width=True)
+    
+    with col2:
+        top_n = st.slider("Top candidates to compare", min_value=5, max_value=50, value=20, key='top_n_chart')
+        fig_bar = px.bar(
+            frame.head(top_n),
+            x='Candidate',
+            y='Overall Score',
+            title=f"Top {top_n} Candidates",
+            labels={'Candidate': 'Candidates', 'Overall Score': 'Score (%)'},
+            color='Overall Score',
+            color_continuous_scale='Viridis'
+        )
+        fig_bar.update_layout(showlegend=False, xaxis_tickangle=-45)
+        st.plotly_chart(fig_bar, use_container_width=True)
+    
+    # WebGL scatter handles thousands of points without slowing the browser
+    components = component_columns(frame)
+    col1, col2 = st.columns(2)
+    with col1:
+        x_axis = st.selectbox("X axis", components, index=0, key='scatter_x')
+    with col2:
+        y_axis = st.selectbox("Y axis", components, index=3, key='scatter_y')
+    
+    fig_scatter = px.scatter(
+        frame,
+        x=x_axis,
+        y=y_axis,
+        color='Overall Score',
+        hover_name='Candidate',
+        hover_data={'Rank': True},
+        render_mode='webgl',
+        color_continuous_scale='Viridis',
+        title=f"{x_axis} vs {y_axis}"
+    )
+    st.plotly_chart(fig_scatter, use_container_width=True)
+
+def get_result_insights(result, job_description):
+    """Return a candidate's insights, computing them on first use and storing them on the result"""
+    if 'insights' not in result:
+        result['insights'] = get_scoring_engine().get_insights(
+            result['processed_text'], 
+            job_description,
+            result['scores']
+        )
+    return result['insights']
+
+def get_result_keywords(result, job_description):
+    """Return a candidate's matched keywords; these are normally computed once during scoring"""
+    if result.get('matched_keywords') is None:
+        result['matched_keywords'] = get_scoring_engine().get_matched_keywords(
+            result['resume_text'], 
+            job_description
+        )
+    return result['matched_keywords']
+
+def export_results_section(results, job_description, ranking=None):
+    """Export buttons for the lightweight result formats (CSV, XLSX, JSONL, HTML)"""
+    from utils.exporters import EXPORT_FORMATS, ResultExporter
+    
+    st.subheader("📤 Export Results")
+    
+    exporter = ResultExporter(
+        insights=lambda result: get_result_insights(result, job_description),
+        keywords=lambda result: get_result_keywords(result, job_description)
+    )
+    formats = exporter.available_formats()
+    exports = ranking.setdefault('exports', {}) if ranking is not None else {}
+    
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox("Format", formats, format_func=str.upper, key='export_format')
+    
+    with col2:
+        st.write("")
+        if st.button("Export", key='export_results'):
+            with st.spinner(f"Writing {fmt.upper()} export..."):
+                try:
+                    path = exporter.export_file(results, fmt, job_description)
+                except Exception as e:
+                    st.error(f"Error exporting results: {str(e)}")
+                else:
+                    discard_file(exports.get(fmt))
+                    exports[fmt] = path
+    
+    path = exports.get(fmt)
+    if path is not None and os.path.exists(path):
+        with open(path, 'rb') as export_file:
+            data = export_file.read()
+        if ranking is None:
+            os.remove(path)
+        
+        suffix, mime = EXPORT_FORMATS[fmt]
+        st.download_button(
+            label=f"📥 Download {fmt.upper()}",
+            data=data,
+            file_name=f"resume_rankings{suffix}",
+            mime=mime,
+            key=f'download_export_{fmt}'
+        )
+
+def my_jobs_page():
+    """Background ranking jobs of this user, with their progress and results"""
+    st.header("🕒 My Jobs")
+    st.caption(
+        "Background jobs keep running on the server after you close the page. "
+        "Bookmark this page to come back to your jobs later."
+    )
+    
+    if not processors:
+        return
+    
+    job_queue = processors['job_queue']
+    if job_queue.retention_days:
+        st.caption(f"Finished jobs are deleted {job_queue.retention_days:g} days after they finish.")
+    owner = get_owner_token()
+    
+    try:
+        jobs = job_queue.list_jobs(owner)
+    except Exception as e:
+        st.error(f"Could not load jobs: {str(e)}")
+        return
+    
+    if not jobs:
+        st.info("No background jobs yet. Use **Run in Background** on the Resume Ranking page to queue one.")
+        return
+    
+    # Picks up jobs left behind by a worker that stopped, e.g. after a server restart
+    if any(job['status'] not in FINISHED_STATES for job in jobs):
+        ensure_job_worker()
+    
+    st.button("🔄 Refresh")
+    
+    status_labels = {
+        QUEUED: "⏳ Queued",
+        RUNNING: "⚙️ Running",
+        COMPLETED: "✅ Completed",
+        FAILED: "❌ Failed",
+        CANCELLED: "🚫 Cancelled"
+    }
+    
+    for job in jobs:
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([3, 3, 1])
             
-            st.download_button(
-                label="📥 Download HR Report (PDF)",
-                data=report_buffer.getvalue(),
-                file_name="resume_ranking_report.pdf",
-                mime="application/pdf"
-            )
+            with col1:
+                st.markdown(f"**{job['title']}**")
+                st.caption(f"`{job['id']}` · submitted {job['created_at'].replace('T', ' ')}")
             
-            st.success("HR Report generated successfully!")
+            with col2:
+                total = job['files_total']
+                st.progress(
+                    job['files_done'] / total if total else 1.0,
+                    text=f"{status_labels.get(job['status'], job['status'])} · {job['files_done']}/{total} files"
+                )
+                if job['error']:
+                    st.caption(f"Error: {job['error']}")
+            
+            with col3:
+                if job['status'] in FINISHED_STATES:
+                    if st.button("🗑️ Delete", key=f"delete_job_{job['id']}"):
+                        job_queue.delete(job['id'], owner)
+                        st.rerun()
+                elif st.button("✖️ Cancel", key=f"cancel_job_{job['id']}"):
+                    job_queue.cancel(job['id'], owner)
+                    st.rerun()
+    
+    # Results so far; a running job shows the files checkpointed up to now
+    with_results = [job for job in jobs if job['files_done']]
+    if not with_results:
+        return
+    
+    st.markdown("---")
+    selected = st.selectbox(
+        "Show results for:",
+        with_results,
+        format_func=lambda job: f"{job['title']} ({job['id']}, {status_labels.get(job['status'], job['status'])})",
+        key='selected_job'
+    )
+    
+    ranking_key = f"job:{selected['id']}:{selected['files_done']}"
+    ranking = get_cached_ranking(ranking_key)
+    if ranking is None:
+        try:
+            job = job_queue.get_job(selected['id'])
+            results = job_queue.get_results(selected['id'])
+        except Exception as e:
+            st.error(f"Could not load job results: {str(e)}")
+            return
+        if not results:
+            st.warning("No resume in this job could be scored.")
+            return
+        discard_job_snapshots(selected['id'])
+        store_ranking(ranking_key, job['job_description'], results)
+        ranking = get_cached_ranking(ranking_key)
+    
+    if selected['status'] not in FINISHED_STATES:
+        st.info(f"Partial results: {selected['files_done']} of {selected['files_total']} files processed so far.")
+    display_results(ranking['results'], ranking['job_description'], ranking)
 
 def analytics_dashboard():
-    """Analytics dashboard showing system statistics and insights"""
+    """Analytics dashboard showing recorded processing metrics and trends"""
+    import pandas as pd
+    import plotly.express as px
+    
     st.header("📈 Analytics Dashboard")
     
-    # This would typically show historical data, but for demo purposes,
-    # we'll show some sample analytics
-    st.info("💡 This dashboard would show historical ranking data, trends, and system performance metrics in a production environment.")
+    if not processors:
+        st.error("System not properly initialized. Please refresh the page.")
+        return
+    
+    metrics_store = processors['metrics_store']
+    days = st.selectbox("Time range", [7, 30, 90, 365], index=1, format_func=lambda d: f"Last {d} days")
+    
+    daily = pd.DataFrame(metrics_store.get_daily_rollups(days))
+    if daily.empty:
+        st.info("💡 No ranking runs recorded yet. Metrics appear here after resumes have been analyzed.")
+        # Live timings do not depend on recorded runs
+        instrumentation_panel()
+        return
+    
+    daily['Date'] = pd.to_datetime(daily['day'])
+    
+    files_total = int(daily['files_total'].sum())
+    files_processed = int(daily['files_processed'].sum())
+    files_failed = int(daily['files_failed'].sum())
+    score_count = int(daily['score_count'].sum())
     
-    # Sample metrics
+    # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Resumes Processed", "1,247", "23")
+        st.metric("Total Resumes Processed", f"{files_processed:,}", f"{int(daily['runs'].sum())} runs", delta_color="off")
     
     with col2:
-        st.metric("Average Processing Time", "2.3s", "-0.2s")
+        avg_time = daily['total_seconds'].sum() / files_total if files_total else 0
+        st.metric("Average Processing Time", f"{avg_time:.2f}s", "per resume", delta_color="off")
     
     with col3:
-        st.metric("Top Match Score", "94.5%", "2.1%")
+        st.metric("Top Match Score", f"{daily['top_score'].max():.1f}%")
     
     with col4:
-        st.metric("System Accuracy", "87.2%", "1.5%")
+        failure_rate = files_failed / files_total * 100 if files_total else 0
+        st.metric("Failure Rate", f"{failure_rate:.1f}%", f"{files_failed:,} files", delta_color="off")
     
-    # Sample charts
+    # Volume and score trends
     st.subheader("Processing Trends")
     
-    # Generate sample data for visualization
-    import numpy as np
-    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='W')
-    sample_data = pd.DataFrame({
-        'Date': dates,
-        'Resumes Processed': np.random.randint(10, 50, len(dates)),
-        'Average Score': np.random.uniform(60, 90, len(dates))
-    })
+    daily['Average Score'] = daily['score_sum'] / daily['score_count'].where(daily['score_count'] > 0)
+    daily = daily.rename(columns={'files_processed': 'Resumes Processed', 'files_failed': 'Failures'})
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig_line = px.line(sample_data, x='Date', y='Resumes Processed', 
-                          title='Weekly Resume Processing Volume')
+        fig_line = px.line(daily, x='Date', y=['Resumes Processed', 'Failures'], markers=True,
+                          title='Daily Resume Processing Volume')
         st.plotly_chart(fig_line, use_container_width=True)
     
     with col2:
-        fig_scatter = px.scatter(sample_data, x='Date', y='Average Score',
+        fig_scatter = px.scatter(daily, x='Date', y='Average Score',
                                title='Average Matching Scores Over Time')
         st.plotly_chart(fig_scatter, use_container_width=True)
+    
+    # Where latency goes
+    st.subheader("Latency Breakdown")
+    
+    stages = pd.DataFrame(metrics_store.get_stage_breakdown(days))
+    if not stages.empty:
+        stages['Date'] = pd.to_datetime(stages['day'])
+        stages['Stage'] = stages['stage'].where(stages['name'] == '', stages['stage'] + ' (' + stages['name'] + ')')
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            per_day = stages.groupby(['Date', 'stage'], as_index=False)['total_seconds'].sum()
+            per_day = per_day.merge(daily[['Date', 'files_total']], on='Date')
+            per_day['Seconds per Resume'] = per_day['total_seconds'] / per_day['files_total']
+            fig_stages = px.bar(per_day, x='Date', y='Seconds per Resume', color='stage',
+                                title='Stage Time per Resume')
+            st.plotly_chart(fig_stages, use_container_width=True)
+        
+        with col2:
+            totals = stages.groupby('Stage', as_index=False)[['count', 'total_seconds']].sum()
+            totals['Average (ms)'] = totals['total_seconds'] / totals['count'] * 1000
+            fig_avg = px.bar(totals, x='Stage', y='Average (ms)', title='Average Time per Call by Stage and Extractor')
+            st.plotly_chart(fig_avg, use_container_width=True)
+    
+    # Score distribution
+    st.subheader("Score Distribution")
+    
+    bucket_width = 100 // SCORE_BUCKETS
+    distribution = pd.DataFrame({
+        'Score Range': [f"{i * bucket_width}-{(i + 1) * bucket_width}%" for i in range(SCORE_BUCKETS)],
+        'Candidates': metrics_store.get_score_distribution(days)
+    })
+    fig_dist = px.bar(distribution, x='Score Range', y='Candidates',
+                      title=f'Overall Scores ({score_count:,} candidates)')
+    st.plotly_chart(fig_dist, use_container_width=True)
+    
+    with st.expander("Recent Runs"):
+        st.dataframe(pd.DataFrame(metrics_store.get_recent_runs()), use_container_width=True, hide_index=True)
+    
+    instrumentation_panel()
+
+def instrumentation_panel():
+    """Live stage timings, metric exports and this session's last captured profile"""
+    import pandas as pd
+    
+    st.subheader("🔬 Live Instrumentation")
+    
+    profile_report = st.session_state.get('last_profile_report')
+    if not instrumentation.enabled and profile_report is None:
+        st.info("Enable \"Record stage timings\" in the sidebar to collect per-stage timings for this server process.")
+        return
+    
+    snapshot = instrumentation.snapshot()
+    timings = [h for h in snapshot['histograms'] if h['name'] == 'stage_duration_seconds']
+    if timings:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    'Stage': h['labels'].get('stage', ''),
+                    'Labels': ", ".join(f"{k}={v}" for k, v in h['labels'].items() if k != 'stage'),
+                    'Calls': h['count'],
+                    'Total (s)': round(h['sum'], 3),
+                    'Mean (ms)': round(h['mean'] * 1000, 2),
+                    'Max (ms)': round(h['max'] * 1000, 2)
+                }
+                for h in timings
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("📥 Export JSON", instrumentation.to_json(), file_name="instrumentation.json",
+                           mime="application/json")
+    with col2:
+        st.download_button("📥 Export Prometheus", instrumentation.to_prometheus(), file_name="metrics.prom",
+                           mime="text/plain")
+    with col3:
+        if st.button("Reset timings"):
+            instrumentation.reset()
+    
+    if profile_report:
+        with st.expander("Last run profile"):
+            st.code(profile_report)
 
 def about_page():
     """About page with system information and methodology"""
@@ -353,12 +1492,14 @@ def about_page():
     to automatically score and rank candidate resumes against job descriptions.
     
     ### Key Features
-    - **PDF Text Extraction**: Automatically extracts text from PDF resume files
+    - **Text Extraction**: Reads PDF, DOCX, TXT and RTF resumes, with OCR for scanned PDF pages when Tesseract is installed
     - **NLP Processing**: Uses SpaCy for advanced text preprocessing and analysis
     - **TF-IDF Vectorization**: Implements scikit-learn's TF-IDF for text similarity
     - **Multi-factor Scoring**: Considers keywords, skills, experience, and semantic similarity
     - **Interactive Interface**: User-friendly Streamlit web interface
     - **HR Reports**: Generates comprehensive downloadable reports
+    - **Background Jobs**: Large batches can be queued on the server and collected later under My Jobs
+    - **Exports**: CSV, Excel (with openpyxl installed), JSON Lines and static HTML result exports
     
     ### Scoring Methodology
     The system uses a weighted scoring algorithm that considers:
@@ -377,8 +1518,20 @@ def about_page():
     - **Reports**: ReportLab for PDF report generation
     
     ### Data Privacy
-    - No resume data is stored permanently
-    - All processing happens in memory during the session
+    - Interactive rankings are processed in memory during the session, except for the local stores below
+    - Background jobs store the uploaded files, extracted resume text and results in a local SQLite
+      database (`data/jobs.db`, or `RESUME_RANKER_JOB_QUEUE_DB`) until you delete the job under My Jobs.
+      Finished jobs are purged automatically 30 days after they finish (`RESUME_RANKER_JOB_RETENTION_DAYS`;
+      0 keeps them until deleted)
+    - Text read from scanned PDF pages is cached locally (`data/ocr_cache.db`, or `RESUME_RANKER_OCR_CACHE_DB`)
+      for 30 days (`RESUME_RANKER_OCR_CACHE_MAX_AGE_DAYS`) and up to 10,000 pages; empty it with
+      `python -m utils.ocr_processor clear`
+    - The analytics dashboard records aggregate processing metrics only (counts, timings, scores)
+    - **Learn from new resumes** (Scoring Model → Global IDF, off by default) adds the words and word
+      pairs of every scored resume, with a hash of its text, to the local IDF database (`data/idf.db`,
+      or `RESUME_RANKER_IDF_DB`); corpora built with `python -m utils.idf_store build` are stored there
+      too. Turn the toggle off to stop learning, wipe the store with `python -m utils.idf_store reset`
+      (then restart the app) or drop rare terms with `python -m utils.idf_store prune --min-df 2`
     - No personal information is transmitted to external services
     """)
     
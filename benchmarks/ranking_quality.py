@@ -0,0 +1,350 @@
+"""
+Ranking-quality regression harness
+
+Scores a labeled corpus built from SAMPLE_RESUMES x SAMPLE_JOB_DESCRIPTIONS
+(plus seeded synthetic variants of each resume, entry-level versions and
+keyword-stuffed off-target resumes) and reports NDCG, MRR and rank
+correlation against the committed baseline, together with scoring time. A
+faster code path is acceptable only if its rankings stay close to the
+baseline.
+
+Usage:
+    python -m benchmarks.ranking_quality --update-baseline   # after an intended ranking change
+    python -m benchmarks.ranking_quality --mode batch --check
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_corpus import generate_junior_resume, generate_keyword_stuffed_resume, generate_resume
+from sample_data.job_descriptions import SAMPLE_JOB_DESCRIPTIONS
+from sample_data.sample_resumes import SAMPLE_RESUMES
+from utils.idf_store import IDFStore
+from utils.nlp_processor import NLPProcessor
+from utils.scoring_engine import ScoringEngine
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "ranking_quality.json")
+
+# The job each sample resume was written for (relevance grade 2)
+MATCHING_JOB = {
+    "john_doe_python_dev.txt": "Senior Python Developer",
+    "sarah_smith_data_scientist.txt": "Data Scientist",
+    "mike_johnson_frontend.txt": "Frontend React Developer",
+    "alex_rodriguez_devops.txt": "DevOps Engineer",
+    "emma_wilson_fullstack_js.txt": "Full Stack JavaScript Developer"
+}
+
+# Closely related jobs (relevance grade 1)
+RELATED_JOBS = {
+    "mike_johnson_frontend.txt": {"Full Stack JavaScript Developer"},
+    "emma_wilson_fullstack_js.txt": {"Frontend React Developer"},
+    "john_doe_python_dev.txt": {"Data Scientist"}
+}
+
+# Acceptance thresholds against the baseline
+MAX_NDCG_DROP = 0.02
+MAX_MRR_DROP = 0.05
+MIN_RANK_CORRELATION = 0.90
+
+def relevance(template_name, job_title, junior=False):
+    """Graded relevance of a resume template for a job; entry-level resumes are one grade lower"""
+    if MATCHING_JOB.get(template_name) == job_title:
+        return 1 if junior else 2
+    if job_title in RELATED_JOBS.get(template_name, set()):
+        return 0 if junior else 1
+    return 0
+
+def build_corpus(variants=4, seed=42):
+    """
+    Build the labeled resume corpus
+    
+    Besides the samples and their variants, every template gets two
+    entry-level versions, and every job gets one resume from each unrelated
+    template padded with that job's requirements.
+    
+    Args:
+        variants (int): Synthetic variants generated per sample resume
+        seed (int): Random seed for the variants
+    
+    Returns:
+        list: (doc_id, template_name, text, junior) tuples
+    """
+    rng = random.Random(seed)
+    corpus = [(name, name, text, False) for name, text in sorted(SAMPLE_RESUMES.items())]
+    for name in sorted(SAMPLE_RESUMES):
+        for i in range(variants):
+            _, text = generate_resume(rng, template_name=name)
+            corpus.append((f"{name}#{i}", name, text, False))
+        for i in range(2):
+            corpus.append((f"{name}#junior{i}", name, generate_junior_resume(rng, name), True))
+    
+    for job_title, job_description in sorted(SAMPLE_JOB_DESCRIPTIONS.items()):
+        for name in sorted(SAMPLE_RESUMES):
+            if relevance(name, job_title) == 0:
+                text = generate_keyword_stuffed_resume(rng, name, job_description)
+                corpus.append((f"{name}#stuffed:{job_title}", name, text, False))
+    return corpus
+
+def _score_single(nlp_processor, scoring_engine, texts, job_description):
+    """Reference path: preprocess and score one resume at a time"""
+    processed_job_desc = nlp_processor.preprocess_text(job_description)
+    bm25_stats = scoring_engine.prepare_upload(texts)
+    return [
+        scoring_engine.calculate_scores(
+            nlp_processor.preprocess_text(text), processed_job_desc, text, job_description, bm25_stats
+        )['overall_score']
+        for text in texts
+    ]
+
+def _score_batch(nlp_processor, scoring_engine, texts, job_description):
+    """Batched path used by the micro-batch scheduler"""
+    processed = nlp_processor.preprocess_texts([job_description] + list(texts))
+    bm25_stats = scoring_engine.prepare_upload(texts)
+    return [
+        scores['overall_score']
+        for scores in scoring_engine.calculate_batch_scores(
+            processed[1:], processed[0], texts, job_description, bm25_stats=bm25_stats
+        )
+    ]
+
+# Scoring paths that can be evaluated; new optimized paths register here
+MODES = {
+    'single': _score_single,
+    'batch': _score_batch
+}
+
+def dcg(grades):
+    """Discounted cumulative gain of grades in ranked order"""
+    return sum((2 ** grade - 1) / math.log2(position + 2) for position, grade in enumerate(grades))
+
+def ndcg(grades, k=None):
+    """Normalized DCG of grades in ranked order, optionally cut off at k"""
+    ranked = grades[:k] if k else grades
+    ideal = sorted(grades, reverse=True)[:k] if k else sorted(grades, reverse=True)
+    best = dcg(ideal)
+    return dcg(ranked) / best if best > 0 else 0.0
+
+def reciprocal_rank(grades, grade=2):
+    """Reciprocal rank of the first document with at least the given grade"""
+    for position, value in enumerate(grades):
+        if value >= grade:
+            return 1.0 / (position + 1)
+    return 0.0
+
+def _ranks(values):
+    """Average ranks (1-based) with ties sharing the mean rank"""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+def spearman(a, b):
+    """Spearman rank correlation of two equally long score lists"""
+    ra, rb = _ranks(a), _ranks(b)
+    mean_a, mean_b = sum(ra) / len(ra), sum(rb) / len(rb)
+    cov = sum((x - mean_a) * (y - mean_b) for x, y in zip(ra, rb))
+    var_a = sum((x - mean_a) ** 2 for x in ra)
+    var_b = sum((y - mean_b) ** 2 for y in rb)
+    return cov / math.sqrt(var_a * var_b) if var_a and var_b else 1.0
+
+def kendall_tau(a, b):
+    """Kendall tau-b of two equally long score lists"""
+    concordant = discordant = ties_a = ties_b = 0
+    for i in range(len(a)):
+        for j in range(i + 1, len(a)):
+            da, db = a[i] - a[j], b[i] - b[j]
+            if da == 0 and db == 0:
+                continue
+            if da == 0:
+                ties_a += 1
+            elif db == 0:
+                ties_b += 1
+            elif (da > 0) == (db > 0):
+                concordant += 1
+            else:
+                discordant += 1
+    denominator = math.sqrt((concordant + discordant + ties_a) * (concordant + discordant + ties_b))
+    return (concordant - discordant) / denominator if denominator else 1.0
+
+def evaluate(mode="single", variants=4, seed=42, k=10, relevance_model="tfidf", vectorization="fitted"):
+    """
+    Score the labeled corpus against every sample job description
+    
+    Args:
+        mode (str): Key in MODES selecting the scoring path
+        variants (int): Synthetic variants per sample resume
+        seed (int): Random seed
+        k (int): Cut-off for NDCG@k
+        relevance_model (str): Scoring engine relevance model ('tfidf' or 'bm25')
+        vectorization (str): TF-IDF vectorization mode ('fitted', 'hashing' or 'global');
+            'global' uses an IDF store built from the corpus in a temporary directory
+    
+    Returns:
+        dict: Per-job scores and metrics plus overall means and timing
+    """
+    nlp_processor = NLPProcessor()
+    score_fn = MODES[mode]
+    
+    corpus = build_corpus(variants=variants, seed=seed)
+    doc_ids = [doc_id for doc_id, _, _, _ in corpus]
+    texts = [text for _, _, text, _ in corpus]
+    
+    idf_store = None
+    if vectorization == "global":
+        idf_dir = tempfile.TemporaryDirectory()
+        idf_store = IDFStore(os.path.join(idf_dir.name, "idf.db"))
+        idf_store.add_documents(nlp_processor.preprocess_texts(texts))
+    
+    scoring_engine = ScoringEngine(relevance_model=relevance_model, vectorization=vectorization, idf_store=idf_store)
+    
+    queries = {}
+    scoring_seconds = 0.0
+    for job_title, job_description in sorted(SAMPLE_JOB_DESCRIPTIONS.items()):
+        started = time.perf_counter()
+        scores = score_fn(nlp_processor, scoring_engine, texts, job_description)
+        scoring_seconds += time.perf_counter() - started
+        
+        order = sorted(range(len(corpus)), key=lambda i: (-scores[i], doc_ids[i]))
+        grades = [relevance(corpus[i][1], job_title, junior=corpus[i][3]) for i in order]
+        queries[job_title] = {
+            'scores': dict(zip(doc_ids, scores)),
+            'ranking': [doc_ids[i] for i in order],
+            f'ndcg@{k}': ndcg(grades, k),
+            'ndcg': ndcg(grades),
+            'mrr': reciprocal_rank(grades)
+        }
+    
+    return {
+        'mode': mode,
+        'relevance_model': relevance_model,
+        'vectorization': vectorization,
+        'variants': variants,
+        'seed': seed,
+        'k': k,
+        'spacy_model_loaded': nlp_processor.nlp is not None,
+        'documents': len(corpus),
+        'scoring_seconds': scoring_seconds,
+        f'mean_ndcg@{k}': sum(q[f'ndcg@{k}'] for q in queries.values()) / len(queries),
+        'mean_ndcg': sum(q['ndcg'] for q in queries.values()) / len(queries),
+        'mean_mrr': sum(q['mrr'] for q in queries.values()) / len(queries),
+        'queries': queries
+    }
+
+def compare_to_baseline(result, baseline):
+    """
+    Compare an evaluation with the stored baseline
+    
+    Returns:
+        tuple: (report dict, list of failure messages)
+    """
+    failures = []
+    correlations = {}
+    for job_title, query in result['queries'].items():
+        reference = baseline['queries'].get(job_title)
+        if not reference:
+            continue
+        shared = [doc_id for doc_id in query['scores'] if doc_id in reference['scores']]
+        current = [query['scores'][doc_id] for doc_id in shared]
+        previous = [reference['scores'][doc_id] for doc_id in shared]
+        correlations[job_title] = {
+            'spearman': spearman(current, previous),
+            'kendall_tau': kendall_tau(current, previous)
+        }
+        if correlations[job_title]['spearman'] < MIN_RANK_CORRELATION:
+            failures.append(
+                f"{job_title}: Spearman {correlations[job_title]['spearman']:.3f} < {MIN_RANK_CORRELATION}"
+            )
+    
+    k = result['k']
+    ndcg_drop = baseline.get(f'mean_ndcg@{k}', 0) - result[f'mean_ndcg@{k}']
+    mrr_drop = baseline.get('mean_mrr', 0) - result['mean_mrr']
+    if ndcg_drop > MAX_NDCG_DROP:
+        failures.append(f"mean NDCG@{k} dropped by {ndcg_drop:.3f}")
+    if mrr_drop > MAX_MRR_DROP:
+        failures.append(f"mean MRR dropped by {mrr_drop:.3f}")
+    
+    report = {
+        'ndcg_change': -ndcg_drop,
+        'mrr_change': -mrr_drop,
+        'speedup': baseline['scoring_seconds'] / result['scoring_seconds'] if result['scoring_seconds'] else 0.0,
+        'correlations': correlations
+    }
+    return report, failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate ranking quality against a stored baseline")
+    parser.add_argument("--mode", choices=sorted(MODES), default="single", help="Scoring path to evaluate")
+    parser.add_argument("--relevance", choices=["tfidf", "bm25"], default="tfidf",
+                        help="Relevance model for the semantic score component")
+    parser.add_argument("--vectorization", choices=["fitted", "hashing", "global"], default="fitted",
+                        help="TF-IDF vectorization mode")
+    parser.add_argument("--variants", type=int, default=4, help="Synthetic variants per sample resume")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the variants")
+    parser.add_argument("--k", type=int, default=10, help="Cut-off for NDCG@k")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--check", action="store_true", help="Fail if the baseline is missing (for CI)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this evaluation as the new baseline")
+    args = parser.parse_args(argv)
+    
+    result = evaluate(mode=args.mode, variants=args.variants, seed=args.seed, k=args.k,
+                      relevance_model=args.relevance, vectorization=args.vectorization)
+    
+    print(f"Mode: {result['mode']}, relevance: {result['relevance_model']}, "
+          f"vectorization: {result['vectorization']} ({result['documents']} resumes x {len(result['queries'])} jobs)")
+    for job_title, query in result['queries'].items():
+        print(f"  {job_title:<34} NDCG@{args.k} {query[f'ndcg@{args.k}']:.3f}  "
+              f"NDCG {query['ndcg']:.3f}  MRR {query['mrr']:.3f}")
+    print(f"  {'Mean':<34} NDCG@{args.k} {result[f'mean_ndcg@{args.k}']:.3f}  "
+          f"NDCG {result['mean_ndcg']:.3f}  MRR {result['mean_mrr']:.3f}")
+    print(f"  Scoring time: {result['scoring_seconds']:.2f}s")
+    
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline first.")
+        return 1 if args.check else 0
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    
+    if any(baseline.get(key) != result[key] for key in ('variants', 'seed', 'k', 'documents')):
+        print("Warning: baseline was built with a different corpus or cut-off; comparison is partial.")
+    if baseline.get('spacy_model_loaded') != result['spacy_model_loaded']:
+        print("Warning: baseline and this run differ in whether the spaCy model was available; "
+              "scores are not directly comparable.")
+    
+    report, failures = compare_to_baseline(result, baseline)
+    print(f"\nAgainst baseline ({baseline['mode']}): NDCG@{args.k} {report['ndcg_change']:+.3f}  "
+          f"MRR {report['mrr_change']:+.3f}  speedup {report['speedup']:.2f}x")
+    for job_title, correlation in report['correlations'].items():
+        print(f"  {job_title:<34} Spearman {correlation['spearman']:.3f}  Kendall tau {correlation['kendall_tau']:.3f}")
+    
+    if failures:
+        print("\nREJECTED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    
+    print("\nACCEPTED")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Benchmark harness for the resume ranking pipeline
+
+Generates synthetic corpora at several scales, renders them to PDF and
+measures throughput, p50/p95 latency and peak Python heap (tracemalloc)
+separately for text extraction, NLP preprocessing, scoring and report
+generation. Latency percentiles are taken over per-resume timings, and for
+the report over REPORT_RUNS generations of the same report. Each run is
+saved under benchmarks/results/ and compared with the previous run so
+regressions between versions are visible.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --scales 10 100 1000 10000 --seed 7
+    python -m benchmarks.run_benchmarks --scales 100 --report-runs 20
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from io import BytesIO
+
+from benchmarks.synthetic_corpus import generate_corpus, generate_job_description, render_corpus
+from utils.nlp_processor import NLPProcessor
+from utils.pdf_processor import PDFProcessor
+from utils.report_generator import ReportGenerator
+from utils.scoring_engine import ScoringEngine
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, ".corpus")
+
+DEFAULT_SCALES = [10, 100, 1000, 10000]
+
+# Relative slowdown (throughput drop or p95 increase) reported as a regression
+REGRESSION_THRESHOLD = 0.10
+
+STAGES = ["extraction", "nlp", "scoring", "report"]
+
+# Report generations timed per scale; the report stage's percentiles are taken over these
+REPORT_RUNS = 5
+
+class BenchmarkFile(BytesIO):
+    """In-memory file with the attributes PDFProcessor expects from an upload"""
+    
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            super().__init__(f.read())
+        self.name = os.path.basename(path)
+        self.size = len(self.getvalue())
+
+def _percentile(values, percentile):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(percentile / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def _summarize(latencies, total_seconds, items):
+    """Build the statistics recorded for one stage"""
+    return {
+        'items': items,
+        'total_seconds': total_seconds,
+        'throughput_per_second': items / total_seconds if total_seconds > 0 else 0.0,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p95_ms': _percentile(latencies, 95) * 1000
+    }
+
+def _peak_memory_mb(func):
+    """
+    Run a callable under tracemalloc and return its peak allocation in MB
+    
+    This is the Python heap only: memory held by native libraries (SpaCy
+    models, NumPy buffers allocated outside Python) is not counted.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+def _timed_each(func, items):
+    """Call func on every item, returning outputs, per-item latencies and total time"""
+    outputs, latencies = [], []
+    started = time.perf_counter()
+    for item in items:
+        item_started = time.perf_counter()
+        outputs.append(func(item))
+        latencies.append(time.perf_counter() - item_started)
+    return outputs, latencies, time.perf_counter() - started
+
+def run_scale(size, seed, processors, measure_memory=True, report_runs=REPORT_RUNS):
+    """
+    Benchmark every stage at one corpus size
+    
+    Args:
+        size (int): Number of resumes
+        seed (int): Random seed for corpus generation
+        processors (dict): Pipeline components
+        measure_memory (bool): Whether to run a separate tracemalloc pass per stage
+        report_runs (int): Times the report is generated to measure its latency
+    
+    Returns:
+        dict: Per-stage statistics
+    """
+    corpus = generate_corpus(size, seed=seed)
+    _, job_description = generate_job_description(random.Random(seed))
+    
+    corpus_hash = hashlib.sha1("".join(text for _, _, text in corpus).encode("utf-8")).hexdigest()[:10]
+    paths = render_corpus(corpus, os.path.join(CORPUS_DIR, f"{size}_{seed}_{corpus_hash}"))
+    files = [BenchmarkFile(path) for path in paths]
+    
+    pdf_processor = processors['pdf_processor']
+    nlp_processor = processors['nlp_processor']
+    scoring_engine = processors['scoring_engine']
+    report_generator = processors['report_generator']
+    
+    stats = {}
+    
+    # Extraction
+    texts, latencies, total = _timed_each(pdf_processor.extract_text, files)
+    texts = [text or "" for text in texts]
+    stats['extraction'] = _summarize(latencies, total, size)
+    if measure_memory:
+        stats['extraction']['python_heap_peak_mb'] = _peak_memory_mb(
+            lambda: [pdf_processor.extract_text(f) for f in files[:min(size, 100)]]
+        )
+    
+    # NLP preprocessing
+    processed_job_desc = nlp_processor.preprocess_text(job_description)
+    processed, latencies, total = _timed_each(nlp_processor.preprocess_text, texts)
+    stats['nlp'] = _summarize(latencies, total, size)
+    if measure_memory:
+        stats['nlp']['python_heap_peak_mb'] = _peak_memory_mb(lambda: nlp_processor.preprocess_texts(texts))
+    
+    # Scoring
+    pairs = list(zip(processed, texts))
+    scores, latencies, total = _timed_each(
+        lambda pair: scoring_engine.calculate_scores(pair[0], processed_job_desc, pair[1], job_description),
+        pairs
+    )
+    stats['scoring'] = _summarize(latencies, total, size)
+    batch_started = time.perf_counter()
+    scoring_engine.calculate_batch_scores(processed, processed_job_desc, texts, job_description)
+    stats['scoring']['batch_seconds'] = time.perf_counter() - batch_started
+    if measure_memory:
+        stats['scoring']['python_heap_peak_mb'] = _peak_memory_mb(
+            lambda: scoring_engine.calculate_batch_scores(processed, processed_job_desc, texts, job_description)
+        )
+    
+    # Report generation
+    results = [
+        {'filename': f.name, 'resume_text': text, 'processed_text': proc, 'scores': score}
+        for f, text, proc, score in zip(files, texts, processed, scores)
+    ]
+    results.sort(key=lambda x: x['scores']['overall_score'], reverse=True)
+    _, latencies, total = _timed_each(
+        lambda _: report_generator.generate_report(results, job_description, None),
+        range(max(1, report_runs))
+    )
+    stats['report'] = _summarize(latencies, total, len(latencies))
+    stats['report']['candidates'] = size
+    if measure_memory:
+        stats['report']['python_heap_peak_mb'] = _peak_memory_mb(
+            lambda: report_generator.generate_report(results, job_description, None)
+        )
+    
+    return stats
+
+def _git_revision():
+    """Current git commit, or 'unknown' outside a checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+def load_previous_result(exclude=None):
+    """Load the most recent stored benchmark result"""
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if p != exclude)
+    if not paths:
+        return None
+    with open(paths[-1]) as f:
+        return json.load(f)
+
+def compare(current, previous, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare two benchmark results stage by stage
+    
+    Returns:
+        list: Rows describing throughput and p95 changes, with a regression flag
+    """
+    rows = []
+    for scale, stages in current['scales'].items():
+        previous_stages = previous['scales'].get(scale)
+        if not previous_stages:
+            continue
+        for stage, stats in stages.items():
+            before = previous_stages.get(stage)
+            if not before:
+                continue
+            throughput_change = (
+                stats['throughput_per_second'] / before['throughput_per_second'] - 1
+                if before['throughput_per_second'] else 0.0
+            )
+            p95_change = stats['p95_ms'] / before['p95_ms'] - 1 if before['p95_ms'] else 0.0
+            rows.append({
+                'scale': scale,
+                'stage': stage,
+                'throughput_change': throughput_change,
+                'p95_change': p95_change,
+                'regression': throughput_change < -threshold or p95_change > threshold
+            })
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume ranking pipeline")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Corpus sizes to benchmark")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for corpus generation")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory passes")
+    parser.add_argument("--report-runs", type=int, default=REPORT_RUNS,
+                        help="Report generations per scale for the report latency percentiles")
+    parser.add_argument("--label", default="", help="Free-form label stored with the results")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with status 1 if any stage regressed against the previous run")
+    args = parser.parse_args(argv)
+    
+    processors = {
+        'pdf_processor': PDFProcessor(),
+        'nlp_processor': NLPProcessor(),
+        'scoring_engine': ScoringEngine(),
+        'report_generator': ReportGenerator()
+    }
+    
+    result = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': _git_revision(),
+        'label': args.label,
+        'seed': args.seed,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'spacy_model_loaded': processors['nlp_processor'].nlp is not None,
+        'scales': {}
+    }
+    
+    for size in args.scales:
+        print(f"Benchmarking {size} resumes...", flush=True)
+        stages = run_scale(size, args.seed, processors, measure_memory=not args.no_memory,
+                           report_runs=args.report_runs)
+        result['scales'][str(size)] = stages
+        for stage in STAGES:
+            stats = stages[stage]
+            memory = (
+                f", Python heap (tracemalloc) peak {stats['python_heap_peak_mb']:.1f} MB"
+                if 'python_heap_peak_mb' in stats else ""
+            )
+            print(f"  {stage:<11} {stats['throughput_per_second']:10.1f}/s  "
+                  f"p50 {stats['p50_ms']:9.2f} ms  p95 {stats['p95_ms']:9.2f} ms{memory}")
+    
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{result['git_revision']}.json"
+    )
+    previous = load_previous_result(exclude=path)
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results saved to {path}")
+    
+    if previous is None:
+        return 0
+    
+    rows = compare(result, previous)
+    regressions = [row for row in rows if row['regression']]
+    print(f"\nCompared with {previous['git_revision']} ({previous['timestamp']}):")
+    for row in rows:
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"  {row['scale']:>6} {row['stage']:<11} throughput {row['throughput_change']:+7.1%}  "
+              f"p95 {row['p95_change']:+7.1%}{flag}")
+    
+    return 1 if regressions and args.fail_on_regression else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Concurrency stress test for the shared ScoringEngine
+
+One cached engine serves every Streamlit session, so sessions score in
+parallel with their own settings. This script derives per-session engines
+from one shared engine, runs a fixed set of scoring requests from many
+threads at once (single and batched, every relevance model and
+vectorization mode with deterministic scores) and checks every result
+against the same request scored sequentially. There is no global lock;
+any shared fitted state would show up as mismatched scores.
+
+Hashing vectorization is left out: its running document frequencies make
+scores depend on request order by design. tests/test_scoring_engine.py runs
+a small version of this check; the script is the full-scale run.
+
+Usage:
+    python -m benchmarks.scoring_concurrency
+    python -m benchmarks.scoring_concurrency --threads 16 --rounds 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic_corpus import generate_corpus
+from sample_data.job_descriptions import SAMPLE_JOB_DESCRIPTIONS
+from utils.idf_store import IDFStore
+from utils.nlp_processor import NLPProcessor
+from utils.scoring_engine import RELEVANCE_MODELS, ScoringEngine
+
+# Settings combinations whose scores do not depend on what else has been scored
+SESSION_SETTINGS = [
+    {'relevance_model': model, 'vectorization': vectorization}
+    for model in RELEVANCE_MODELS
+    for vectorization in ('fitted', 'global')
+]
+
+def build_requests(texts, count, seed):
+    """
+    Build a reproducible list of scoring requests
+    
+    Returns:
+        list: (settings, job_title, mode, resume indices) tuples
+    """
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        mode = rng.choice(['single', 'batch'])
+        size = 1 if mode == 'single' else rng.randint(2, 16)
+        requests.append((
+            rng.choice(SESSION_SETTINGS),
+            rng.choice(sorted(SAMPLE_JOB_DESCRIPTIONS)),
+            mode,
+            rng.sample(range(len(texts)), size)
+        ))
+    return requests
+
+def run_request(engine, request, texts, processed, processed_jobs):
+    """Score one request and return its overall and component scores"""
+    _, job_title, mode, indices = request
+    job_description = SAMPLE_JOB_DESCRIPTIONS[job_title]
+    if mode == 'single':
+        index = indices[0]
+        return [engine.calculate_scores(processed[index], processed_jobs[job_title], texts[index], job_description)]
+    return engine.calculate_batch_scores(
+        [processed[i] for i in indices], processed_jobs[job_title], [texts[i] for i in indices], job_description
+    )
+
+def run_stress(threads=8, request_count=100, rounds=2, corpus_size=120, seed=42):
+    """
+    Score the same requests sequentially and from parallel sessions
+    
+    Args:
+        threads (int): Concurrent sessions
+        request_count (int): Distinct scoring requests
+        rounds (int): Times each session runs through the requests
+        corpus_size (int): Synthetic resumes to draw from
+        seed (int): Random seed
+    
+    Returns:
+        dict: 'requests', 'mismatches' ((session, request) pairs), 'errors'
+            ((session, request, error) tuples), 'sequential_seconds' and 'concurrent_seconds'
+    """
+    nlp_processor = NLPProcessor()
+    texts = [text for _, _, text in generate_corpus(corpus_size, seed=seed)]
+    processed = nlp_processor.preprocess_texts(texts)
+    processed_jobs = dict(zip(
+        SAMPLE_JOB_DESCRIPTIONS, nlp_processor.preprocess_texts(SAMPLE_JOB_DESCRIPTIONS.values())
+    ))
+    
+    with tempfile.TemporaryDirectory() as idf_dir:
+        idf_store = IDFStore(os.path.join(idf_dir, "idf.db"))
+        idf_store.add_documents(processed[::2])
+        
+        # One shared engine, as cached by the app; sessions only ever derive from it
+        shared_engine = ScoringEngine(idf_store=idf_store)
+        requests = build_requests(texts, request_count, seed)
+        
+        started = time.perf_counter()
+        expected = [
+            run_request(ScoringEngine(idf_store=idf_store, **request[0]), request, texts, processed, processed_jobs)
+            for request in requests
+        ]
+        sequential_seconds = time.perf_counter() - started
+        
+        mismatches = []
+        errors = []
+        barrier = threading.Barrier(threads)
+        
+        def session(number):
+            rng = random.Random(seed + number)
+            order = list(range(len(requests))) * rounds
+            rng.shuffle(order)
+            barrier.wait()
+            for i in order:
+                try:
+                    engine = shared_engine.with_options(**requests[i][0])
+                    actual = run_request(engine, requests[i], texts, processed, processed_jobs)
+                except Exception as e:
+                    errors.append((number, i, repr(e)))
+                    continue
+                if actual != expected[i]:
+                    mismatches.append((number, i))
+        
+        # Switch threads far more often than usual to shake out races
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            workers = [threading.Thread(target=session, args=(n,)) for n in range(threads)]
+            started = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            concurrent_seconds = time.perf_counter() - started
+        finally:
+            sys.setswitchinterval(switch_interval)
+    
+    return {
+        'requests': requests,
+        'mismatches': mismatches,
+        'errors': errors,
+        'sequential_seconds': sequential_seconds,
+        'concurrent_seconds': concurrent_seconds
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress the shared scoring engine from parallel sessions")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--requests", type=int, default=100, help="Distinct scoring requests")
+    parser.add_argument("--rounds", type=int, default=2, help="Times each session runs through the requests")
+    parser.add_argument("--corpus-size", type=int, default=120, help="Synthetic resumes to draw from")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args(argv)
+    
+    outcome = run_stress(args.threads, args.requests, args.rounds, args.corpus_size, args.seed)
+    requests, mismatches, errors = outcome['requests'], outcome['mismatches'], outcome['errors']
+    
+    total = args.threads * args.rounds * len(requests)
+    print(f"Sequential reference: {len(requests)} requests in {outcome['sequential_seconds']:.2f}s")
+    print(f"Concurrent: {total} requests from {args.threads} sessions in {outcome['concurrent_seconds']:.2f}s")
+    print(f"Mismatched results: {len(mismatches)}, errors: {len(errors)}")
+    for number, i, error in errors[:5]:
+        print(f"  session {number}, request {i}: {error}")
+    for number, i in mismatches[:5]:
+        print(f"  session {number}, request {i}: {requests[i][0]} {requests[i][2]} differs from sequential scoring")
+    
+    if mismatches or errors:
+        print("FAILED")
+        return 1
+    print("PASSED")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
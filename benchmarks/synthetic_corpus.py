@@ -0,0 +1,213 @@
+"""Synthetic resume and job description corpora for benchmarking the ranking pipeline"""
+
+import os
+import random
+import re
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+
+from sample_data.job_descriptions import SAMPLE_JOB_DESCRIPTIONS
+from sample_data.sample_resumes import SAMPLE_RESUMES
+
+FIRST_NAMES = [
+    "Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Skyler",
+    "Priya", "Wei", "Carlos", "Fatima", "Olu", "Sven", "Yuki", "Ana", "Noah", "Leila"
+]
+
+LAST_NAMES = [
+    "Smith", "Garcia", "Chen", "Okafor", "Kowalski", "Nguyen", "Patel", "Silva", "Müller", "Haddad",
+    "Johnson", "Kim", "Rossi", "Novak", "Ibrahim", "Larsen", "Tanaka", "Costa", "Brown", "Singh"
+]
+
+EXTRA_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "Kotlin", "SQL", "PostgreSQL", "MongoDB",
+    "Redis", "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Jenkins", "React", "Angular",
+    "Vue", "Django", "Flask", "TensorFlow", "PyTorch", "scikit-learn", "pandas", "numpy", "Spark", "Kafka"
+]
+
+EXTRA_BULLETS = [
+    "• Automated deployment workflows, cutting release time by {n}%",
+    "• Led migration of legacy services to {skill} with zero downtime",
+    "• Built internal tooling in {skill} used by {n} engineers",
+    "• Reduced infrastructure costs by {n}% through capacity planning",
+    "• Coordinated with product and design teams on {n} major releases",
+    "• Introduced {skill}-based monitoring, lowering incident response time by {n}%"
+]
+
+_YEARS_PATTERN = re.compile(r'(\d+)(\+?\s*years?)', re.IGNORECASE)
+
+def _vary_years(text, rng):
+    """Replace every 'N years' mention with a nearby random value"""
+    return _YEARS_PATTERN.sub(lambda m: f"{max(1, int(m.group(1)) + rng.randint(-3, 4))}{m.group(2)}", text)
+
+def generate_resume(rng, template_name=None):
+    """
+    Generate one synthetic resume from a sample template
+    
+    Args:
+        rng (random.Random): Seeded random generator
+        template_name (str): Template key in SAMPLE_RESUMES; chosen at random if omitted
+    
+    Returns:
+        tuple: (template_name, resume_text)
+    """
+    template_name = template_name or rng.choice(sorted(SAMPLE_RESUMES))
+    lines = SAMPLE_RESUMES[template_name].strip().splitlines()
+    
+    # New identity on the first line
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines[0] = name
+    
+    output = []
+    for line in lines:
+        # Drop some bullet points and add others to vary length and content
+        if line.startswith("•") and rng.random() < 0.2:
+            continue
+        output.append(line)
+        if line.startswith("•") and rng.random() < 0.15:
+            output.append(rng.choice(EXTRA_BULLETS).format(n=rng.randint(5, 80), skill=rng.choice(EXTRA_SKILLS)))
+    
+    output.append("")
+    output.append("ADDITIONAL SKILLS")
+    output.append(", ".join(rng.sample(EXTRA_SKILLS, rng.randint(3, 10))))
+    
+    return template_name, _vary_years("\n".join(output), rng)
+
+def generate_junior_resume(rng, template_name):
+    """
+    Generate an entry-level version of a sample template: same field, far less depth
+    
+    Only the first skill of each skills line and the first two bullet points are
+    kept, and every experience mention becomes one year.
+    
+    Args:
+        rng (random.Random): Seeded random generator
+        template_name (str): Template key in SAMPLE_RESUMES
+    
+    Returns:
+        str: Resume text
+    """
+    lines = SAMPLE_RESUMES[template_name].strip().splitlines()
+    lines[0] = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    
+    output = []
+    bullets = 0
+    for line in lines:
+        if line.startswith("•"):
+            bullets += 1
+            if bullets > 2:
+                continue
+        elif ":" in line and "," in line:
+            label, skills = line.split(":", 1)
+            line = f"{label}: {skills.split(',')[0].strip()}"
+        output.append(line)
+    
+    return _YEARS_PATTERN.sub(lambda m: f"1{m.group(2)}", "\n".join(output))
+
+def generate_keyword_stuffed_resume(rng, template_name, job_description):
+    """
+    Generate a resume from one template padded with the requirement lines of another job
+    
+    Models candidates who paste a posting's keywords into an unrelated resume;
+    a good ranking keeps them below genuine matches.
+    
+    Args:
+        rng (random.Random): Seeded random generator
+        template_name (str): Template key in SAMPLE_RESUMES the resume really follows
+        job_description (str): Job description whose requirements are pasted in
+    
+    Returns:
+        str: Resume text
+    """
+    _, text = generate_resume(rng, template_name=template_name)
+    requirements = [line.lstrip("- ").strip() for line in job_description.splitlines() if line.startswith("-")]
+    pasted = rng.sample(requirements, min(len(requirements), 6))
+    return text + "\n\nKEYWORDS\n" + "; ".join(pasted)
+
+def generate_job_description(rng, template_name=None):
+    """
+    Generate one synthetic job description from a sample template
+    
+    Args:
+        rng (random.Random): Seeded random generator
+        template_name (str): Key in SAMPLE_JOB_DESCRIPTIONS; chosen at random if omitted
+    
+    Returns:
+        tuple: (template_name, job_description_text)
+    """
+    template_name = template_name or rng.choice(sorted(SAMPLE_JOB_DESCRIPTIONS))
+    lines = [
+        line for line in SAMPLE_JOB_DESCRIPTIONS[template_name].strip().splitlines()
+        if not (line.startswith("-") and rng.random() < 0.15)
+    ]
+    lines.append(f"- Experience with {rng.choice(EXTRA_SKILLS)} is a plus")
+    
+    return template_name, _vary_years("\n".join(lines), rng)
+
+def generate_corpus(size, seed=42):
+    """
+    Generate a reproducible corpus of synthetic resumes
+    
+    Args:
+        size (int): Number of resumes
+        seed (int): Random seed
+    
+    Returns:
+        list: (filename, template_name, resume_text) tuples
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        template_name, text = generate_resume(rng)
+        corpus.append((f"candidate_{i:05d}.pdf", template_name, text))
+    return corpus
+
+def render_pdf(text, path):
+    """
+    Render plain text to a simple one-column PDF with ReportLab
+    
+    Args:
+        text (str): Text to render
+        path (str): Output file path
+    """
+    page_width, page_height = A4
+    margin = 50
+    line_height = 12
+    
+    pdf = canvas.Canvas(path, pagesize=A4)
+    pdf.setFont("Helvetica", 10)
+    y = page_height - margin
+    
+    for paragraph in text.splitlines():
+        wrapped = simpleSplit(paragraph, "Helvetica", 10, page_width - 2 * margin) or [""]
+        for line in wrapped:
+            if y < margin:
+                pdf.showPage()
+                pdf.setFont("Helvetica", 10)
+                y = page_height - margin
+            pdf.drawString(margin, y, line)
+            y -= line_height
+    
+    pdf.save()
+
+def render_corpus(corpus, directory):
+    """
+    Render a corpus to PDFs, reusing files that already exist
+    
+    Args:
+        corpus (list): Output of generate_corpus
+        directory (str): Target directory
+    
+    Returns:
+        list: Paths of the rendered PDFs, in corpus order
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for filename, _, text in corpus:
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            render_pdf(text, path)
+        paths.append(path)
+    return paths
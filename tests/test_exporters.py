@@ -0,0 +1,58 @@
+import csv
+
+from openpyxl import load_workbook
+
+from utils.exporters import ResultExporter, escape_formula
+
+SCORES = {
+    'overall_score': 72.5,
+    'keyword_score': 60.0,
+    'skills_score': 80.0,
+    'experience_score': 70.0,
+    'tfidf_similarity': 40.0
+}
+
+def _results():
+    return [{
+        'filename': '=HYPERLINK("http://example.com","Click").pdf',
+        'scores': dict(SCORES),
+        'matched_keywords': ['+python', 'django'],
+        'insights': ['@SUM(A1:A2)', 'Solid experience'],
+        'duplicates': [{'filename': '-2+3.pdf', 'similarity': 0.95}]
+    }]
+
+def test_escape_formula():
+    assert escape_formula('=1+1') == "'=1+1"
+    assert escape_formula('+1') == "'+1"
+    assert escape_formula('-1') == "'-1"
+    assert escape_formula('@A1') == "'@A1"
+    assert escape_formula('Jane Doe') == 'Jane Doe'
+    assert escape_formula(-1.5) == -1.5
+
+def test_csv_cells_cannot_start_formulas(tmp_path):
+    path = ResultExporter().export_file(_results(), 'csv', path=str(tmp_path / "results.csv"))
+    with open(path, newline='', encoding='utf-8') as f:
+        header, row = list(csv.reader(f))
+    
+    cells = dict(zip(header, row))
+    assert cells['Candidate'] == '\'=HYPERLINK("http://example.com","Click")'
+    assert cells['Matched Keywords'] == "'+python; django"
+    assert cells['Insights'] == "'@SUM(A1:A2); Solid experience"
+    assert cells['Duplicate Submissions'] == "'-2+3.pdf"
+    assert cells['Overall Score'] == '72.5'
+
+def test_xlsx_cells_are_stored_as_text(tmp_path):
+    path = ResultExporter().export_file(_results(), 'xlsx', path=str(tmp_path / "results.xlsx"))
+    sheet = load_workbook(path).active
+    header, row = [[cell.value for cell in cells] for cells in sheet.iter_rows()]
+    
+    cells = dict(zip(header, row))
+    assert cells['Candidate'].startswith("'=")
+    assert cells['Duplicate Submissions'] == "'-2+3.pdf"
+    assert cells['Overall Score'] == 72.5
+    assert all(cell.data_type != 'f' for cell in next(sheet.iter_rows(min_row=2)))
+
+def test_jsonl_keeps_original_values(tmp_path):
+    path = ResultExporter().export_file(_results(), 'jsonl', path=str(tmp_path / "results.jsonl"))
+    with open(path, encoding='utf-8') as f:
+        assert '"+python"' in f.read()
@@ -0,0 +1,39 @@
+import numpy as np
+
+from utils.idf_store import IDFStore
+
+DOCUMENTS = [
+    "python developer django rest api postgresql",
+    "java engineer spring microservices kubernetes",
+    "data scientist python pandas machine learning",
+    "frontend developer react typescript css",
+    "devops engineer kubernetes terraform aws",
+    "python data engineer spark airflow aws"
+]
+
+def test_added_documents_are_merged_without_reload(tmp_path):
+    store = IDFStore(str(tmp_path / "idf.db"))
+    store.add_documents(DOCUMENTS[:3])
+    loaded = store.snapshot()
+    
+    store.add_documents(DOCUMENTS[3:])
+    merged = store.snapshot()
+    assert merged['vectorizer'] is loaded['vectorizer']
+    assert merged['num_docs'] == len(DOCUMENTS)
+    
+    reloaded = IDFStore(store.db_path).snapshot()
+    vocabulary = reloaded['vectorizer'].vocabulary_
+    for term, index in merged['vectorizer'].vocabulary_.items():
+        assert np.isclose(merged['idf'][index], reloaded['idf'][vocabulary[term]])
+
+def test_vocabulary_is_capped_and_pruned(tmp_path):
+    store = IDFStore(str(tmp_path / "idf.db"), max_terms=10)
+    store.add_documents(DOCUMENTS)
+    assert store.get_stats()['vocabulary_size'] == 10
+    
+    # The most common terms survive the cap
+    assert 'python' in store.snapshot()['vectorizer'].vocabulary_
+    
+    store.prune(min_df=2)
+    with store._connect() as conn:
+        assert conn.execute("SELECT MIN(df) FROM terms").fetchone()[0] >= 2
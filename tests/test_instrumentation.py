@@ -0,0 +1,47 @@
+import threading
+
+from utils import instrumentation as instrumentation_module
+from utils.instrumentation import Instrumentation
+
+def _busy(n):
+    return sum(i * i for i in range(n))
+
+def test_each_profile_gets_its_own_report():
+    instrumentation = Instrumentation()
+    
+    with instrumentation.profile() as outer:
+        _busy(1000)
+        with instrumentation.profile() as inner:
+            pass
+    
+    assert outer.report and inner.report
+    assert "_busy" in outer.report
+    assert "_busy" not in inner.report
+
+def test_profile_thread_reports_to_the_active_profile():
+    instrumentation = Instrumentation()
+    
+    def worker():
+        with instrumentation.profile_thread():
+            _busy(1000)
+    
+    with instrumentation.profile() as run:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    
+    assert "_busy" in run.report
+
+def test_profile_is_skipped_when_another_profiler_is_active(monkeypatch):
+    class ActiveProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+    
+    monkeypatch.setattr(instrumentation_module.cProfile, "Profile", ActiveProfile)
+    instrumentation = Instrumentation()
+    
+    with instrumentation.profile() as run:
+        _busy(10)
+    
+    assert run.report.startswith("Not profiled")
+    assert instrumentation._captures == []
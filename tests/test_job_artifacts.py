@@ -0,0 +1,42 @@
+from utils.job_artifacts import JobArtifactStore
+from utils.scoring_engine import ScoringEngine
+
+JOB_DESCRIPTION = "Senior Python developer with 5+ years of Django, PostgreSQL and AWS experience."
+
+class BasicNLP:
+    """NLP processor without a spaCy model"""
+    
+    model_loaded = True
+    nlp = None
+    
+    def preprocess_text(self, text):
+        return text.lower()
+
+def _count_disk_lookups(store, monkeypatch):
+    lookups = []
+    artifact_path = store._artifact_path
+    
+    def counting_artifact_path(job_description, version):
+        lookups.append(job_description)
+        return artifact_path(job_description, version)
+    
+    monkeypatch.setattr(store, '_artifact_path', counting_artifact_path)
+    return lookups
+
+def test_missing_artifacts_are_looked_up_once(tmp_path, monkeypatch):
+    store = JobArtifactStore(BasicNLP(), ScoringEngine(), str(tmp_path))
+    lookups = _count_disk_lookups(store, monkeypatch)
+    
+    for _ in range(3):
+        assert store.get(JOB_DESCRIPTION) is None
+    assert len(lookups) == 1
+
+def test_prepare_replaces_a_remembered_miss(tmp_path):
+    store = JobArtifactStore(BasicNLP(), ScoringEngine(), str(tmp_path))
+    assert store.get(JOB_DESCRIPTION) is None
+    
+    prepared = store.prepare(JOB_DESCRIPTION)
+    assert store.get(JOB_DESCRIPTION) is prepared
+    
+    # A fresh store finds the persisted artifacts
+    assert JobArtifactStore(BasicNLP(), ScoringEngine(), str(tmp_path)).get(JOB_DESCRIPTION) is not None
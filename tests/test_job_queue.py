@@ -0,0 +1,70 @@
+import time
+
+from utils.job_queue import COMPLETED, FAILED, QUEUED, RUNNING, STALE_JOB_SECONDS, JobQueue
+
+def _expire_heartbeat(queue, job_id):
+    """Make a running job look abandoned by its worker"""
+    with queue._connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET heartbeat = ? WHERE id = ?",
+            (time.time() - STALE_JOB_SECONDS - 1, job_id)
+        )
+
+def test_stale_job_is_reclaimed(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    job_id = queue.submit("owner", "Python developer", [("a.txt", b"resume")])
+    
+    assert queue.claim("worker-1")['id'] == job_id
+    assert queue.claim("worker-2") is None
+    
+    _expire_heartbeat(queue, job_id)
+    job = queue.claim("worker-2")
+    assert job['id'] == job_id
+    assert job['worker'] == "worker-2"
+    assert job['attempts'] == 2
+
+def test_job_fails_after_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), max_attempts=3)
+    job_id = queue.submit("owner", "Python developer", [("a.txt", b"resume")])
+    
+    for attempt in range(1, 4):
+        job = queue.claim(f"worker-{attempt}")
+        assert job['id'] == job_id
+        assert job['status'] == RUNNING
+        _expire_heartbeat(queue, job_id)
+    
+    assert queue.claim("worker-4") is None
+    job = queue.get_job(job_id)
+    assert job['status'] == FAILED
+    assert job['attempts'] == 3
+    assert "3 attempts" in job['error']
+    assert job['finished_at'] is not None
+    assert not queue.has_work()
+
+def test_failed_job_does_not_block_the_queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), max_attempts=1)
+    stuck = queue.submit("owner", "First job", [("a.txt", b"resume")])
+    queue.claim("worker-1")
+    _expire_heartbeat(queue, stuck)
+    waiting = queue.submit("owner", "Second job", [("b.txt", b"resume")])
+    
+    assert queue.claim("worker-2")['id'] == waiting
+    assert queue.get_job(stuck)['status'] == FAILED
+
+def test_purge_removes_only_expired_finished_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), retention_days=30)
+    expired = queue.submit("owner", "Old job", [("a.txt", b"resume")])
+    recent = queue.submit("owner", "Recent job", [("b.txt", b"resume")])
+    waiting = queue.submit("owner", "Waiting job", [("c.txt", b"resume")])
+    for job_id in (expired, recent):
+        queue.claim("worker-1")
+        queue.finish(job_id)
+    with queue._connect() as conn:
+        conn.execute("UPDATE jobs SET finished_at = '2000-01-01T00:00:00' WHERE id = ?", (expired,))
+    
+    assert queue.purge() == 1
+    assert queue.get_job(expired) is None
+    assert queue.get_job(recent)['status'] == COMPLETED
+    assert queue.get_job(waiting)['status'] == QUEUED
+    with queue._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM job_files WHERE job_id = ?", (expired,)).fetchone()[0] == 0
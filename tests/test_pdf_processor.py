@@ -0,0 +1,89 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageDraw
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from utils.ocr_processor import OCRProcessor
+from utils.pdf_processor import PDFProcessor
+
+TEXT_PAGES = {
+    0: "Jane Doe, Senior Python Developer with eight years of Django and PostgreSQL experience.",
+    2: "Education: BSc Computer Science. Certifications: AWS Solutions Architect."
+}
+SCANNED_TEXT = "Projects: Built a Kubernetes deployment pipeline"
+
+class FakeOCR:
+    """Stands in for Tesseract, recording which pages were sent for OCR"""
+    
+    def __init__(self):
+        self.requested = []
+    
+    def ocr_pages(self, pdf_bytes, page_numbers):
+        self.requested.append(list(page_numbers))
+        return {page: f"{SCANNED_TEXT} (page {page})" for page in page_numbers}
+
+def _mixed_pdf():
+    """Three pages: text, a scanned image without a text layer, text"""
+    image = Image.new('RGB', (1200, 200), 'white')
+    ImageDraw.Draw(image).text((20, 80), SCANNED_TEXT, fill='black')
+    
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    for page in range(3):
+        if page in TEXT_PAGES:
+            pdf.drawString(72, 750, TEXT_PAGES[page])
+        else:
+            pdf.drawImage(ImageReader(image), 36, 600, width=520, height=90)
+        pdf.showPage()
+    pdf.save()
+    
+    upload = BytesIO(buffer.getvalue())
+    upload.name = "mixed.pdf"
+    return upload
+
+def test_scanned_page_of_a_text_pdf_is_ocred_in_page_order():
+    processor = PDFProcessor(enable_ocr=False)
+    processor.ocr_processor = FakeOCR()
+    
+    text = processor.extract_text(_mixed_pdf())
+    
+    assert processor.ocr_processor.requested == [[1]]
+    positions = [text.index(TEXT_PAGES[0]), text.index(SCANNED_TEXT), text.index(TEXT_PAGES[2])]
+    assert positions == sorted(positions)
+
+def test_text_layer_is_used_without_ocr():
+    processor = PDFProcessor(enable_ocr=False)
+    
+    text = processor.extract_text(_mixed_pdf())
+    
+    assert TEXT_PAGES[0] in text and TEXT_PAGES[2] in text
+    assert SCANNED_TEXT not in text
+
+@pytest.mark.skipif(not OCRProcessor.is_available(), reason="Tesseract is not installed")
+def test_scanned_page_is_read_with_tesseract(tmp_path):
+    processor = PDFProcessor(enable_ocr=False)
+    processor.ocr_processor = OCRProcessor(cache_db=str(tmp_path / "ocr.db"), max_workers=1)
+    try:
+        text = processor.extract_text(_mixed_pdf())
+    finally:
+        processor.ocr_processor.shutdown()
+    
+    assert "Kubernetes" in text
+
+def test_ocr_cache_drops_expired_and_oldest_pages(tmp_path):
+    processor = OCRProcessor(cache_db=str(tmp_path / "ocr.db"), max_age_days=30, max_pages=2)
+    processor._store_pages("expired", {0: "old text"})
+    with processor._connect() as conn:
+        conn.execute("UPDATE ocr_pages SET created_at = '2000-01-01T00:00:00'")
+    processor._store_pages("first", {0: "first page", 1: "second page"})
+    processor._store_pages("second", {0: "newest page"})
+    
+    assert processor._cached_pages("expired", [0]) == {}
+    assert processor.get_stats()['pages'] == 2
+    assert processor._cached_pages("second", [0]) == {0: "newest page"}
+    
+    processor.clear()
+    assert processor.get_stats()['pages'] == 0
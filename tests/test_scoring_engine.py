@@ -0,0 +1,58 @@
+import pytest
+
+from benchmarks.scoring_concurrency import run_stress
+from utils.scoring_engine import BM25Statistics, ScoringEngine
+
+JOB_DESCRIPTION = "Python developer with Django, PostgreSQL and AWS experience building REST APIs"
+
+RESUMES = [
+    "Senior Python developer, 6 years of Django and PostgreSQL, REST APIs on AWS",
+    "Java engineer working on Spring microservices and Kubernetes",
+    "Data scientist using Python, pandas and machine learning on AWS",
+    "Frontend developer with React, TypeScript and CSS",
+    "Python backend engineer, Flask and Django REST framework, PostgreSQL"
+]
+
+def _bm25_scores(engine, resumes, bm25_stats):
+    return [
+        scores['bm25_score']
+        for scores in engine.calculate_batch_scores(
+            resumes, JOB_DESCRIPTION, resumes, JOB_DESCRIPTION, bm25_stats=bm25_stats
+        )
+    ]
+
+def test_bm25_scores_do_not_depend_on_batching():
+    engine = ScoringEngine(relevance_model='bm25')
+    bm25_stats = BM25Statistics.from_texts(RESUMES)
+    
+    full = _bm25_scores(engine, RESUMES, bm25_stats)
+    split = _bm25_scores(engine, RESUMES[:2], bm25_stats) + _bm25_scores(engine, RESUMES[2:], bm25_stats)
+    alone = [
+        engine.calculate_scores(resume, JOB_DESCRIPTION, resume, JOB_DESCRIPTION, bm25_stats)['bm25_score']
+        for resume in RESUMES
+    ]
+    
+    assert split == pytest.approx(full)
+    assert alone == pytest.approx(full)
+    assert full[0] == max(full)
+
+def test_shared_engine_is_safe_under_concurrent_sessions():
+    outcome = run_stress(threads=4, request_count=12, rounds=1, corpus_size=24)
+    
+    assert outcome['errors'] == []
+    assert outcome['mismatches'] == []
+
+def test_hashing_counts_each_upload_once_before_scoring():
+    engine = ScoringEngine(vectorization='hashing')
+    engine.prepare_upload(RESUMES + RESUMES[:2])
+    engine.prepare_upload(RESUMES)
+    assert engine.hashing_tfidf.doc_freqs.num_docs == len(RESUMES)
+    
+    def similarities(resumes):
+        return [
+            scores['tfidf_similarity']
+            for scores in engine.calculate_batch_scores(resumes, JOB_DESCRIPTION, resumes, JOB_DESCRIPTION)
+        ]
+    
+    assert similarities(RESUMES[:2]) + similarities(RESUMES[2:]) == pytest.approx(similarities(RESUMES))
+    assert engine.hashing_tfidf.doc_freqs.num_docs == len(RESUMES)
@@ -0,0 +1,225 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from utils.instrumentation import instrumentation
+
+class MicroBatchScheduler:
+    """Gathers single-resume scoring requests into batches for the NLP and scoring stages"""
+    
+    def __init__(self, nlp_processor, scoring_engine, max_batch_size=32, max_wait_ms=50):
+        """
+        Initialize the scheduler
+        
+        Args:
+            nlp_processor (NLPProcessor): Processor used for batched preprocessing
+            scoring_engine (ScoringEngine): Default engine used for batched scoring
+            max_batch_size (int): Largest number of requests scored together (throughput knob)
+            max_wait_ms (float): Longest time a request waits for its batch to fill (latency knob)
+        """
+        self.nlp_processor = nlp_processor
+        self.scoring_engine = scoring_engine
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._stopped = False
+        
+        self._metrics = {
+            'requests_submitted': 0,
+            'requests_completed': 0,
+            'requests_failed': 0,
+            'batches_processed': 0,
+            'max_queue_depth': 0,
+            'total_batch_size': 0,
+            'total_batch_seconds': 0.0,
+            'total_wait_seconds': 0.0
+        }
+    
+    def submit(self, resume_text, job_description, scoring_engine=None, bm25_stats=None):
+        """
+        Queue a resume for scoring against a job description
+        
+        Args:
+            resume_text (str): Original (extracted) resume text
+            job_description (str): Original job description text
+            scoring_engine (ScoringEngine): Engine with the caller's settings; defaults to the
+                scheduler's engine
+            bm25_stats (BM25Statistics): Statistics of the upload the resume belongs to, so its
+                BM25+ score does not depend on which requests share its batch
+        
+        Returns:
+            Future: Resolves to a dict with 'processed_text', 'scores',
+                'matched_keywords' and per-request stage 'timings'
+        """
+        future = Future()
+        
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("Scheduler has been shut down")
+            self._ensure_worker()
+            self._queue.put((
+                resume_text, job_description, future, time.perf_counter(), scoring_engine or self.scoring_engine,
+                bm25_stats
+            ))
+            self._metrics['requests_submitted'] += 1
+            self._metrics['max_queue_depth'] = max(self._metrics['max_queue_depth'], self._queue.qsize())
+        
+        return future
+    
+    def score(self, resume_text, job_description, timeout=None, scoring_engine=None, bm25_stats=None):
+        """Submit a request and block until its result is available"""
+        return self.submit(resume_text, job_description, scoring_engine, bm25_stats).result(timeout=timeout)
+    
+    def get_metrics(self):
+        """
+        Get queue-depth and throughput metrics
+        
+        Returns:
+            dict: Current scheduler metrics
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        
+        batches = metrics['batches_processed']
+        completed = metrics['requests_completed'] + metrics['requests_failed']
+        
+        return {
+            'queue_depth': self._queue.qsize(),
+            'max_queue_depth': metrics['max_queue_depth'],
+            'requests_submitted': metrics['requests_submitted'],
+            'requests_completed': metrics['requests_completed'],
+            'requests_failed': metrics['requests_failed'],
+            'batches_processed': batches,
+            'avg_batch_size': metrics['total_batch_size'] / batches if batches else 0.0,
+            'avg_batch_ms': metrics['total_batch_seconds'] * 1000 / batches if batches else 0.0,
+            'avg_queue_wait_ms': metrics['total_wait_seconds'] * 1000 / completed if completed else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms
+        }
+    
+    def shutdown(self, wait=True):
+        """Stop accepting requests and let the worker drain the queue"""
+        with self._lock:
+            self._stopped = True
+            worker = self._worker
+        
+        self._queue.put(None)
+        if wait and worker is not None:
+            worker.join()
+    
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run,
+                name="micro-batch-scheduler",
+                daemon=True
+            )
+            self._worker.start()
+    
+    def _run(self):
+        """Worker loop: collect a batch, process it, repeat"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+            stop = False
+            
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            with instrumentation.profile_thread(), instrumentation.timer('scheduler.batch'):
+                self._process_batch(batch)
+            instrumentation.increment('scheduler_batches_total')
+            instrumentation.increment('scheduler_requests_total', len(batch))
+            
+            if stop:
+                return
+    
+    def _process_batch(self, batch):
+        """Preprocess and score one batch, resolving each request's future"""
+        started = time.perf_counter()
+        
+        # Group requests by engine settings, job description and upload statistics so each group
+        # shares one TF-IDF fit
+        groups = OrderedDict()
+        for request in batch:
+            groups.setdefault((request[4], request[1], request[5]), []).append(request)
+        
+        failed = 0
+        for (scoring_engine, job_description, bm25_stats), requests in groups.items():
+            try:
+                resume_texts = [request[0] for request in requests]
+                nlp_started = time.perf_counter()
+                job_artifacts = scoring_engine.job_artifacts
+                prepared = job_artifacts.get(job_description) if job_artifacts is not None else None
+                if prepared is not None:
+                    # Prepared job description: only the resumes go through the NLP pipeline
+                    processed_job_desc = prepared.processed_text
+                    processed_resumes = self.nlp_processor.preprocess_texts(
+                        resume_texts,
+                        batch_size=self.max_batch_size
+                    )
+                else:
+                    processed = self.nlp_processor.preprocess_texts(
+                        [job_description] + resume_texts,
+                        batch_size=self.max_batch_size + 1
+                    )
+                    processed_job_desc, processed_resumes = processed[0], processed[1:]
+                
+                scoring_started = time.perf_counter()
+                batch_scores = scoring_engine.calculate_batch_scores(
+                    processed_resumes,
+                    processed_job_desc,
+                    resume_texts,
+                    job_description,
+                    bm25_stats=bm25_stats
+                )
+                
+                matched_keywords = scoring_engine.get_batch_matched_keywords(resume_texts, job_description)
+                scoring_finished = time.perf_counter()
+                
+                # Each request is charged an equal share of its group's batch time
+                timings = {
+                    'nlp': (scoring_started - nlp_started) / len(requests),
+                    'scoring': (scoring_finished - scoring_started) / len(requests)
+                }
+                
+                for request, processed_text, scores, keywords in zip(
+                        requests, processed_resumes, batch_scores, matched_keywords):
+                    request[2].set_result({
+                        'processed_text': processed_text,
+                        'scores': scores,
+                        'matched_keywords': keywords,
+                        'timings': timings
+                    })
+            
+            except Exception as e:
+                failed += len(requests)
+                for request in requests:
+                    if not request[2].done():
+                        request[2].set_exception(e)
+        
+        finished = time.perf_counter()
+        with self._lock:
+            self._metrics['batches_processed'] += 1
+            self._metrics['total_batch_size'] += len(batch)
+            self._metrics['total_batch_seconds'] += finished - started
+            self._metrics['total_wait_seconds'] += sum(started - request[3] for request in batch)
+            self._metrics['requests_completed'] += len(batch) - failed
+            self._metrics['requests_failed'] += failed
@@ -0,0 +1,133 @@
+from utils.text_normalizer import normalize
+
+# Largest 31-bit prime; keeps (a * hash + b) within int64 for 32-bit shingle hashes
+_MERSENNE_PRIME = (1 << 31) - 1
+
+class NearDuplicateDetector:
+    """Incremental near-duplicate detection with MinHash signatures and LSH banding"""
+    
+    def __init__(self, threshold=0.8, num_perm=128, bands=32, shingle_size=5, seed=1):
+        """
+        Initialize the detector
+        
+        With 32 bands of 4 rows, pairs above about 0.6 Jaccard similarity
+        almost always share a bucket; candidates are then confirmed against
+        the threshold using the full signatures.
+        
+        Args:
+            threshold (float): Estimated Jaccard similarity at which two resumes are duplicates
+            num_perm (int): MinHash permutations per signature
+            bands (int): LSH bands; must divide num_perm
+            shingle_size (int): Words per shingle
+            seed (int): Seed for the permutation coefficients
+        """
+        import numpy as np
+        
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        
+        # Only representatives are indexed, so clusters never chain through their members
+        self._buckets = [{} for _ in range(bands)]
+        self._keys = []
+        self._signatures = np.empty((64, num_perm), dtype=np.int64)
+        self._representatives = {}
+    
+    def _shingles(self, text):
+        """Distinct 32-bit hashes of the word shingles of the normalized text"""
+        import numpy as np
+        
+        tokens = normalize(text).tokens
+        size = min(self.shingle_size, len(tokens))
+        if size == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        # Hash each token once, then roll the token hashes into shingle hashes. Python's string
+        # hash is salted per process, which is fine because signatures never leave the detector.
+        token_hashes = np.fromiter(
+            (hash(token) & 0xFFFFFFFF for token in tokens), dtype=np.uint64, count=len(tokens)
+        )
+        count = len(tokens) - size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            hashes = (hashes * np.uint64(1000003) + token_hashes[offset:offset + count]) & np.uint64(0xFFFFFFFF)
+        
+        return np.unique(hashes).astype(np.int64)
+    
+    def signature(self, text):
+        """
+        Compute the MinHash signature of a text
+        
+        Args:
+            text (str): Resume text
+        
+        Returns:
+            ndarray: num_perm minimum hash values (empty texts get an all-max signature)
+        """
+        import numpy as np
+        
+        hashes = self._shingles(text)
+        if not len(hashes):
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.int64)
+        
+        return ((np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME).min(axis=0)
+    
+    def similarity(self, first, second):
+        """Estimated Jaccard similarity of two signatures"""
+        return float((first == second).mean())
+    
+    def add(self, key, text):
+        """
+        Add a document and find the earlier document it duplicates, if any
+        
+        Args:
+            key: Identifier of the document, e.g. its upload index
+            text (str): Document text
+        
+        Returns:
+            tuple: (representative key, similarity) when the document is a near-duplicate
+                of an earlier one, otherwise (None, 0.0)
+        """
+        import numpy as np
+        
+        signature = self.signature(text)
+        band_keys = [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+        
+        # Candidates share at least one band; confirm them all at once against the full signatures
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            candidates.update(buckets.get(band_key, ()))
+        
+        if candidates:
+            positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            similarities = (self._signatures[positions] == signature).mean(axis=1)
+            best = int(similarities.argmax())
+            if similarities[best] >= self.threshold:
+                representative = self._keys[positions[best]]
+                self._representatives[key] = representative
+                return representative, float(similarities[best])
+        
+        # A new representative: store its signature and index its bands
+        position = len(self._keys)
+        if position == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[position] = signature
+        self._keys.append(key)
+        self._representatives[key] = key
+        
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets.setdefault(band_key, []).append(position)
+        
+        return None, 0.0
@@ -0,0 +1,268 @@
+import codecs
+import os
+import re
+import time
+import zipfile
+from xml.etree import ElementTree
+
+import streamlit as st
+from utils.instrumentation import instrumentation
+from utils.pdf_processor import PDFProcessor
+from utils.text_normalizer import normalize
+
+# Extracted text shorter than this counts as a failed extraction, as for PDFs
+MIN_TEXT_CHARS = 100
+
+# Largest uncompressed DOCX body read; guards against zip bombs
+MAX_DOCX_XML_BYTES = 50 * 1024 * 1024
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# WordprocessingML elements that become whitespace in the extracted text
+_DOCX_BREAKS = {
+    _W + 'tab': '\t',
+    _W + 'br': '\n',
+    _W + 'cr': '\n',
+    _W + 'noBreakHyphen': '-',
+    _W + 'p': '\n'
+}
+
+# RTF tokens: control word with optional parameter, hex escape, control symbol, group brace, text
+_RTF_TOKEN = re.compile(r"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\(.)|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.DOTALL)
+
+# RTF destinations whose content is not document text
+_RTF_SKIPPED_DESTINATIONS = {
+    'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'object', 'header', 'headerl', 'headerr',
+    'headerf', 'footer', 'footerl', 'footerr', 'footerf', 'listtable', 'listoverridetable', 'revtbl',
+    'rsidtbl', 'generator', 'xmlnstbl', 'themedata', 'colorschememapping', 'datastore', 'latentstyles',
+    'filetbl', 'fldinst', 'private', 'mmathPr'
+}
+
+# RTF control words that stand for characters
+_RTF_CHARACTERS = {
+    'par': '\n', 'line': '\n', 'sect': '\n', 'page': '\n', 'row': '\n', 'tab': '\t', 'cell': '\t',
+    'emdash': '\u2014', 'endash': '\u2013', 'bullet': '\u2022', 'lquote': '\u2018', 'rquote': '\u2019',
+    'ldblquote': '\u201c', 'rdblquote': '\u201d', 'emspace': ' ', 'enspace': ' ', 'qmspace': ' '
+}
+
+# RTF control symbols that stand for characters
+_RTF_SYMBOLS = {'\\': '\\', '{': '{', '}': '}', '~': ' ', '_': '-', '-': '', '\n': '\n', '\r': '\n'}
+
+def extract_docx_text(file_obj):
+    """
+    Extract the body text of a DOCX file by streaming its XML
+    
+    Args:
+        file_obj: Binary file object
+    
+    Returns:
+        str: Paragraphs separated by line breaks
+    """
+    parts = []
+    fallback_depth = 0
+    
+    with zipfile.ZipFile(file_obj) as archive:
+        info = archive.getinfo('word/document.xml')
+        if info.file_size > MAX_DOCX_XML_BYTES:
+            raise ValueError(f"Document body is too large ({info.file_size / (1024 * 1024):.0f} MB)")
+        
+        with archive.open(info) as xml:
+            for event, element in ElementTree.iterparse(xml, events=('start', 'end')):
+                # Alternate content repeats the preferred version (e.g. text boxes) in a fallback
+                if element.tag == _MC_FALLBACK:
+                    fallback_depth += 1 if event == 'start' else -1
+                    continue
+                if event == 'start' or fallback_depth:
+                    continue
+                
+                if element.tag == _W + 't':
+                    parts.append(element.text or "")
+                elif element.tag in _DOCX_BREAKS:
+                    parts.append(_DOCX_BREAKS[element.tag])
+                    if element.tag == _W + 'p':
+                        # Paragraphs are done with; keep memory flat on long documents
+                        element.clear()
+    
+    return "".join(parts)
+
+def extract_txt_text(file_obj):
+    """
+    Decode a plain-text file: UTF-16 with a byte order mark, UTF-8, or Windows-1252
+    
+    Args:
+        file_obj: Binary file object
+    
+    Returns:
+        str: File content
+    """
+    data = file_obj.read()
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return data.decode('utf-16', errors='replace')
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('cp1252', errors='replace')
+
+def extract_rtf_text(file_obj):
+    """
+    Extract the text of an RTF file, skipping formatting and non-text destinations
+    
+    Args:
+        file_obj: Binary file object
+    
+    Returns:
+        str: Document text
+    """
+    # RTF is 7-bit; anything else is escaped, so Latin-1 decoding is lossless
+    content = file_obj.read().decode('latin-1')
+    encoding = 'cp1252'
+    
+    parts = []
+    stack = []
+    skip_group = False
+    unicode_skip = 1  # Fallback characters that follow each \u escape
+    pending_skip = 0
+    
+    for match in _RTF_TOKEN.finditer(content):
+        word, parameter, hex_code, symbol, brace, text = match.groups()
+        
+        if brace == '{':
+            stack.append((skip_group, unicode_skip))
+        elif brace == '}':
+            if stack:
+                skip_group, unicode_skip = stack.pop()
+            pending_skip = 0
+        elif word is not None:
+            if word == 'ansicpg' and parameter:
+                encoding = f'cp{parameter}'
+            elif word == 'uc':
+                unicode_skip = int(parameter or 1)
+            elif word in _RTF_SKIPPED_DESTINATIONS:
+                skip_group = True
+            elif skip_group:
+                pass
+            elif word == 'u' and parameter:
+                code = int(parameter)
+                parts.append(chr(code + 65536 if code < 0 else code))
+                pending_skip = unicode_skip
+            elif word in _RTF_CHARACTERS:
+                parts.append(_RTF_CHARACTERS[word])
+        elif hex_code is not None:
+            if pending_skip:
+                pending_skip -= 1
+            elif not skip_group:
+                try:
+                    parts.append(bytes([int(hex_code, 16)]).decode(encoding))
+                except (LookupError, UnicodeDecodeError):
+                    parts.append(bytes([int(hex_code, 16)]).decode('cp1252', errors='replace'))
+        elif symbol is not None:
+            if symbol == '*':
+                # Optional destination: readers that do not know it skip the group
+                skip_group = True
+            elif not skip_group:
+                parts.append(_RTF_SYMBOLS.get(symbol, ''))
+        elif text is not None:
+            if pending_skip:
+                skipped = min(pending_skip, len(text))
+                text = text[skipped:]
+                pending_skip -= skipped
+            if not skip_group:
+                parts.append(text)
+    
+    return "".join(parts)
+
+class DocumentProcessor:
+    """Extracts resume text by file format; PDFs go through PDFProcessor, other formats skip PDF parsing"""
+    
+    def __init__(self, pdf_processor=None):
+        """
+        Initialize the extractor registry
+        
+        Args:
+            pdf_processor (PDFProcessor): Extractor for PDFs; created if not given
+        """
+        self.pdf_processor = pdf_processor or PDFProcessor()
+        
+        # File type (extension without the dot) -> function reading a binary file object into raw text
+        self.extractors = {
+            'docx': extract_docx_text,
+            'txt': extract_txt_text,
+            'rtf': extract_rtf_text
+        }
+    
+    def register(self, file_type, extractor):
+        """
+        Add or replace the extractor for a file type
+        
+        Args:
+            file_type (str): Extension without the dot, e.g. 'odt'
+            extractor (callable): Reads a binary file object and returns its raw text
+        """
+        self.extractors[file_type.lower()] = extractor
+    
+    @property
+    def supported_types(self):
+        """File types accepted for upload"""
+        return ['pdf'] + list(self.extractors)
+    
+    def detect_type(self, uploaded_file):
+        """
+        Determine a file's type from its extension, or from its content if the extension is unknown
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+        
+        Returns:
+            str: File type, or None if it is not supported
+        """
+        file_type = os.path.splitext(uploaded_file.name)[1].lstrip('.').lower()
+        if file_type in self.supported_types:
+            return file_type
+        
+        uploaded_file.seek(0)
+        header = uploaded_file.read(8)
+        uploaded_file.seek(0)
+        if header.startswith(b'%PDF'):
+            return 'pdf'
+        if header.startswith(b'{\\rtf') and 'rtf' in self.extractors:
+            return 'rtf'
+        if header.startswith(b'PK\x03\x04') and 'docx' in self.extractors:
+            return 'docx'
+        return None
+    
+    def extract_text(self, uploaded_file, metrics=None):
+        """
+        Extract text from an uploaded resume in any supported format
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            metrics (RunMetrics): Optional collector for per-extractor timings
+        
+        Returns:
+            str: Extracted text content, cleaned the same way for every format
+        """
+        file_type = self.detect_type(uploaded_file)
+        if file_type == 'pdf':
+            return self.pdf_processor.extract_text(uploaded_file, metrics=metrics)
+        
+        try:
+            if file_type is None:
+                raise Exception(f"Unsupported file type; upload {', '.join(self.supported_types).upper()} files")
+            
+            uploaded_file.seek(0)
+            started = time.perf_counter()
+            try:
+                with instrumentation.timer('document.extract', format=file_type):
+                    text = self.extractors[file_type](uploaded_file)
+            finally:
+                if metrics is not None:
+                    metrics.record_stage('extraction', time.perf_counter() - started, name=file_type)
+            
+            if not text or len(text.strip()) <= MIN_TEXT_CHARS:
+                raise Exception("No readable text found")
+            return normalize(text).text
+        
+        except Exception as e:
+            st.error(f"Failed to extract text from {uploaded_file.name}: {str(e)}")
+            return None
@@ -0,0 +1,289 @@
+import csv
+import html
+import json
+import os
+import tempfile
+from datetime import datetime
+from utils.instrumentation import instrumentation
+
+# Score components in display order, with their column labels
+SCORE_FIELDS = [
+    ('overall_score', 'Overall Score'),
+    ('keyword_score', 'Keyword Match'),
+    ('skills_score', 'Skills Match'),
+    ('experience_score', 'Experience Score'),
+    ('tfidf_similarity', 'TF-IDF Similarity')
+]
+
+# Score components only some relevance models produce; a column is added when any result has one
+OPTIONAL_SCORE_FIELDS = [
+    ('bm25_score', 'BM25 Relevance')
+]
+
+# Detail columns that hold lists
+DETAIL_FIELDS = [
+    ('matched_keywords', 'Matched Keywords'),
+    ('insights', 'Insights'),
+    ('duplicates', 'Duplicate Submissions')
+]
+
+# Shared result schema for every export format and the PDF rankings table
+RESULT_SCHEMA = [('rank', 'Rank'), ('candidate', 'Candidate')] + SCORE_FIELDS + DETAIL_FIELDS
+
+# Export formats: file suffix and MIME type
+EXPORT_FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'xlsx': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'jsonl': ('.jsonl', 'application/x-ndjson'),
+    'html': ('.html', 'text/html')
+}
+
+# Separator for list values in flat formats (CSV, XLSX)
+LIST_SEPARATOR = "; "
+
+# Leading characters that make spreadsheet applications evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def escape_formula(value):
+    """
+    Neutralize text a spreadsheet would run as a formula (CSV/formula injection)
+    
+    Args:
+        value: Cell value
+    
+    Returns:
+        The value, with a leading apostrophe if it is text starting with a formula character
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def candidate_name(result):
+    """Display name of a candidate, derived from the resume filename"""
+    return os.path.splitext(result['filename'])[0]
+
+def score_fields(results):
+    """
+    Score columns for a set of results: SCORE_FIELDS plus the optional components they carry
+    
+    Args:
+        results (list): Ranking results
+    
+    Returns:
+        list: (field, label) pairs in display order
+    """
+    present = set()
+    for result in results:
+        present.update(result['scores'])
+    return SCORE_FIELDS + [column for column in OPTIONAL_SCORE_FIELDS if column[0] in present]
+
+def result_schema(results):
+    """
+    Export schema for a set of results; RESULT_SCHEMA with any optional score columns
+    
+    Args:
+        results (list): Ranking results
+    
+    Returns:
+        list: (field, label) pairs in column order
+    """
+    return [('rank', 'Rank'), ('candidate', 'Candidate')] + score_fields(results) + DETAIL_FIELDS
+
+def iter_result_rows(results, start=0, insights=None, keywords=None, details=True, fields=SCORE_FIELDS):
+    """
+    Yield one row per ranking result following RESULT_SCHEMA
+    
+    Args:
+        results (iterable): Ranking results, best first
+        start (int): Rank offset of the first result (0-based)
+        insights (callable): Returns a result's insights; defaults to result['insights']
+        keywords (callable): Returns a result's matched keywords; defaults to result['matched_keywords']
+        details (bool): Whether to include matched keywords, insights and duplicate filenames
+        fields (list): Score columns to fill, see score_fields
+    
+    Yields:
+        dict: Row keyed by schema field, scores rounded to one decimal
+    """
+    for rank, result in enumerate(results, start=start + 1):
+        scores = result['scores']
+        row = {'rank': rank, 'candidate': candidate_name(result)}
+        for field, _ in fields:
+            row[field] = round(float(scores.get(field, 0)), 1)
+        
+        if details:
+            row['matched_keywords'] = list(
+                keywords(result) if keywords else result.get('matched_keywords') or []
+            )
+            row['insights'] = list(insights(result) if insights else result.get('insights') or [])
+            row['duplicates'] = [duplicate['filename'] for duplicate in result.get('duplicates') or []]
+        
+        yield row
+
+class ResultExporter:
+    """Writes ranking results to CSV, XLSX, JSONL and static HTML, one row at a time"""
+    
+    def __init__(self, insights=None, keywords=None):
+        """
+        Initialize the exporter
+        
+        Args:
+            insights (callable): Returns a result's insights, computing them if needed
+            keywords (callable): Returns a result's matched keywords, computing them if needed
+        """
+        self.insights = insights
+        self.keywords = keywords
+    
+    @staticmethod
+    def available_formats():
+        """Export formats whose dependencies are installed"""
+        formats = list(EXPORT_FORMATS)
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            formats.remove('xlsx')
+        return formats
+    
+    def _rows(self, results, schema):
+        fields = [column for column in schema[2:] if column not in DETAIL_FIELDS]
+        return iter_result_rows(results, insights=self.insights, keywords=self.keywords, fields=fields)
+    
+    @staticmethod
+    def _flat(row, schema=RESULT_SCHEMA):
+        """Row values in schema order with list fields joined, escaped for spreadsheet applications"""
+        return [
+            escape_formula(LIST_SEPARATOR.join(row[field]) if isinstance(row[field], list) else row[field])
+            for field, _ in schema
+        ]
+    
+    def write_csv(self, results, stream):
+        """
+        Write results as CSV
+        
+        Args:
+            results (list): Ranking results, best first
+            stream: Text file opened with newline=''
+        """
+        schema = result_schema(results)
+        writer = csv.writer(stream)
+        writer.writerow([label for _, label in schema])
+        for row in self._rows(results, schema):
+            writer.writerow(self._flat(row, schema))
+    
+    def write_jsonl(self, results, stream):
+        """
+        Write results as JSON Lines, one candidate per line
+        
+        Args:
+            results (list): Ranking results, best first
+            stream: Text file
+        """
+        for row in self._rows(results, result_schema(results)):
+            stream.write(json.dumps(row, ensure_ascii=False))
+            stream.write("\n")
+    
+    def write_xlsx(self, results, path):
+        """
+        Write results to an Excel workbook in openpyxl's streaming write-only mode
+        
+        Args:
+            results (list): Ranking results, best first
+            path (str): Output file path
+        """
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise ImportError("openpyxl is not installed. Install it with: pip install openpyxl")
+        
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Rankings")
+        schema = result_schema(results)
+        sheet.append([label for _, label in schema])
+        for row in self._rows(results, schema):
+            sheet.append(self._flat(row, schema))
+        workbook.save(path)
+    
+    def write_html(self, results, stream, job_description=""):
+        """
+        Write a self-contained static HTML report
+        
+        Args:
+            results (list): Ranking results, best first
+            stream: Text file
+            job_description (str): Job description shown above the table
+        """
+        stream.write(
+            "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+            "<title>Resume Ranking Results</title>\n<style>\n"
+            "body { font-family: Helvetica, Arial, sans-serif; margin: 2em; color: #222; }\n"
+            "h1 { color: #00008b; }\n"
+            ".job { white-space: pre-wrap; background: #f4f4f4; padding: 1em; max-height: 20em; overflow: auto; }\n"
+            "table { border-collapse: collapse; width: 100%; font-size: 0.9em; }\n"
+            "th, td { border: 1px solid #999; padding: 4px 8px; vertical-align: top; }\n"
+            "th { background: #808080; color: #fff; position: sticky; top: 0; }\n"
+            "tr:nth-child(even) { background: #eee; }\n"
+            "td.num { text-align: right; }\n"
+            "</style>\n</head>\n<body>\n"
+            "<h1>AI-Powered Resume Ranking Results</h1>\n"
+            f"<p>Generated {html.escape(datetime.now().strftime('%B %d, %Y %H:%M'))}</p>\n"
+        )
+        if job_description:
+            stream.write(f"<h2>Job Description</h2>\n<div class=\"job\">{html.escape(job_description)}</div>\n")
+        
+        schema = result_schema(results)
+        stream.write("<h2>Rankings</h2>\n<table>\n<thead><tr>")
+        stream.write("".join(f"<th>{html.escape(label)}</th>" for _, label in schema))
+        stream.write("</tr></thead>\n<tbody>\n")
+        
+        numeric_fields = {field for field, _ in score_fields(results)}
+        for row in self._rows(results, schema):
+            cells = []
+            for field, _ in schema:
+                value = row[field]
+                if isinstance(value, list):
+                    cells.append(f"<td>{'<br>'.join(html.escape(str(item)) for item in value)}</td>")
+                elif field in numeric_fields:
+                    cells.append(f"<td class=\"num\">{value:.1f}%</td>")
+                else:
+                    cells.append(f"<td>{html.escape(str(value))}</td>")
+            stream.write(f"<tr>{''.join(cells)}</tr>\n")
+        
+        stream.write("</tbody>\n</table>\n</body>\n</html>\n")
+    
+    @instrumentation.timed('export.write')
+    def export_file(self, results, fmt, job_description="", path=None):
+        """
+        Export results to a file
+        
+        Args:
+            results (list): Ranking results, best first
+            fmt (str): One of EXPORT_FORMATS
+            job_description (str): Job description (used by the HTML report)
+            path (str): Output path; a temporary file is created if omitted
+        
+        Returns:
+            str: Path of the written file (the caller is responsible for deleting temporary files)
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="resume_ranking_", suffix=EXPORT_FORMATS[fmt][0])
+            os.close(fd)
+        
+        try:
+            if fmt == 'xlsx':
+                self.write_xlsx(results, path)
+            else:
+                with open(path, "w", encoding="utf-8", newline="") as stream:
+                    if fmt == 'csv':
+                        self.write_csv(results, stream)
+                    elif fmt == 'jsonl':
+                        self.write_jsonl(results, stream)
+                    else:
+                        self.write_html(results, stream, job_description)
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        
+        return path
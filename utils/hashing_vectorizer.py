@@ -0,0 +1,119 @@
+import threading
+
+# Fixed feature dimension shared by every engine
+DEFAULT_N_FEATURES = 2 ** 18
+
+class DocumentFrequencies:
+    """Running document-frequency counts over hashed features, counting each distinct document once"""
+    
+    def __init__(self, n_features=DEFAULT_N_FEATURES):
+        """
+        Initialize empty counts
+        
+        Args:
+            n_features (int): Hashed feature dimension
+        """
+        import numpy as np
+        
+        self.n_features = n_features
+        self.num_docs = 0
+        self.counts = np.zeros(n_features, dtype=np.int64)
+        self._seen = set()
+        self._lock = threading.Lock()
+    
+    def add(self, term_counts, digests=None):
+        """
+        Count the documents in a term-count matrix
+        
+        Args:
+            term_counts (csr_matrix): One row per document, n_features columns
+            digests (list): Content hash per row; rows whose hash was already counted are skipped
+        
+        Returns:
+            int: Number of documents counted
+        """
+        import numpy as np
+        
+        term_counts = term_counts.tocsr()
+        term_counts.sum_duplicates()
+        
+        with self._lock:
+            if digests is not None:
+                rows = []
+                for row, digest in enumerate(digests):
+                    if digest not in self._seen:
+                        self._seen.add(digest)
+                        rows.append(row)
+                term_counts = term_counts[rows]
+            
+            self.counts += np.bincount(term_counts.indices, minlength=self.n_features)
+            self.num_docs += term_counts.shape[0]
+            return term_counts.shape[0]
+    
+    def idf(self):
+        """Smoothed IDF per feature, matching scikit-learn's TfidfTransformer(smooth_idf=True)"""
+        import numpy as np
+        
+        with self._lock:
+            counts, num_docs = self.counts.copy(), self.num_docs
+        return np.log((1 + num_docs) / (1 + counts)) + 1
+
+class HashingTfidf:
+    """TF-IDF over a fixed hashed feature space, with no fitted vocabulary"""
+    
+    def __init__(self, n_features=DEFAULT_N_FEATURES, doc_freqs=None):
+        """
+        Initialize the vectorizer
+        
+        Args:
+            n_features (int): Hashed feature dimension
+            doc_freqs (DocumentFrequencies): Existing counts to continue from
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+        
+        self.n_features = n_features
+        # Same analysis as the fitted TF-IDF vectorizer; stateless, so safe to share between threads
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            stop_words='english',
+            ngram_range=(1, 2),
+            lowercase=True,
+            alternate_sign=False,
+            norm=None
+        )
+        self.doc_freqs = doc_freqs or DocumentFrequencies(n_features)
+    
+    def transform(self, texts):
+        """
+        Hash texts to raw term counts; any worker can do this independently
+        
+        Args:
+            texts (list): Texts to vectorize
+        
+        Returns:
+            csr_matrix: One row of term counts per text
+        """
+        return self.hasher.transform(texts)
+    
+    def partial_fit(self, term_counts, digests=None):
+        """Add documents to the running document-frequency counts, skipping already counted digests"""
+        return self.doc_freqs.add(term_counts, digests)
+    
+    def similarities(self, doc_counts, query_counts):
+        """
+        Cosine similarity of each document to a query under the current IDF
+        
+        Args:
+            doc_counts (csr_matrix): Term counts of the documents
+            query_counts (csr_matrix): Term counts of the query (one row)
+        
+        Returns:
+            ndarray: One similarity per document, as a percentage
+        """
+        from scipy.sparse import diags
+        from sklearn.preprocessing import normalize
+        
+        weights = diags(self.doc_freqs.idf())
+        docs = normalize(doc_counts @ weights)
+        query = normalize(query_counts @ weights)
+        return (docs @ query.T).toarray().ravel() * 100
@@ -0,0 +1,390 @@
+"""
+Persisted vocabulary and IDF learned from the historical resume corpus
+
+TF-IDF scored against these statistics is transform-only: nothing is fitted
+on the uploaded batch, so scores are comparable across runs. The store is
+built offline and can keep learning from newly scored resumes.
+
+Usage:
+    python -m utils.idf_store build path/to/resumes [--reset]
+    python -m utils.idf_store prune --min-df 2
+    python -m utils.idf_store reset    # forget every learned resume
+    python -m utils.idf_store stats
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+
+# Default location of the IDF database
+DEFAULT_IDF_DB = os.environ.get(
+    "RESUME_RANKER_IDF_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "idf.db")
+)
+
+# Stored vocabulary cap; past it the rarest terms are dropped, as they carry the least weight in practice
+MAX_VOCABULARY_TERMS = int(os.environ.get("RESUME_RANKER_IDF_MAX_TERMS", 200000))
+
+# Documents merged into the in-memory statistics before the vocabulary is reloaded from disk;
+# until then terms first seen in new documents are not scored
+SNAPSHOT_REFRESH_DOCUMENTS = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS corpus_stats (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    digest TEXT PRIMARY KEY
+);
+"""
+
+class IDFStore:
+    """SQLite-backed vocabulary and IDF table for transform-only TF-IDF scoring"""
+    
+    def __init__(self, db_path=DEFAULT_IDF_DB, min_df=1, max_terms=MAX_VOCABULARY_TERMS):
+        """
+        Open (and create if needed) the IDF database
+        
+        Args:
+            db_path (str): Path to the SQLite database file
+            min_df (int): Minimum document frequency for a term to be part of the vocabulary
+            max_terms (int): Most terms kept in the database; None for no cap
+        """
+        self.db_path = db_path
+        self.min_df = min_df
+        self.max_terms = max_terms
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._analyzer = None
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+    
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection that commits on success"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    @property
+    def analyzer(self):
+        """Term analyzer matching the scoring engine's TF-IDF vectorizer (stop words, 1-2 grams)"""
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+            
+            self._analyzer = CountVectorizer(
+                stop_words='english', ngram_range=(1, 2), lowercase=True
+            ).build_analyzer()
+        return self._analyzer
+    
+    def add_documents(self, texts):
+        """
+        Add preprocessed documents to the corpus statistics
+        
+        Documents already in the store (by content hash) are skipped, so
+        scoring the same resumes again does not skew the statistics. The new
+        document frequencies are merged into the loaded statistics rather than
+        reloading the whole vocabulary after every batch.
+        
+        Args:
+            texts (iterable): Preprocessed document texts
+        
+        Returns:
+            int: Number of documents added
+        """
+        from collections import Counter
+        
+        documents = {}
+        for text in texts:
+            if text:
+                documents.setdefault(hashlib.sha256(text.encode('utf-8')).hexdigest(), text)
+        
+        if not documents:
+            return 0
+        
+        with self._lock, self._connect() as conn:
+            digests = list(documents)
+            known = set()
+            for offset in range(0, len(digests), 500):
+                chunk = digests[offset:offset + 500]
+                known.update(row[0] for row in conn.execute(
+                    f"SELECT digest FROM documents WHERE digest IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            
+            new_digests = [digest for digest in digests if digest not in known]
+            if not new_digests:
+                return 0
+            
+            doc_freqs = Counter()
+            for digest in new_digests:
+                doc_freqs.update(set(self.analyzer(documents[digest])))
+            
+            conn.executemany("INSERT INTO documents (digest) VALUES (?)", ((digest,) for digest in new_digests))
+            conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, ?) "
+                "ON CONFLICT (term) DO UPDATE SET df = df + excluded.df",
+                doc_freqs.items()
+            )
+            conn.execute(
+                "INSERT INTO corpus_stats (key, value) VALUES ('num_docs', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+                (len(new_digests),)
+            )
+            pruned = self.max_terms is not None and self._cap_terms(conn, self.max_terms)
+            
+            if self._snapshot is not None:
+                self._snapshot = None if pruned else self._merge_snapshot(self._snapshot, doc_freqs, len(new_digests))
+        
+        return len(new_digests)
+    
+    @staticmethod
+    def _cap_terms(conn, max_terms):
+        """Drop the rarest terms beyond max_terms; returns the number dropped"""
+        excess = conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0] - max_terms
+        if excess <= 0:
+            return 0
+        return conn.execute(
+            "DELETE FROM terms WHERE term IN (SELECT term FROM terms ORDER BY df, term LIMIT ?)", (excess,)
+        ).rowcount
+    
+    def prune(self, min_df=2, max_terms=None):
+        """
+        Remove rare terms from the stored vocabulary
+        
+        Pruned terms start counting from zero if they are seen again, so this
+        is meant for occasional maintenance of a large corpus.
+        
+        Args:
+            min_df (int): Terms in fewer documents than this are removed
+            max_terms (int): Optional cap on the number of terms kept
+        
+        Returns:
+            int: Number of terms removed
+        """
+        with self._lock, self._connect() as conn:
+            removed = conn.execute("DELETE FROM terms WHERE df < ?", (min_df,)).rowcount
+            if max_terms is not None:
+                removed += self._cap_terms(conn, max_terms)
+            self._snapshot = None
+        return removed
+    
+    def reset(self):
+        """Remove all corpus statistics"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM terms")
+            conn.execute("DELETE FROM corpus_stats")
+            conn.execute("DELETE FROM documents")
+            self._snapshot = None
+    
+    def _load_snapshot(self):
+        """Load the vocabulary, IDF vector and a transform-only vectorizer"""
+        import numpy as np
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM corpus_stats WHERE key = 'num_docs'").fetchone()
+            num_docs = row[0] if row else 0
+            terms = conn.execute(
+                "SELECT term, df FROM terms WHERE df >= ? ORDER BY term", (self.min_df,)
+            ).fetchall()
+        
+        if not num_docs or not terms:
+            return {'num_docs': num_docs, 'vocabulary_size': 0, 'vectorizer': None, 'idf': None}
+        
+        vocabulary = {term: index for index, (term, _) in enumerate(terms)}
+        doc_freqs = np.fromiter((df for _, df in terms), dtype=np.float64, count=len(terms))
+        
+        return {
+            'num_docs': num_docs,
+            'merged_docs': 0,
+            'doc_freqs': doc_freqs,
+            'vocabulary_size': len(vocabulary),
+            # A fixed vocabulary needs no fitting; fit() only validates it here, so concurrent
+            # transforms never initialize it lazily
+            'vectorizer': CountVectorizer(
+                stop_words='english', ngram_range=(1, 2), lowercase=True, vocabulary=vocabulary
+            ).fit([]),
+            'idf': self._idf(num_docs, doc_freqs)
+        }
+    
+    @staticmethod
+    def _idf(num_docs, doc_freqs):
+        """Smoothed IDF, as in scikit-learn's TfidfTransformer"""
+        import numpy as np
+        
+        return np.log((1 + num_docs) / (1 + doc_freqs)) + 1
+    
+    def _merge_snapshot(self, snapshot, doc_freqs, added):
+        """
+        Fold new document frequencies into loaded statistics
+        
+        The vocabulary stays fixed, so terms first seen since the last load are
+        ignored until SNAPSHOT_REFRESH_DOCUMENTS documents have been merged and
+        the next snapshot() reloads from disk.
+        
+        Returns:
+            dict: A new snapshot (readers may still hold the old one), or None to reload
+        """
+        if snapshot['vectorizer'] is None or snapshot['merged_docs'] + added > SNAPSHOT_REFRESH_DOCUMENTS:
+            return None
+        
+        vocabulary = snapshot['vectorizer'].vocabulary_
+        merged_freqs = snapshot['doc_freqs'].copy()
+        for term, df in doc_freqs.items():
+            index = vocabulary.get(term)
+            if index is not None:
+                merged_freqs[index] += df
+        
+        num_docs = snapshot['num_docs'] + added
+        return dict(
+            snapshot,
+            num_docs=num_docs,
+            merged_docs=snapshot['merged_docs'] + added,
+            doc_freqs=merged_freqs,
+            idf=self._idf(num_docs, merged_freqs)
+        )
+    
+    def snapshot(self):
+        """Current statistics, loaded from disk on first use and periodically as documents are added"""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._load_snapshot()
+            return self._snapshot
+    
+    def get_stats(self):
+        """
+        Get the size of the stored corpus
+        
+        Returns:
+            dict: 'num_docs' and 'vocabulary_size'
+        """
+        snapshot = self.snapshot()
+        return {'num_docs': snapshot['num_docs'], 'vocabulary_size': snapshot['vocabulary_size']}
+    
+    @property
+    def ready(self):
+        """Whether the store holds any statistics to score with"""
+        return self.snapshot()['vectorizer'] is not None
+    
+    def similarities(self, resume_texts, job_desc_text):
+        """
+        TF-IDF cosine similarity of resumes to a job description under the stored IDF
+        
+        Args:
+            resume_texts (list): Preprocessed resume texts
+            job_desc_text (str): Preprocessed job description text
+        
+        Returns:
+            ndarray: One similarity per resume, as a percentage
+        """
+        from scipy.sparse import diags
+        from sklearn.preprocessing import normalize
+        
+        snapshot = self.snapshot()
+        if snapshot['vectorizer'] is None:
+            raise ValueError("The IDF store is empty")
+        
+        weights = diags(snapshot['idf'])
+        counts = snapshot['vectorizer'].transform([job_desc_text] + list(resume_texts))
+        tfidf_matrix = normalize(counts @ weights).tocsr()
+        
+        return (tfidf_matrix[1:] @ tfidf_matrix[0].T).toarray().ravel() * 100
+
+def _iter_resume_files(paths):
+    """Yield resume files (PDF, DOCX, TXT, RTF) from the given files and folders"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(('.pdf', '.docx', '.txt', '.rtf')):
+                        yield os.path.join(root, filename)
+        else:
+            yield path
+
+def _read_resume(path, document_processor):
+    """Extract the text of a resume file in any supported format"""
+    from io import BytesIO
+    
+    with open(path, 'rb') as f:
+        upload = BytesIO(f.read())
+    upload.name = os.path.basename(path)
+    return document_processor.extract_text(upload)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect the persisted IDF statistics")
+    parser.add_argument("--db", default=DEFAULT_IDF_DB, help="IDF database path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    build = subparsers.add_parser("build", help="Add resumes (PDF, DOCX, TXT or RTF files, or folders) to the corpus")
+    build.add_argument("paths", nargs="+", help="Resume files or folders")
+    build.add_argument("--reset", action="store_true", help="Clear existing statistics first")
+    build.add_argument("--batch-size", type=int, default=64, help="Documents per database update")
+    
+    prune = subparsers.add_parser("prune", help="Remove rare terms from the stored vocabulary")
+    prune.add_argument("--min-df", type=int, default=2, help="Remove terms seen in fewer documents")
+    prune.add_argument("--max-terms", type=int, default=None, help="Keep at most this many terms")
+    
+    subparsers.add_parser("reset", help="Remove all corpus statistics")
+    subparsers.add_parser("stats", help="Show corpus size")
+    args = parser.parse_args(argv)
+    
+    store = IDFStore(args.db)
+    
+    if args.command == "build":
+        from utils.nlp_processor import NLPProcessor
+        from utils.document_processor import DocumentProcessor
+        
+        if args.reset:
+            store.reset()
+        
+        document_processor = DocumentProcessor()
+        nlp_processor = NLPProcessor()
+        
+        # Statistics are learned from preprocessed text, the same form the scoring engine compares
+        batch, added, skipped = [], 0, 0
+        for path in _iter_resume_files(args.paths):
+            text = _read_resume(path, document_processor)
+            if not text:
+                skipped += 1
+                continue
+            batch.append(text)
+            if len(batch) >= args.batch_size:
+                added += store.add_documents(nlp_processor.preprocess_texts(batch))
+                batch = []
+                print(f"Added {added} documents...", flush=True)
+        if batch:
+            added += store.add_documents(nlp_processor.preprocess_texts(batch))
+        
+        print(f"Added {added} documents ({skipped} skipped)")
+    
+    elif args.command == "reset":
+        store.reset()
+    
+    elif args.command == "prune":
+        print(f"Removed {store.prune(args.min_df, args.max_terms)} terms")
+    
+    stats = store.get_stats()
+    print(f"{args.db}: {stats['num_docs']} documents, {stats['vocabulary_size']} terms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Histogram bucket upper bounds in seconds, used for stage timings
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Prefix applied to every exported metric name
+METRIC_PREFIX = "resume_ranker_"
+
+class _NullTimer:
+    """Shared no-op context manager returned while instrumentation is disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Histogram:
+    """Cumulative bucket histogram in the Prometheus style"""
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+class ProfileRun:
+    """Report of one profile() block, filled in when the block exits"""
+    
+    def __init__(self, mode):
+        self.mode = mode
+        self.report = None
+
+class Instrumentation:
+    """Lightweight timers, counters and histograms for the ranking pipeline"""
+    
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the instrumentation registry
+        
+        Args:
+            enabled (bool): Whether measurements are recorded
+            buckets (tuple): Histogram bucket upper bounds in seconds
+        """
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._captures = []  # Profiles of the cProfile blocks currently running
+    
+    def enable(self, enabled=True):
+        """Turn measurement on or off"""
+        self.enabled = enabled
+    
+    def reset(self):
+        """Discard all recorded measurements"""
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+    
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+    
+    def increment(self, name, value=1, **labels):
+        """
+        Increase a counter
+        
+        Args:
+            name (str): Counter name
+            value (float): Amount to add
+            **labels: Label values identifying the series
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name, value, **labels):
+        """
+        Record a value in a histogram
+        
+        Args:
+            name (str): Histogram name
+            value (float): Observed value
+            **labels: Label values identifying the series
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+    
+    def timer(self, stage, **labels):
+        """
+        Context manager timing a pipeline stage
+        
+        Records the duration in the 'stage_duration_seconds' histogram and
+        counts failures in 'stage_errors_total'.
+        
+        Args:
+            stage (str): Stage name, e.g. 'pdf.extract_text'
+            **labels: Extra labels, e.g. the extraction method
+        
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(stage, labels)
+    
+    @contextmanager
+    def _timer(self, stage, labels):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.increment('stage_errors_total', stage=stage, **labels)
+            raise
+        finally:
+            self.observe('stage_duration_seconds', time.perf_counter() - started, stage=stage, **labels)
+    
+    def timed(self, stage):
+        """
+        Decorator timing every call of a function as a pipeline stage
+        
+        Args:
+            stage (str): Stage name
+        
+        Returns:
+            Decorator
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._timer(stage, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    @contextmanager
+    def profile(self, mode="cprofile", top_n=40):
+        """
+        Capture a profile of everything run inside the block
+        
+        In 'cprofile' mode, code wrapped in profile_thread() on other threads
+        (such as the batch scheduler) is merged into the same report. The
+        'pyinstrument' mode profiles the calling thread only and requires
+        pyinstrument to be installed. Each block gets its own report, so
+        concurrent sessions never see each other's profiles.
+        
+        Args:
+            mode (str): 'cprofile' or 'pyinstrument'
+            top_n (int): Number of functions listed in the cProfile report
+        
+        Yields:
+            ProfileRun: Holds the text report once the block exits
+        """
+        run = ProfileRun(mode)
+        
+        if mode == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ImportError("pyinstrument is not installed. Install it with: pip install pyinstrument")
+            
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield run
+            finally:
+                profiler.stop()
+                run.report = profiler.output_text(unicode=True, color=False)
+            return
+        
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per interpreter; another run holds it
+            run.report = "Not profiled: another run in this server process was being profiled at the same time."
+            yield run
+            return
+        
+        capture = []
+        with self._lock:
+            self._captures.append(capture)
+        try:
+            yield run
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._captures.remove(capture)
+                profiles = [profiler] + capture
+            
+            stream = io.StringIO()
+            stats = pstats.Stats(*profiles, stream=stream)
+            stats.sort_stats('cumulative').print_stats(top_n)
+            run.report = stream.getvalue()
+    
+    @contextmanager
+    def profile_thread(self):
+        """Profile the current thread's block into the active cProfile captures, if any"""
+        with self._lock:
+            captures = list(self._captures)
+        if not captures:
+            yield
+            return
+        
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per interpreter, and it
+            # already sees every thread
+            yield
+            return
+        
+        try:
+            yield
+        finally:
+            profiler.disable()
+            # Shared work such as a scheduler batch counts towards every run being profiled
+            with self._lock:
+                for capture in captures:
+                    capture.append(profiler)
+    
+    def snapshot(self):
+        """
+        Get a copy of all recorded measurements
+        
+        Returns:
+            dict: 'counters' and 'histograms' lists with names, labels and values
+        """
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'max': histogram.max,
+                    'mean': histogram.sum / histogram.count if histogram.count else 0.0,
+                    'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], histogram.counts))
+                }
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+        return {'enabled': self.enabled, 'counters': counters, 'histograms': histograms}
+    
+    def to_json(self, indent=2):
+        """Export all measurements as a JSON document"""
+        return json.dumps(self.snapshot(), indent=indent)
+    
+    def to_prometheus(self):
+        """Export all measurements in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        
+        def format_labels(labels, extra=None):
+            items = list(labels.items()) + (list(extra.items()) if extra else [])
+            if not items:
+                return ""
+            escaped = [
+                '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                for k, v in items
+            ]
+            return "{" + ",".join(escaped) + "}"
+        
+        typed = set()
+        for counter in snapshot['counters']:
+            name = METRIC_PREFIX + counter['name']
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{format_labels(counter['labels'])} {counter['value']}")
+        
+        for histogram in snapshot['histograms']:
+            name = METRIC_PREFIX + histogram['name']
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in histogram['buckets'].items():
+                cumulative += count
+                lines.append(f"{name}_bucket{format_labels(histogram['labels'], {'le': bound})} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(histogram['labels'])} {histogram['sum']}")
+            lines.append(f"{name}_count{format_labels(histogram['labels'])} {histogram['count']}")
+        
+        return "\n".join(lines) + "\n"
+
+# Process-wide instance used by the pipeline modules
+instrumentation = Instrumentation(enabled=os.environ.get("RESUME_RANKER_INSTRUMENTATION") == "1")
@@ -0,0 +1,321 @@
+"""
+Prepared job-description artifacts, persisted to disk
+
+Preprocessing a job description (spaCy lemmas, keywords, technical skills
+and required years) depends only on its text and the processing pipeline, so
+it is done once and stored under a version hash of both. The built-in sample
+jobs and the user's saved job library are prepared ahead of time; selecting
+one of them then costs a dictionary lookup.
+
+Usage:
+    python -m utils.job_artifacts build
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Default location of the prepared artifacts and the saved job library
+DEFAULT_JOB_ARTIFACTS_DIR = os.environ.get(
+    "RESUME_RANKER_JOB_ARTIFACTS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "job_artifacts")
+)
+
+# Bump when the artifact fields or the way they are computed change
+ARTIFACT_FORMAT = 1
+
+# Prepared jobs kept in memory
+MAX_MEMORY_ARTIFACTS = 64
+
+# Job descriptions remembered as not prepared, and for how long; artifacts another
+# process builds in the meantime are picked up once the entry expires
+MAX_MISSING_ARTIFACTS = 256
+MISSING_ARTIFACT_SECONDS = 30
+
+class PreparedJob:
+    """Everything the scoring pipeline derives from a job description alone"""
+    
+    __slots__ = ('processed_text', 'keywords', 'tech_skills', 'required_years', 'version')
+    
+    def __init__(self, processed_text, keywords, tech_skills, required_years, version):
+        self.processed_text = processed_text
+        self.keywords = list(keywords)
+        self.tech_skills = set(tech_skills)
+        self.required_years = required_years
+        self.version = version
+    
+    def to_dict(self):
+        """JSON-serializable form"""
+        return {
+            'processed_text': self.processed_text,
+            'keywords': self.keywords,
+            'tech_skills': sorted(self.tech_skills),
+            'required_years': self.required_years,
+            'version': self.version
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild from the output of to_dict"""
+        return cls(
+            data['processed_text'],
+            data['keywords'],
+            data['tech_skills'],
+            data['required_years'],
+            data['version']
+        )
+
+class JobArtifactStore:
+    """Builds, persists and looks up prepared job descriptions and the saved job library"""
+    
+    def __init__(self, nlp_processor, scoring_engine, directory=DEFAULT_JOB_ARTIFACTS_DIR):
+        """
+        Initialize the store
+        
+        Args:
+            nlp_processor (NLPProcessor): Processor used to preprocess job descriptions
+            scoring_engine (ScoringEngine): Engine whose keyword, skill and experience extraction is cached
+            directory (str): Folder for artifact files and the saved job library
+        """
+        self.nlp_processor = nlp_processor
+        self.scoring_engine = scoring_engine
+        self.directory = directory
+        self._memory = OrderedDict()
+        self._missing = OrderedDict()  # (job description, version) -> time of the failed lookup
+        self._lock = threading.Lock()
+        self._pipeline_version = None
+        
+        os.makedirs(directory, exist_ok=True)
+    
+    @property
+    def library_path(self):
+        """JSON file holding the saved job library"""
+        return os.path.join(self.directory, "library.json")
+    
+    def pipeline_version(self):
+        """
+        Hash of everything besides the text that affects the artifacts
+        
+        Returns:
+            str: Version hash, or None while the spaCy model is still loading
+        """
+        if self._pipeline_version is not None:
+            return self._pipeline_version
+        if not self.nlp_processor.model_loaded:
+            return None
+        
+        nlp = self.nlp_processor.nlp
+        if nlp is not None:
+            import spacy
+            
+            backend = f"spacy-{spacy.__version__}:{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+        else:
+            backend = "basic"
+        
+        digest = hashlib.sha256(f"format={ARTIFACT_FORMAT}\nnlp={backend}\n".encode('utf-8'))
+        for pattern in self.scoring_engine.tech_skills_patterns:
+            digest.update(pattern.encode('utf-8') + b"\n")
+        self._pipeline_version = digest.hexdigest()[:16]
+        return self._pipeline_version
+    
+    def _artifact_path(self, job_description, version):
+        """File holding the artifacts of a job description under a pipeline version"""
+        digest = hashlib.sha256(f"{version}\n{job_description}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+    
+    def _remember(self, job_description, prepared):
+        """Keep a prepared job in memory, evicting the least recently used"""
+        with self._lock:
+            self._missing.pop((job_description, prepared.version), None)
+            self._memory[job_description] = prepared
+            self._memory.move_to_end(job_description)
+            while len(self._memory) > MAX_MEMORY_ARTIFACTS:
+                self._memory.popitem(last=False)
+    
+    def get(self, job_description):
+        """
+        Look up prepared artifacts without computing anything
+        
+        Misses are remembered for MISSING_ARTIFACT_SECONDS, so scoring an
+        unprepared job description does not hash it and probe the disk for
+        every resume.
+        
+        Args:
+            job_description (str): Original job description text
+        
+        Returns:
+            PreparedJob: Artifacts for the current pipeline, or None if they have not been built
+        """
+        version = self.pipeline_version()
+        if version is None or not job_description:
+            return None
+        
+        key = (job_description, version)
+        with self._lock:
+            prepared = self._memory.get(job_description)
+            if prepared is not None:
+                self._memory.move_to_end(job_description)
+                return prepared if prepared.version == version else None
+            
+            missed_at = self._missing.get(key)
+            if missed_at is not None and time.monotonic() - missed_at < MISSING_ARTIFACT_SECONDS:
+                return None
+        
+        try:
+            with open(self._artifact_path(job_description, version), encoding='utf-8') as f:
+                prepared = PreparedJob.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            prepared = None
+        
+        if prepared is None or prepared.version != version:
+            with self._lock:
+                self._missing[key] = time.monotonic()
+                self._missing.move_to_end(key)
+                while len(self._missing) > MAX_MISSING_ARTIFACTS:
+                    self._missing.popitem(last=False)
+            return None
+        
+        self._remember(job_description, prepared)
+        return prepared
+    
+    def prepare(self, job_description, persist=True):
+        """
+        Get the artifacts of a job description, building them if needed
+        
+        Blocks until the spaCy model has loaded, since the processed text depends on it.
+        
+        Args:
+            job_description (str): Original job description text
+            persist (bool): Write newly built artifacts to disk
+        
+        Returns:
+            PreparedJob: Prepared artifacts
+        """
+        # Accessing the pipeline waits for the model, which fixes the pipeline version
+        self.nlp_processor.nlp
+        prepared = self.get(job_description)
+        if prepared is not None:
+            return prepared
+        
+        engine = self.scoring_engine
+        prepared = PreparedJob(
+            processed_text=self.nlp_processor.preprocess_text(job_description),
+            keywords=engine._extract_keywords(job_description.lower()),
+            tech_skills=engine._extract_tech_skills(job_description.lower()),
+            required_years=engine._extract_years_experience(job_description),
+            version=self.pipeline_version()
+        )
+        
+        if persist:
+            path = self._artifact_path(job_description, prepared.version)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(prepared.to_dict(), f)
+            os.replace(temp_path, path)
+        
+        self._remember(job_description, prepared)
+        return prepared
+    
+    def build(self, job_descriptions):
+        """
+        Prepare and persist several job descriptions
+        
+        Args:
+            job_descriptions (iterable): Original job description texts
+        
+        Returns:
+            int: Number of job descriptions prepared
+        """
+        count = 0
+        for job_description in job_descriptions:
+            if job_description:
+                self.prepare(job_description)
+                count += 1
+        return count
+    
+    def build_in_background(self, job_descriptions):
+        """
+        Prepare job descriptions on a daemon thread, e.g. at startup
+        
+        Args:
+            job_descriptions (iterable): Original job description texts
+        
+        Returns:
+            Thread: The started thread
+        """
+        thread = threading.Thread(
+            target=self.build,
+            args=(list(job_descriptions),),
+            name="job-artifact-builder",
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    def saved_jobs(self):
+        """
+        Get the saved job library
+        
+        Returns:
+            dict: Job name to job description text, in the order saved
+        """
+        try:
+            with open(self.library_path, encoding='utf-8') as f:
+                return json.load(f, object_pairs_hook=OrderedDict)
+        except (OSError, ValueError):
+            return OrderedDict()
+    
+    def _write_library(self, library):
+        """Replace the library file atomically"""
+        temp_path = f"{self.library_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(library, f, indent=2)
+        os.replace(temp_path, self.library_path)
+    
+    def save_job(self, name, job_description):
+        """
+        Add or replace a job description in the library and prepare its artifacts
+        
+        Args:
+            name (str): Display name
+            job_description (str): Original job description text
+        """
+        with self._lock:
+            library = self.saved_jobs()
+            library[name] = job_description
+            self._write_library(library)
+        self.prepare(job_description)
+    
+    def delete_job(self, name):
+        """Remove a job description from the library"""
+        with self._lock:
+            library = self.saved_jobs()
+            if library.pop(name, None) is not None:
+                self._write_library(library)
+
+def main(argv=None):
+    import argparse
+    
+    from sample_data.job_descriptions import SAMPLE_JOB_DESCRIPTIONS
+    from utils.nlp_processor import NLPProcessor
+    from utils.scoring_engine import ScoringEngine
+    
+    parser = argparse.ArgumentParser(description="Prepare job description artifacts ahead of time")
+    parser.add_argument("command", choices=["build"], help="Prepare the sample jobs and the saved job library")
+    parser.add_argument("--dir", default=DEFAULT_JOB_ARTIFACTS_DIR, help="Artifact directory")
+    args = parser.parse_args(argv)
+    
+    store = JobArtifactStore(NLPProcessor(), ScoringEngine(), args.dir)
+    samples = store.build(SAMPLE_JOB_DESCRIPTIONS.values())
+    saved = store.build(store.saved_jobs().values())
+    
+    print(f"Prepared {samples} sample and {saved} saved job descriptions "
+          f"(pipeline {store.pipeline_version()}) in {args.dir}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Default location of the background job database
+DEFAULT_JOB_QUEUE_DB = os.environ.get(
+    "RESUME_RANKER_JOB_QUEUE_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "jobs.db")
+)
+
+# A running job whose worker has not reported for this long is taken over by another worker
+STALE_JOB_SECONDS = 60
+
+# A job is failed instead of claimed again once this many workers died while processing it
+MAX_JOB_ATTEMPTS = 3
+
+# A worker is considered alive while its heartbeat is newer than this
+WORKER_TIMEOUT_SECONDS = 15
+
+# Finished jobs, with their uploaded files and results, are purged this many days after finishing;
+# 0 keeps them until deleted
+JOB_RETENTION_DAYS = float(os.environ.get("RESUME_RANKER_JOB_RETENTION_DAYS", 30))
+
+# Job states
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = 'queued', 'running', 'completed', 'failed', 'cancelled'
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    title TEXT NOT NULL,
+    job_description TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    files_total INTEGER NOT NULL,
+    files_done INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    heartbeat REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_owner ON jobs (owner, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+
+CREATE TABLE IF NOT EXISTS job_files (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    content BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+
+class JobQueue:
+    """Durable SQLite queue of ranking jobs, processed by background workers file by file"""
+    
+    def __init__(self, db_path=DEFAULT_JOB_QUEUE_DB, max_attempts=MAX_JOB_ATTEMPTS,
+                 retention_days=JOB_RETENTION_DAYS):
+        """
+        Open (and create if needed) the job database
+        
+        Args:
+            db_path (str): Path to the SQLite database file
+            max_attempts (int): Claims a job gets before it is marked failed
+            retention_days (float): Days a finished job is kept before purge removes it; 0 keeps it
+        """
+        self.db_path = db_path
+        self.max_attempts = max(1, int(max_attempts))
+        self.retention_days = max(0.0, float(retention_days))
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+    
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection that commits on success"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def submit(self, owner, job_description, files, settings=None, title=None):
+        """
+        Queue a ranking job
+        
+        Args:
+            owner (str): Token identifying who may see the job
+            job_description (str): Original job description text
+            files (list): (filename, file content) pairs, in upload order
+            settings (dict): Scoring settings, e.g. relevance model and duplicate threshold
+            title (str): Display title; defaults to the first line of the job description
+        
+        Returns:
+            str: Job ID
+        """
+        job_id = uuid.uuid4().hex[:12]
+        if title is None:
+            title = next((line.strip() for line in job_description.splitlines() if line.strip()), "Job")[:60]
+        
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, owner, title, job_description, settings, status, created_at, files_total) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, owner, title, job_description, json.dumps(settings or {}), QUEUED,
+                 datetime.now().isoformat(timespec='seconds'), len(files))
+            )
+            conn.executemany(
+                "INSERT INTO job_files (job_id, idx, filename, content) VALUES (?, ?, ?, ?)",
+                [(job_id, index, filename, sqlite3.Binary(content)) for index, (filename, content) in enumerate(files)]
+            )
+        return job_id
+    
+    def claim(self, worker_id):
+        """
+        Take the oldest queued job, or a running job whose worker stopped reporting
+        
+        A stale job that has already been claimed max_attempts times is marked
+        failed instead, so a file that crashes every worker cannot loop forever.
+        
+        Args:
+            worker_id (str): Identifier of the claiming worker
+        
+        Returns:
+            dict: The claimed job, or None if there is nothing to do
+        """
+        now = time.time()
+        with self._connect() as conn:
+            # BEGIN IMMEDIATE takes the write lock, so two workers never claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            while True:
+                row = conn.execute(
+                    "SELECT id, attempts FROM jobs WHERE status = ? OR (status = ? AND heartbeat < ?) "
+                    "ORDER BY created_at, rowid LIMIT 1",
+                    (QUEUED, RUNNING, now - STALE_JOB_SECONDS)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row['attempts'] < self.max_attempts:
+                    break
+                
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                    (FAILED, f"Worker stopped responding on each of {row['attempts']} attempts",
+                     datetime.now().isoformat(timespec='seconds'), row['id'])
+                )
+            
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, heartbeat = ?, attempts = attempts + 1, "
+                "started_at = COALESCE(started_at, ?) WHERE id = ?",
+                (RUNNING, worker_id, now, datetime.now().isoformat(timespec='seconds'), row['id'])
+            )
+        return self.get_job(row['id'])
+    
+    def heartbeat(self, job_id, worker_id):
+        """
+        Report that a worker is still processing a job
+        
+        Returns:
+            bool: False if the job was cancelled or taken over, so the worker should stop
+        """
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = ? AND worker = ?",
+                (time.time(), job_id, RUNNING, worker_id)
+            ).rowcount
+        return bool(updated)
+    
+    def pending_files(self, job_id):
+        """
+        Files of a job that have not been checkpointed yet
+        
+        Returns:
+            list: (index, filename) pairs in upload order
+        """
+        with self._connect() as conn:
+            return [
+                (row['idx'], row['filename'])
+                for row in conn.execute(
+                    "SELECT idx, filename FROM job_files WHERE job_id = ? AND status = 'pending' ORDER BY idx",
+                    (job_id,)
+                )
+            ]
+    
+    def load_file(self, job_id, index):
+        """
+        Read the uploaded content of one file
+        
+        Returns:
+            bytes: File content
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT content FROM job_files WHERE job_id = ? AND idx = ?", (job_id, index)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"File {index} of job {job_id} not found")
+        return bytes(row['content'])
+    
+    def finished_files(self, job_id):
+        """
+        Checkpointed files of a job
+        
+        Returns:
+            list: Dicts with 'index', 'filename', 'status', 'result' and 'error', in upload order
+        """
+        with self._connect() as conn:
+            return [
+                {
+                    'index': row['idx'],
+                    'filename': row['filename'],
+                    'status': row['status'],
+                    'result': json.loads(row['result']) if row['result'] else None,
+                    'error': row['error']
+                }
+                for row in conn.execute(
+                    "SELECT idx, filename, status, result, error FROM job_files "
+                    "WHERE job_id = ? AND status != 'pending' ORDER BY idx",
+                    (job_id,)
+                )
+            ]
+    
+    def checkpoint(self, job_id, entries):
+        """
+        Record finished files so a restarted worker does not process them again
+        
+        Args:
+            job_id (str): Job the files belong to
+            entries (list): (index, status, result, error) tuples; status is 'scored',
+                'duplicate' or 'failed' and result a JSON-serializable dict or None
+        """
+        with self._connect() as conn:
+            updated = 0
+            for index, status, result, error in entries:
+                updated += conn.execute(
+                    "UPDATE job_files SET status = ?, result = ?, error = ? "
+                    "WHERE job_id = ? AND idx = ? AND status = 'pending'",
+                    (status, json.dumps(result) if result is not None else None, error, job_id, index)
+                ).rowcount
+            conn.execute(
+                "UPDATE jobs SET files_done = files_done + ?, heartbeat = ? WHERE id = ?",
+                (updated, time.time(), job_id)
+            )
+    
+    def finish(self, job_id, status=COMPLETED, error=None):
+        """Mark a job as completed or failed"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (status, error, datetime.now().isoformat(timespec='seconds'), job_id, RUNNING)
+            )
+    
+    def cancel(self, job_id, owner):
+        """Cancel a queued or running job; its worker stops at the next checkpoint"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND owner = ? AND status IN (?, ?)",
+                (CANCELLED, datetime.now().isoformat(timespec='seconds'), job_id, owner, QUEUED, RUNNING)
+            )
+    
+    def delete(self, job_id, owner):
+        """Delete a finished job and its files"""
+        with self._connect() as conn:
+            deleted = conn.execute(
+                f"DELETE FROM jobs WHERE id = ? AND owner = ? AND status IN ({', '.join('?' * len(FINISHED_STATES))})",
+                (job_id, owner, *FINISHED_STATES)
+            ).rowcount
+            if deleted:
+                conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+    
+    def purge(self):
+        """
+        Delete finished jobs, with their files and results, older than the retention period
+        
+        Returns:
+            int: Number of jobs deleted
+        """
+        if not self.retention_days:
+            return 0
+        
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat(timespec='seconds')
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            expired = [
+                row['id'] for row in conn.execute(
+                    f"SELECT id FROM jobs WHERE finished_at < ? "
+                    f"AND status IN ({', '.join('?' * len(FINISHED_STATES))})",
+                    (cutoff, *FINISHED_STATES)
+                )
+            ]
+            for job_id in expired:
+                conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        return len(expired)
+    
+    def get_job(self, job_id):
+        """
+        Get a job without its files
+        
+        Returns:
+            dict: Job fields with 'settings' decoded, or None if it does not exist
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['settings'] = json.loads(job['settings'])
+        return job
+    
+    def list_jobs(self, owner, limit=50):
+        """
+        Get an owner's most recent jobs
+        
+        Returns:
+            list: Job dicts, newest first
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, title, status, created_at, started_at, finished_at, files_total, files_done, error "
+                "FROM jobs WHERE owner = ? ORDER BY created_at DESC LIMIT ?",
+                (owner, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def get_results(self, job_id):
+        """
+        Assemble the ranking of a job from its checkpointed files
+        
+        Returns:
+            list: Result dicts as produced by interactive ranking, best first; duplicates
+                are listed on the result of the file they duplicate
+        """
+        files = self.finished_files(job_id)
+        results = {entry['index']: entry['result'] for entry in files if entry['status'] == 'scored'}
+        for result in results.values():
+            result['duplicates'] = []
+        
+        for entry in files:
+            if entry['status'] == 'duplicate' and entry['result']:
+                representative = results.get(entry['result']['duplicate_of'])
+                if representative is not None:
+                    representative['duplicates'].append({
+                        'filename': entry['filename'],
+                        'similarity': entry['result']['similarity']
+                    })
+        
+        return sorted(results.values(), key=lambda result: result['scores']['overall_score'], reverse=True)
+    
+    def register_worker(self, worker_id):
+        """Record that a worker process is alive"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO workers (id, pid, heartbeat) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (worker_id, os.getpid(), time.time())
+            )
+    
+    def unregister_worker(self, worker_id):
+        """Remove a worker that is shutting down"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+    
+    def live_workers(self):
+        """Number of workers that reported recently"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM workers WHERE heartbeat >= ?",
+                (time.time() - WORKER_TIMEOUT_SECONDS,)
+            ).fetchone()[0]
+    
+    def has_work(self):
+        """Whether any job is waiting for, or being processed by, a worker"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT 1 FROM jobs WHERE status IN (?, ?) LIMIT 1", (QUEUED, RUNNING)
+            ).fetchone() is not None
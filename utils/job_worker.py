@@ -0,0 +1,291 @@
+"""
+Background worker for queued ranking jobs
+
+Claims jobs from the SQLite job queue and processes their files in small
+batches, checkpointing every file, so a job survives browser disconnects
+and is resumed by the next worker if this one dies. The app starts a
+worker on demand; one can also be run by hand:
+
+Usage:
+    python -m utils.job_worker
+    python -m utils.job_worker --idle-timeout 0    # run until stopped
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from io import BytesIO
+
+from utils.job_queue import FAILED, JobQueue
+
+# Files extracted and scored between checkpoints
+WORKER_BATCH_SIZE = 16
+
+# Seconds between polls for new jobs, and between heartbeats
+POLL_SECONDS = 2
+HEARTBEAT_SECONDS = 5
+
+# An idle worker exits after this long; the app starts a new one when jobs arrive
+DEFAULT_IDLE_TIMEOUT = 300
+
+class JobWorker:
+    """Processes queued ranking jobs outside the Streamlit request cycle"""
+    
+    def __init__(self, job_queue=None, batch_size=WORKER_BATCH_SIZE):
+        """
+        Initialize the worker and its processors
+        
+        Args:
+            job_queue (JobQueue): Queue to take jobs from
+            batch_size (int): Files processed between checkpoints
+        """
+        from utils.document_processor import DocumentProcessor
+        from utils.idf_store import IDFStore
+        from utils.job_artifacts import JobArtifactStore
+        from utils.metrics_store import MetricsStore
+        from utils.nlp_processor import NLPProcessor
+        from utils.scoring_engine import ScoringEngine
+        
+        self.job_queue = job_queue or JobQueue()
+        self.batch_size = max(1, int(batch_size))
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        
+        self.document_processor = DocumentProcessor()
+        self.nlp_processor = NLPProcessor()
+        self.scoring_engine = ScoringEngine(
+            idf_store=IDFStore(),
+            job_artifacts=JobArtifactStore(self.nlp_processor, ScoringEngine())
+        )
+        self.metrics_store = MetricsStore()
+        
+        self._current_job = None
+        self._cancelled = threading.Event()
+        self._stopped = threading.Event()
+    
+    def run(self, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        Process jobs until stopped, or until idle for idle_timeout seconds
+        
+        Args:
+            idle_timeout (float): Seconds without work before exiting; 0 runs forever
+        """
+        self.job_queue.register_worker(self.worker_id)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-worker-heartbeat", daemon=True)
+        heartbeat.start()
+        
+        idle_since = time.monotonic()
+        try:
+            self._purge()
+            while not self._stopped.is_set():
+                job = self.job_queue.claim(self.worker_id)
+                if job is None:
+                    if idle_timeout and time.monotonic() - idle_since > idle_timeout:
+                        break
+                    self._stopped.wait(POLL_SECONDS)
+                    continue
+                
+                self.process_job(job)
+                self._purge()
+                idle_since = time.monotonic()
+        finally:
+            self._stopped.set()
+            self.job_queue.unregister_worker(self.worker_id)
+    
+    def _purge(self):
+        """Remove finished jobs past the retention period"""
+        try:
+            self.job_queue.purge()
+        except Exception:
+            pass  # Retried after the next job
+    
+    def stop(self):
+        """Ask the worker to exit after the current batch"""
+        self._stopped.set()
+    
+    def _heartbeat_loop(self):
+        """Keep the worker and its current job marked alive; notice cancellation"""
+        while not self._stopped.wait(HEARTBEAT_SECONDS):
+            try:
+                self.job_queue.register_worker(self.worker_id)
+                job_id = self._current_job
+                if job_id is not None and not self.job_queue.heartbeat(job_id, self.worker_id):
+                    self._cancelled.set()
+            except Exception:
+                pass  # The next beat retries; a missed beat only matters after STALE_JOB_SECONDS
+    
+    def process_job(self, job):
+        """
+        Process the remaining files of a claimed job, checkpointing after each batch
+        
+        Args:
+            job (dict): Job as returned by JobQueue.claim
+        """
+        from utils.metrics_store import RunMetrics
+        
+        job_id = job['id']
+        self._current_job = job_id
+        self._cancelled.clear()
+        
+        try:
+            settings = job['settings']
+            job_description = job['job_description']
+            engine = self.scoring_engine.with_options(**settings.get('scoring', {}))
+            detector = self._restore_detector(job_id, settings.get('duplicate_threshold'))
+            
+            prepared = engine.job_artifacts.get(job_description) if engine.job_artifacts is not None else None
+            processed_job_desc = (
+                prepared.processed_text if prepared is not None
+                else self.nlp_processor.preprocess_text(job_description)
+            )
+            
+            pending = self.job_queue.pending_files(job_id)
+            run_metrics = RunMetrics(len(pending))
+            
+            # BM25+ and hashing weigh terms by statistics over every resume of the job, including
+            # those checkpointed before a restart, so then the whole job is extracted before scoring
+            extracted, bm25_stats = {}, None
+            if engine.uses_upload_statistics:
+                upload_texts = []
+                for entry in self.job_queue.finished_files(job_id):
+                    if entry['status'] == 'scored':
+                        upload_texts.append(entry['result']['resume_text'])
+                    elif entry['status'] == 'duplicate':
+                        upload_texts.append(self._extract(job_id, entry['index'], entry['filename'])[0])
+                for index, filename in pending:
+                    extracted[index] = self._extract(job_id, index, filename, run_metrics)
+                    upload_texts.append(extracted[index][0])
+                bm25_stats = engine.prepare_upload(upload_texts)
+            
+            for start in range(0, len(pending), self.batch_size):
+                if self._cancelled.is_set() or self._stopped.is_set():
+                    return
+                entries = self._process_batch(
+                    job_id, pending[start:start + self.batch_size], job_description,
+                    processed_job_desc, engine, detector, run_metrics, extracted, bm25_stats
+                )
+                self.job_queue.checkpoint(job_id, entries)
+            
+            self.job_queue.finish(job_id)
+            run_metrics.finish()
+            try:
+                self.metrics_store.record_run(run_metrics)
+            except Exception:
+                pass  # Telemetry is optional
+        
+        except Exception as e:
+            self.job_queue.finish(job_id, FAILED, str(e))
+        finally:
+            self._current_job = None
+    
+    def _restore_detector(self, job_id, threshold):
+        """Rebuild near-duplicate detection from the files already checkpointed"""
+        if threshold is None:
+            return None
+        
+        from utils.deduplication import NearDuplicateDetector
+        
+        detector = NearDuplicateDetector(threshold=threshold)
+        for entry in self.job_queue.finished_files(job_id):
+            if entry['status'] == 'scored':
+                detector.add(entry['index'], entry['result']['resume_text'])
+        return detector
+    
+    def _extract(self, job_id, index, filename, run_metrics=None):
+        """
+        Extract the text of one file of a job
+        
+        Returns:
+            tuple: (text, error); text is None or empty when extraction failed
+        """
+        upload = BytesIO(self.job_queue.load_file(job_id, index))
+        upload.name = filename
+        try:
+            return self.document_processor.extract_text(upload, metrics=run_metrics), "Could not extract text"
+        except Exception as e:
+            return None, str(e)
+    
+    def _process_batch(self, job_id, files, job_description, processed_job_desc, engine, detector, run_metrics,
+                       extracted=None, bm25_stats=None):
+        """
+        Extract, deduplicate and score one batch of files
+        
+        Args:
+            extracted (dict): Index -> (text, error) for files already extracted
+            bm25_stats (BM25Statistics): Statistics of the whole job, for BM25+
+        
+        Returns:
+            list: Checkpoint entries, see JobQueue.checkpoint
+        """
+        entries = []
+        to_score = []
+        extracted = extracted or {}
+        
+        for index, filename in files:
+            if index in extracted:
+                resume_text, error = extracted[index]
+            else:
+                resume_text, error = self._extract(job_id, index, filename, run_metrics)
+            
+            if not resume_text:
+                run_metrics.record_failure()
+                entries.append((index, 'failed', None, error))
+                continue
+            
+            if detector is not None:
+                started = time.perf_counter()
+                representative, similarity = detector.add(index, resume_text)
+                run_metrics.record_stage('dedup', time.perf_counter() - started)
+                if representative is not None:
+                    entries.append((index, 'duplicate', {'duplicate_of': representative, 'similarity': similarity}, None))
+                    continue
+            
+            to_score.append((index, filename, resume_text))
+        
+        if to_score:
+            resume_texts = [resume_text for _, _, resume_text in to_score]
+            
+            started = time.perf_counter()
+            processed_resumes = self.nlp_processor.preprocess_texts(resume_texts)
+            scoring_started = time.perf_counter()
+            batch_scores = engine.calculate_batch_scores(
+                processed_resumes, processed_job_desc, resume_texts, job_description, bm25_stats=bm25_stats
+            )
+            matched_keywords = engine.get_batch_matched_keywords(resume_texts, job_description)
+            run_metrics.record_stage('nlp', scoring_started - started, count=len(to_score))
+            run_metrics.record_stage('scoring', time.perf_counter() - scoring_started, count=len(to_score))
+            
+            for (index, filename, resume_text), processed_text, scores, keywords in zip(
+                    to_score, processed_resumes, batch_scores, matched_keywords):
+                run_metrics.record_success(scores['overall_score'])
+                entries.append((index, 'scored', {
+                    'filename': filename,
+                    'resume_text': resume_text,
+                    'processed_text': processed_text,
+                    'scores': scores,
+                    'matched_keywords': keywords
+                }, None))
+        
+        return entries
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process queued resume ranking jobs")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="Exit after this many idle seconds (0 to run until stopped)")
+    parser.add_argument("--batch-size", type=int, default=WORKER_BATCH_SIZE, help="Files per checkpoint")
+    args = parser.parse_args(argv)
+    
+    worker = JobWorker(batch_size=args.batch_size)
+    print(f"Job worker {worker.worker_id} started", flush=True)
+    try:
+        worker.run(idle_timeout=args.idle_timeout)
+    except KeyboardInterrupt:
+        worker.stop()
+    print(f"Job worker {worker.worker_id} stopped", flush=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Default location of the local telemetry database
+DEFAULT_METRICS_DB = os.environ.get(
+    "RESUME_RANKER_METRICS_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "metrics.db")
+)
+
+# Score histogram resolution (10 buckets of 10 percentage points)
+SCORE_BUCKETS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    files_total INTEGER NOT NULL,
+    files_processed INTEGER NOT NULL,
+    files_failed INTEGER NOT NULL,
+    total_seconds REAL NOT NULL,
+    avg_score REAL,
+    top_score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_day ON runs (day);
+
+CREATE TABLE IF NOT EXISTS run_stages (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    stage TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total_seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, stage, name)
+);
+
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    day TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    files_total INTEGER NOT NULL,
+    files_processed INTEGER NOT NULL,
+    files_failed INTEGER NOT NULL,
+    total_seconds REAL NOT NULL,
+    score_sum REAL NOT NULL,
+    score_count INTEGER NOT NULL,
+    top_score REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_stage_rollup (
+    day TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total_seconds REAL NOT NULL,
+    PRIMARY KEY (day, stage, name)
+);
+
+CREATE TABLE IF NOT EXISTS daily_score_histogram (
+    day TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, bucket)
+);
+"""
+
+class RunMetrics:
+    """Collects telemetry for a single ranking run"""
+    
+    def __init__(self, files_total):
+        """
+        Start collecting metrics for a run
+        
+        Args:
+            files_total (int): Number of files submitted in the run
+        """
+        self.started_at = datetime.now()
+        self.files_total = files_total
+        self.files_processed = 0
+        self.files_failed = 0
+        self.scores = []
+        self.stages = defaultdict(lambda: [0, 0.0])
+        # Stages can be recorded from extraction workers while the run is in progress
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._end = None
+    
+    def record_stage(self, stage, seconds, name="", count=1):
+        """
+        Add time spent in a pipeline stage
+        
+        Args:
+            stage (str): Stage name, e.g. 'extraction', 'nlp' or 'scoring'
+            seconds (float): Time spent
+            name (str): Optional sub-name, e.g. the extractor used
+            count (int): Number of items the time covers
+        """
+        with self._lock:
+            entry = self.stages[(stage, name)]
+            entry[0] += count
+            entry[1] += seconds
+    
+    def record_success(self, overall_score):
+        """Record a successfully scored file"""
+        self.files_processed += 1
+        self.scores.append(overall_score)
+    
+    def record_failure(self):
+        """Record a file that could not be processed"""
+        self.files_failed += 1
+    
+    def finish(self):
+        """Mark the run as finished"""
+        if self._end is None:
+            self._end = time.perf_counter()
+    
+    @property
+    def total_seconds(self):
+        """Wall-clock duration of the run"""
+        return (self._end or time.perf_counter()) - self._start
+
+class MetricsStore:
+    """Local SQLite store for per-run and per-stage processing telemetry"""
+    
+    def __init__(self, db_path=DEFAULT_METRICS_DB):
+        """
+        Open (and create if needed) the metrics database
+        
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+    
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection that commits on success; connections are never shared across threads"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def record_run(self, run):
+        """
+        Persist a finished run and update the daily rollups
+        
+        Args:
+            run (RunMetrics): Collected run telemetry
+        """
+        run.finish()
+        day = run.started_at.strftime("%Y-%m-%d")
+        avg_score = sum(run.scores) / len(run.scores) if run.scores else None
+        top_score = max(run.scores) if run.scores else None
+        
+        histogram = [0] * SCORE_BUCKETS
+        for score in run.scores:
+            bucket = min(int(score // (100 / SCORE_BUCKETS)), SCORE_BUCKETS - 1)
+            histogram[max(bucket, 0)] += 1
+        
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (started_at, day, files_total, files_processed, files_failed, "
+                "total_seconds, avg_score, top_score) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run.started_at.isoformat(timespec='seconds'), day, run.files_total,
+                 run.files_processed, run.files_failed, run.total_seconds, avg_score, top_score)
+            )
+            run_id = cursor.lastrowid
+            
+            conn.executemany(
+                "INSERT INTO run_stages (run_id, stage, name, count, total_seconds) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, stage, name, count, seconds) for (stage, name), (count, seconds) in run.stages.items()]
+            )
+            
+            conn.execute(
+                "INSERT INTO daily_rollup (day, runs, files_total, files_processed, files_failed, "
+                "total_seconds, score_sum, score_count, top_score) VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (day) DO UPDATE SET "
+                "runs = runs + 1, "
+                "files_total = files_total + excluded.files_total, "
+                "files_processed = files_processed + excluded.files_processed, "
+                "files_failed = files_failed + excluded.files_failed, "
+                "total_seconds = total_seconds + excluded.total_seconds, "
+                "score_sum = score_sum + excluded.score_sum, "
+                "score_count = score_count + excluded.score_count, "
+                "top_score = MAX(top_score, excluded.top_score)",
+                (day, run.files_total, run.files_processed, run.files_failed, run.total_seconds,
+                 sum(run.scores), len(run.scores), top_score or 0)
+            )
+            
+            conn.executemany(
+                "INSERT INTO daily_stage_rollup (day, stage, name, count, total_seconds) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, stage, name) DO UPDATE SET "
+                "count = count + excluded.count, total_seconds = total_seconds + excluded.total_seconds",
+                [(day, stage, name, count, seconds) for (stage, name), (count, seconds) in run.stages.items()]
+            )
+            
+            conn.executemany(
+                "INSERT INTO daily_score_histogram (day, bucket, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (day, bucket) DO UPDATE SET count = count + excluded.count",
+                [(day, bucket, count) for bucket, count in enumerate(histogram) if count]
+            )
+        
+        return run_id
+    
+    def _since(self, days):
+        """First day (inclusive) of a look-back window"""
+        return (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    
+    def get_daily_rollups(self, days=90):
+        """
+        Get per-day totals for the look-back window
+        
+        Returns:
+            list: One dict per day with volume, failures, timing and score aggregates
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM daily_rollup WHERE day >= ? ORDER BY day",
+                (self._since(days),)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def get_stage_breakdown(self, days=90):
+        """
+        Get per-day time spent in each stage and extractor
+        
+        Returns:
+            list: One dict per (day, stage, name) with count and total seconds
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT day, stage, name, count, total_seconds FROM daily_stage_rollup "
+                "WHERE day >= ? ORDER BY day, stage, name",
+                (self._since(days),)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def get_score_distribution(self, days=90):
+        """
+        Get the overall score histogram for the look-back window
+        
+        Returns:
+            list: Count per bucket, index 0 covering scores 0-10%
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT bucket, SUM(count) AS count FROM daily_score_histogram "
+                "WHERE day >= ? GROUP BY bucket",
+                (self._since(days),)
+            ).fetchall()
+        
+        histogram = [0] * SCORE_BUCKETS
+        for row in rows:
+            histogram[row['bucket']] = row['count']
+        return histogram
+    
+    def get_recent_runs(self, limit=20):
+        """Get the most recent runs, newest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM runs ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
@@ -1,25 +1,20 @@
-import spacy
 import re
+import threading
 from collections import Counter
 import streamlit as st
+from utils.instrumentation import instrumentation
+from utils.text_normalizer import normalize
 
 class NLPProcessor:
     """Handles all NLP operations using SpaCy"""
     
     def __init__(self):
-        """Initialize SpaCy model with error handling"""
-        try:
-            # Try to load the English model
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            try:
-                # Try alternative loading method for cloud deployment
-                import en_core_web_sm
-                self.nlp = en_core_web_sm.load()
-            except ImportError:
-                st.warning("SpaCy English model not available. Using basic text processing fallback.")
-                # Use a basic fallback
-                self.nlp = None
+        """Initialize the processor; the SpaCy model is loaded on first use"""
+        self._nlp = None
+        self._model_loaded = False
+        self._fallback_warning = None
+        self._model_lock = threading.Lock()
+        self._loader_thread = None
         
         # Define common technical skills and keywords
         self.technical_skills = {
@@ -46,6 +41,71 @@ class NLPProcessor:
             r'(\d+)\+?\s*year\s*(?:in|with|of)',
         ]
     
+    @property
+    def nlp(self):
+        """SpaCy pipeline, loaded on first access (None if no model is available)"""
+        if not self._model_loaded:
+            self._load_model()
+        return self._nlp
+    
+    @nlp.setter
+    def nlp(self, value):
+        with self._model_lock:
+            self._nlp = value
+            self._model_loaded = True
+    
+    @property
+    def model_loaded(self):
+        """Whether the model load has completed (successfully or not)"""
+        return self._model_loaded
+    
+    @property
+    def fallback_warning(self):
+        """
+        Why basic text processing is used instead of SpaCy, or None
+        
+        The model may load on a background thread, where Streamlit messages are
+        dropped, so the app shows this from the script thread instead.
+        """
+        return self._fallback_warning
+    
+    def load_model_async(self):
+        """
+        Start loading the SpaCy model in a background thread
+        
+        Safe to call repeatedly; does nothing once the model is loaded or loading.
+        """
+        with self._model_lock:
+            if self._model_loaded or self._loader_thread is not None:
+                return
+            self._loader_thread = threading.Thread(target=self._load_model, name="spacy-model-loader", daemon=True)
+            self._loader_thread.start()
+    
+    def _load_model(self):
+        """Load the SpaCy model with error handling; concurrent callers wait for one load"""
+        with self._model_lock:
+            if self._model_loaded:
+                return
+            
+            with instrumentation.timer('nlp.load_model'):
+                try:
+                    import spacy
+                    
+                    # Try to load the English model
+                    self._nlp = spacy.load("en_core_web_sm")
+                except OSError:
+                    try:
+                        # Try alternative loading method for cloud deployment
+                        import en_core_web_sm
+                        self._nlp = en_core_web_sm.load()
+                    except ImportError:
+                        # Use a basic fallback; the app reports it via fallback_warning
+                        self._fallback_warning = "SpaCy English model not available. Using basic text processing fallback."
+                        self._nlp = None
+            
+            self._model_loaded = True
+    
+    @instrumentation.timed('nlp.preprocess_text')
     def preprocess_text(self, text):
         """
         Preprocess text using SpaCy pipeline
@@ -63,39 +123,60 @@ class NLPProcessor:
             # Process text with SpaCy
             doc = self.nlp(text)
             
-            # Extract meaningful tokens
-            tokens = []
-            for token in doc:
-                # Skip stop words, punctuation, and whitespace
-                if (not token.is_stop and 
-                    not token.is_punct and 
-                    not token.is_space and 
-                    len(token.text) > 2):
-                    
-                    # Use lemmatized form
-                    tokens.append(token.lemma_.lower())
-            
-            return " ".join(tokens)
+            return self._doc_to_text(doc)
             
         except Exception as e:
             st.warning(f"NLP processing failed, using basic preprocessing: {str(e)}")
             return self._basic_preprocess(text)
     
+    @instrumentation.timed('nlp.preprocess_texts')
+    def preprocess_texts(self, texts, batch_size=32):
+        """
+        Preprocess several texts at once using SpaCy's batched pipeline
+        
+        Args:
+            texts (list): Raw texts to preprocess
+            batch_size (int): Number of texts SpaCy buffers per batch
+            
+        Returns:
+            list: Preprocessed texts, in the same order as the input
+        """
+        texts = list(texts)
+        if not self.nlp:
+            return [text.lower() if text else "" for text in texts]
+        
+        try:
+            return [
+                self._doc_to_text(doc)
+                for doc in self.nlp.pipe((text or "" for text in texts), batch_size=batch_size)
+            ]
+            
+        except Exception as e:
+            st.warning(f"Batched NLP processing failed, using basic preprocessing: {str(e)}")
+            return [self._basic_preprocess(text) for text in texts]
+    
+    def _doc_to_text(self, doc):
+        """Convert a SpaCy doc to a space-joined string of meaningful lemmas"""
+        tokens = []
+        for token in doc:
+            # Skip stop words, punctuation, and whitespace
+            if (not token.is_stop and 
+                not token.is_punct and 
+                not token.is_space and 
+                len(token.text) > 2):
+                
+                # Use lemmatized form
+                tokens.append(token.lemma_.lower())
+        
+        return " ".join(tokens)
+    
     def _basic_preprocess(self, text):
         """Basic text preprocessing fallback"""
         if not text:
             return ""
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters
-        text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
-        
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Lowercase alphanumeric tokens from the shared normalization pass
+        return " ".join(normalize(text).tokens)
     
     def extract_skills(self, text):
         """
@@ -107,7 +188,8 @@ class NLPProcessor:
         Returns:
             dict: Dictionary containing technical and soft skills
         """
-        text_lower = text.lower()
+        # Single-line form so multi-word skills match across line breaks
+        text_lower = normalize(text).flat.lower()
         found_skills = {
             'technical': [],
             'soft': []
@@ -0,0 +1,286 @@
+"""
+Optional OCR for scanned resumes
+
+Pages without a text layer are rendered at a fixed DPI and read with
+Tesseract (through pytesseract) in a process pool, with a time budget per
+page. Results are cached by file content hash, so re-ranking the same
+scanned resume does not pay for OCR again. Everything here is optional:
+without pytesseract and the tesseract binary, OCRProcessor.is_available()
+is False and PDF extraction works as before.
+
+Cached pages expire after OCR_CACHE_MAX_AGE_DAYS, and the oldest are
+dropped past OCR_CACHE_MAX_PAGES.
+
+Usage:
+    python -m utils.ocr_processor purge    # drop pages past the limits now
+    python -m utils.ocr_processor clear    # empty the cache
+"""
+
+import argparse
+import hashlib
+import math
+import multiprocessing
+import os
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from io import BytesIO
+
+# Default location of the OCR result cache
+DEFAULT_OCR_CACHE_DB = os.environ.get(
+    "RESUME_RANKER_OCR_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "ocr_cache.db")
+)
+
+# Cached OCR text is deleted this many days after it was recognized; 0 keeps it
+OCR_CACHE_MAX_AGE_DAYS = float(os.environ.get("RESUME_RANKER_OCR_CACHE_MAX_AGE_DAYS", 30))
+
+# Pages kept in the cache; past it the oldest are deleted first
+OCR_CACHE_MAX_PAGES = int(os.environ.get("RESUME_RANKER_OCR_CACHE_MAX_PAGES", 10000))
+
+# Rendering resolution; 200-300 DPI is the usual sweet spot for Tesseract on printed text
+OCR_DPI = int(os.environ.get("RESUME_RANKER_OCR_DPI", 200))
+
+# Tesseract is stopped on a page after this many seconds
+OCR_PAGE_TIMEOUT_SECONDS = float(os.environ.get("RESUME_RANKER_OCR_PAGE_TIMEOUT", 20))
+
+# OCR worker processes shared by every session
+OCR_WORKERS = int(os.environ.get("RESUME_RANKER_OCR_WORKERS", min(2, os.cpu_count() or 1)))
+
+# Tesseract language(s), e.g. 'eng' or 'eng+deu'
+OCR_LANGUAGE = os.environ.get("RESUME_RANKER_OCR_LANGUAGE", "eng")
+
+# Pages OCRed per document; a resume rarely has more, a scanned archive should not stall the pool
+MAX_OCR_PAGES = 10
+
+# Pages with less extractable text than this count as having no text layer
+MIN_PAGE_TEXT_CHARS = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr_pages (
+    file_hash TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    dpi INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (file_hash, page, dpi, language)
+);
+CREATE INDEX IF NOT EXISTS idx_ocr_pages_created ON ocr_pages (created_at);
+"""
+
+def _ocr_page(pdf_bytes, page_number, dpi, language, timeout):
+    """Render one page and read it with Tesseract; runs in an OCR worker process"""
+    import pdfplumber
+    import pytesseract
+    
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        image = pdf.pages[page_number].to_image(resolution=dpi).original
+    return pytesseract.image_to_string(image, lang=language, timeout=timeout)
+
+class OCRProcessor:
+    """Reads pages without a text layer with Tesseract, caching the results by file hash"""
+    
+    _available = None
+    
+    def __init__(self, cache_db=DEFAULT_OCR_CACHE_DB, dpi=OCR_DPI, page_timeout=OCR_PAGE_TIMEOUT_SECONDS,
+                 max_workers=OCR_WORKERS, language=OCR_LANGUAGE, max_age_days=OCR_CACHE_MAX_AGE_DAYS,
+                 max_pages=OCR_CACHE_MAX_PAGES):
+        """
+        Initialize the OCR processor; worker processes start on first use
+        
+        Args:
+            cache_db (str): Path to the SQLite cache of OCR results
+            dpi (int): Resolution pages are rendered at
+            page_timeout (float): Tesseract time budget per page, in seconds
+            max_workers (int): OCR worker processes
+            language (str): Tesseract language(s)
+            max_age_days (float): Days a cached page is kept; 0 keeps it until the cache is full
+            max_pages (int): Cached pages kept; 0 for no limit
+        """
+        self.cache_db = cache_db
+        self.dpi = int(dpi)
+        self.page_timeout = float(page_timeout)
+        self.max_workers = max(1, int(max_workers))
+        self.language = language
+        self.max_age_days = max(0.0, float(max_age_days))
+        self.max_pages = max(0, int(max_pages))
+        
+        self._pool = None
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(cache_db)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self.purge()
+    
+    @classmethod
+    def is_available(cls):
+        """Whether pytesseract and the tesseract binary are installed"""
+        if cls._available is None:
+            try:
+                import pytesseract
+                pytesseract.get_tesseract_version()
+                cls._available = True
+            except Exception:
+                cls._available = False
+        return cls._available
+    
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection that commits on success"""
+        conn = sqlite3.connect(self.cache_db, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _get_pool(self):
+        """Start the worker processes on first use"""
+        with self._lock:
+            if self._pool is None:
+                # Spawned rather than forked: the app process runs many threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pool
+    
+    def ocr_pages(self, pdf_bytes, page_numbers):
+        """
+        OCR selected pages of a PDF
+        
+        Args:
+            pdf_bytes (bytes): PDF content
+            page_numbers (list): Zero-based pages to read; at most MAX_OCR_PAGES are OCRed
+        
+        Returns:
+            dict: Page number to recognized text, for the pages that were read within budget
+        """
+        page_numbers = list(page_numbers)[:MAX_OCR_PAGES]
+        if not page_numbers:
+            return {}
+        
+        file_hash = hashlib.sha256(pdf_bytes).hexdigest()
+        texts = self._cached_pages(file_hash, page_numbers)
+        missing = [page for page in page_numbers if page not in texts]
+        if not missing:
+            return texts
+        
+        pool = self._get_pool()
+        futures = {
+            pool.submit(_ocr_page, pdf_bytes, page, self.dpi, self.language, self.page_timeout): page
+            for page in missing
+        }
+        
+        # Tesseract enforces the per-page budget; this deadline also covers rendering and queueing
+        rounds = math.ceil(len(missing) / self.max_workers)
+        done, not_done = wait(futures, timeout=rounds * (self.page_timeout + 10))
+        for future in not_done:
+            future.cancel()
+        
+        recognized = {}
+        for future in done:
+            try:
+                recognized[futures[future]] = future.result()
+            except Exception:
+                continue  # Timed out or unreadable page; not cached, so a later run retries it
+        
+        self._store_pages(file_hash, recognized)
+        texts.update(recognized)
+        return texts
+    
+    def _cached_pages(self, file_hash, page_numbers):
+        """OCR results already cached for pages of a file"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT page, text FROM ocr_pages WHERE file_hash = ? AND dpi = ? AND language = ? "
+                f"AND page IN ({', '.join('?' * len(page_numbers))})",
+                (file_hash, self.dpi, self.language, *page_numbers)
+            ).fetchall()
+        return dict(rows)
+    
+    def _store_pages(self, file_hash, texts):
+        """Cache OCR results for pages of a file"""
+        if not texts:
+            return
+        created_at = datetime.now().isoformat(timespec='seconds')
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ocr_pages (file_hash, page, dpi, language, text, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(file_hash, page, self.dpi, self.language, text, created_at) for page, text in texts.items()]
+            )
+        self.purge()
+    
+    def purge(self):
+        """
+        Delete cached pages past the age limit, then the oldest pages past the size limit
+        
+        Returns:
+            int: Number of pages deleted
+        """
+        deleted = 0
+        with self._connect() as conn:
+            if self.max_age_days:
+                cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat(timespec='seconds')
+                deleted += conn.execute("DELETE FROM ocr_pages WHERE created_at < ?", (cutoff,)).rowcount
+            if self.max_pages:
+                deleted += conn.execute(
+                    "DELETE FROM ocr_pages WHERE rowid IN "
+                    "(SELECT rowid FROM ocr_pages ORDER BY created_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                    (self.max_pages,)
+                ).rowcount
+        return deleted
+    
+    def get_stats(self):
+        """
+        Get cache statistics
+        
+        Returns:
+            dict: 'pages' cached
+        """
+        with self._connect() as conn:
+            return {'pages': conn.execute("SELECT COUNT(*) FROM ocr_pages").fetchone()[0]}
+    
+    def clear(self):
+        """
+        Delete every cached page
+        
+        Returns:
+            int: Number of pages deleted
+        """
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM ocr_pages").rowcount
+    
+    def shutdown(self, wait=True):
+        """Stop the worker processes"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the OCR result cache")
+    parser.add_argument("--db", default=DEFAULT_OCR_CACHE_DB, help="OCR cache database path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("purge", help="Delete pages past the age and size limits")
+    subparsers.add_parser("clear", help="Delete every cached page")
+    args = parser.parse_args(argv)
+    
+    # Opening the cache already purges pages past the limits
+    processor = OCRProcessor(cache_db=args.db)
+    if args.command == "clear":
+        processor.clear()
+    print(f"{args.db}: {processor.get_stats()['pages']} cached pages")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,36 @@
-import PyPDF2
-import pdfplumber
 import streamlit as st
-from io import BytesIO
-import re
+import time
+from utils.instrumentation import instrumentation
+from utils.ocr_processor import MIN_PAGE_TEXT_CHARS, OCRProcessor
+from utils.text_normalizer import normalize
 
 class PDFProcessor:
     """Handles PDF text extraction with multiple fallback methods"""
     
-    def __init__(self):
+    def __init__(self, enable_ocr=True):
+        """
+        Initialize the extractor chain
+        
+        Args:
+            enable_ocr (bool): OCR scanned pages when Tesseract is installed
+        """
         self.extraction_methods = [
             self._extract_with_pdfplumber,
             self._extract_with_pypdf2
         ]
+        
+        self.ocr_processor = None
+        if enable_ocr and OCRProcessor.is_available():
+            self.ocr_processor = OCRProcessor()
     
-    def extract_text(self, uploaded_file):
+    @instrumentation.timed('pdf.extract_text')
+    def extract_text(self, uploaded_file, metrics=None):
         """
         Extract text from uploaded PDF file using multiple methods
         
         Args:
             uploaded_file: Streamlit uploaded file object
+            metrics (RunMetrics): Optional collector for per-extractor timings
             
         Returns:
             str: Extracted text content
@@ -29,12 +41,18 @@ class PDFProcessor:
             
             # Try different extraction methods
             for method in self.extraction_methods:
+                started = time.perf_counter()
                 try:
-                    text = method(uploaded_file)
+                    with instrumentation.timer('pdf.extract_method', method=self._method_name(method)):
+                        text = method(uploaded_file)
+                    if metrics is not None:
+                        metrics.record_stage('extraction', time.perf_counter() - started, name=self._method_name(method))
                     if text and len(text.strip()) > 100:  # Minimum text threshold
                         return self._clean_text(text)
                     uploaded_file.seek(0)  # Reset for next method
                 except Exception as e:
+                    if metrics is not None:
+                        metrics.record_stage('extraction', time.perf_counter() - started, name=self._method_name(method))
                     st.warning(f"Extraction method failed: {str(e)}")
                     uploaded_file.seek(0)
                     continue
@@ -45,18 +63,55 @@ class PDFProcessor:
             st.error(f"Failed to extract text from {uploaded_file.name}: {str(e)}")
             return None
     
+    @staticmethod
+    def _method_name(method):
+        """Short name of an extraction method, e.g. 'pdfplumber'"""
+        return method.__name__.replace('_extract_with_', '')
+    
     def _extract_with_pdfplumber(self, file_obj):
-        """Extract text using pdfplumber (preferred method)"""
-        text = ""
+        """Extract text using pdfplumber (preferred method), OCRing pages without a text layer"""
+        import pdfplumber
+        
         with pdfplumber.open(file_obj) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+            page_texts = [page.extract_text() or "" for page in pdf.pages]
+        
+        if self.ocr_processor is not None:
+            page_texts = self._ocr_scanned_pages(file_obj, page_texts)
+        
+        text = ""
+        for page_text in page_texts:
+            if page_text:
+                text += page_text + "\n"
         return text
     
+    def _ocr_scanned_pages(self, file_obj, page_texts):
+        """
+        Replace the text of pages without a usable text layer by their OCR text
+        
+        Scanned pages of otherwise digital resumes (e.g. a signed cover page)
+        are read too, not only fully scanned files; at most MAX_OCR_PAGES
+        pages of a document are OCRed.
+        
+        Args:
+            file_obj: PDF file object
+            page_texts (list): Extracted text of every page
+        
+        Returns:
+            list: Page texts in page order
+        """
+        scanned_pages = [i for i, page_text in enumerate(page_texts) if len(page_text.strip()) < MIN_PAGE_TEXT_CHARS]
+        if not scanned_pages:
+            return page_texts
+        
+        file_obj.seek(0)
+        with instrumentation.timer('pdf.ocr'):
+            ocr_texts = self.ocr_processor.ocr_pages(file_obj.read(), scanned_pages)
+        return [ocr_texts.get(i, page_text) for i, page_text in enumerate(page_texts)]
+    
     def _extract_with_pypdf2(self, file_obj):
         """Extract text using PyPDF2 (fallback method)"""
+        import PyPDF2
+        
         text = ""
         pdf_reader = PyPDF2.PdfReader(file_obj)
         
@@ -74,24 +129,12 @@ class PDFProcessor:
             text (str): Raw extracted text
             
         Returns:
-            str: Cleaned text
+            str: Cleaned text, with one line per non-empty source line
         """
         if not text:
             return ""
         
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep alphanumeric and basic punctuation
-        text = re.sub(r'[^\w\s\-.,;:()\[\]/@#&*+=<>|{}~`\'"!?%$]', ' ', text)
-        
-        # Remove excessive newlines
-        text = re.sub(r'\n+', '\n', text)
-        
-        # Strip leading/trailing whitespace
-        text = text.strip()
-        
-        return text
+        return normalize(text).text
     
     def get_file_info(self, uploaded_file):
         """
@@ -108,6 +151,8 @@ class PDFProcessor:
             
             # Try to get PDF info
             try:
+                import pdfplumber
+                
                 with pdfplumber.open(uploaded_file) as pdf:
                     page_count = len(pdf.pages)
                     metadata = pdf.metadata or {}
@@ -6,7 +6,34 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from io import BytesIO
 from datetime import datetime
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import copy
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from utils.instrumentation import instrumentation
+from utils.exporters import candidate_name, iter_result_rows, score_fields
+
+# Rows per rankings table; tables are split so ReportLab never lays out one huge table
+RANKINGS_ROWS_PER_TABLE = 30
+
+# Leading columns of the PDF rankings table; the score columns follow the export schema
+RANKING_TABLE_COLUMNS = [('rank', 'Rank'), ('candidate', 'Candidate')]
+
+# Width shared by the score columns of the rankings table, in inches
+SCORE_COLUMNS_WIDTH = 4.0
+
+def is_bm25_ranking(results):
+    """Whether results were ranked with the BM25+ relevance model"""
+    return any('bm25_score' in result['scores'] for result in results)
+
+# Candidates that get an individual analysis section, however large the pool
+MAX_DETAILED_CANDIDATES = 5
 
 class ReportGenerator:
     """Generates comprehensive HR reports in PDF format"""
@@ -41,8 +68,54 @@ class ReportGenerator:
             spaceAfter=6,
             alignment=TA_JUSTIFY
         )
+        
+        self.table_header_style = ParagraphStyle(
+            'TableHeader',
+            parent=self.styles['Normal'],
+            fontName='Helvetica-Bold',
+            fontSize=8,
+            leading=10,
+            alignment=TA_CENTER,
+            textColor=colors.whitesmoke
+        )
+        
+        # Shared by every rankings table chunk
+        self.rankings_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            # Narrow header padding so labels fit when an optional score column is added
+            ('LEFTPADDING', (0, 0), (-1, 0), 2),
+            ('RIGHTPADDING', (0, 0), (-1, 0), 2),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ])
+        
+        self.report_info_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        # Flowables of sections that are identical in every report, built on first use
+        self._static_sections = {}
+        self._static_lock = threading.Lock()
+        
+        # Background worker for large reports, created on first use
+        self._executor = None
+        self._executor_lock = threading.Lock()
     
-    def generate_report(self, results, job_description, results_df):
+    @instrumentation.timed('report.generate')
+    def generate_report(self, results, job_description, results_df, progress_callback=None):
         """
         Generate comprehensive HR report
         
@@ -50,13 +123,174 @@ class ReportGenerator:
             results (list): List of ranking results
             job_description (str): Original job description
             results_df (DataFrame): Results dataframe for display
+            progress_callback (callable): Optional function called with the fraction completed
             
         Returns:
             BytesIO: PDF report as bytes buffer
         """
         buffer = BytesIO()
+        self._build(buffer, results, job_description, progress_callback)
+        buffer.seek(0)
+        
+        return buffer
+    
+    @instrumentation.timed('report.generate_file')
+    def generate_report_file(self, results, job_description, path=None, progress_callback=None):
+        """
+        Generate the HR report straight to a file, keeping large reports out of memory
+        
+        Args:
+            results (list): List of ranking results
+            job_description (str): Original job description
+            path (str): Output path; a temporary file is created if omitted
+            progress_callback (callable): Optional function called with the fraction completed
+            
+        Returns:
+            str: Path of the written PDF (the caller is responsible for deleting temporary files)
+        """
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="resume_ranking_report_", suffix=".pdf")
+            os.close(fd)
+        
+        try:
+            self._build(path, results, job_description, progress_callback)
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        
+        return path
+    
+    def generate_report_async(self, results, job_description, progress_callback=None):
+        """
+        Generate the HR report to a temporary file on a background worker
+        
+        The progress callback runs on the worker thread, so it should only
+        record the value (e.g. in a dict) for the caller to poll.
+        
+        Args:
+            results (list): List of ranking results
+            job_description (str): Original job description
+            progress_callback (callable): Optional function called with the fraction completed
+            
+        Returns:
+            Future: Resolves to the path of the written PDF
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-worker")
+        
+        return self._executor.submit(
+            self.generate_report_file, list(results), job_description, None, progress_callback
+        )
+    
+    @instrumentation.timed('report.generate_batch')
+    def generate_batch_reports(self, requisitions, path=None, max_workers=None, progress_callback=None):
+        """
+        Generate one HR report per requisition in a process pool and bundle them in a zip archive
+        
+        Each report is laid out in a separate process so ReportLab's CPU-bound
+        work runs on all cores. The archive contains one PDF per requisition
+        and a manifest.json describing them; a requisition whose report fails
+        is recorded in the manifest instead of aborting the batch.
+        
+        Args:
+            requisitions (list): Dicts with 'name', 'job_description' and 'results'
+            path (str): Output zip path; a temporary file is created if omitted
+            max_workers (int): Worker processes (defaults to the CPU count, capped at the number of reports)
+            progress_callback (callable): Optional function called with the fraction of reports completed
+            
+        Returns:
+            str: Path of the written zip archive (the caller is responsible for deleting temporary files)
+        """
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="resume_ranking_reports_", suffix=".zip")
+            os.close(fd)
+        
+        entries = []
+        for i, requisition in enumerate(requisitions, start=1):
+            # The index prefix keeps file names unique when requisition names repeat
+            slug = re.sub(r'[^A-Za-z0-9]+', '_', requisition.get('name') or '').strip('_')[:50] or 'requisition'
+            filename = f"{i:02d}_{slug}.pdf"
+            
+            # Only what the report needs is sent to the worker processes
+            results = [{'filename': r['filename'], 'scores': r['scores']} for r in requisition['results']]
+            entries.append({'requisition': requisition, 'filename': filename, 'results': results})
+        
+        manifest = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'report_count': len(entries),
+            'reports': []
+        }
+        
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(entries)))
+        
+        try:
+            with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                outcomes = {}
+                
+                if workers == 1:
+                    for index, entry in enumerate(entries):
+                        outcomes[index] = self._batch_outcome(
+                            _render_report_bytes, entry['results'], entry['requisition']['job_description']
+                        )
+                        if progress_callback is not None:
+                            progress_callback(len(outcomes) / len(entries))
+                else:
+                    # Spawned workers avoid forking the app's scheduler and loader threads
+                    with ProcessPoolExecutor(
+                        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                    ) as pool:
+                        futures = {
+                            pool.submit(_render_report_bytes, entry['results'], entry['requisition']['job_description']): index
+                            for index, entry in enumerate(entries)
+                        }
+                        for future in as_completed(futures):
+                            outcomes[futures[future]] = self._batch_outcome(future.result)
+                            if progress_callback is not None:
+                                progress_callback(len(outcomes) / len(entries))
+                
+                for index, entry in enumerate(entries):
+                    pdf_bytes, error = outcomes[index]
+                    requisition = entry['requisition']
+                    scores = [r['scores'].get('overall_score', 0) for r in entry['results']]
+                    
+                    if pdf_bytes is not None:
+                        archive.writestr(entry['filename'], pdf_bytes)
+                    
+                    manifest['reports'].append({
+                        'name': requisition.get('name') or '',
+                        'file': entry['filename'] if pdf_bytes is not None else None,
+                        'status': 'ok' if pdf_bytes is not None else 'failed',
+                        'error': error,
+                        'candidates': len(scores),
+                        'top_score': max(scores) if scores else None,
+                        'average_score': sum(scores) / len(scores) if scores else None,
+                        'job_description_sha256': hashlib.sha256(
+                            requisition['job_description'].encode('utf-8')
+                        ).hexdigest()
+                    })
+                
+                archive.writestr('manifest.json', json.dumps(manifest, indent=2))
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        
+        return path
+    
+    @staticmethod
+    def _batch_outcome(func, *args):
+        """Run a report job, returning (pdf_bytes, None) or (None, error message)"""
+        try:
+            return func(*args), None
+        except Exception as e:
+            return None, str(e)
+    
+    def _build(self, target, results, job_description, progress_callback=None):
+        """Lay out the report into a file path or file-like object"""
         doc = SimpleDocTemplate(
-            buffer,
+            target,
             pagesize=A4,
             rightMargin=72,
             leftMargin=72,
@@ -64,6 +298,17 @@ class ReportGenerator:
             bottomMargin=18
         )
         
+        if progress_callback is not None:
+            total = {'flowables': 1}
+            
+            def on_progress(kind, value):
+                if kind == 'SIZE_EST':
+                    total['flowables'] = max(value, 1)
+                elif kind == 'PROGRESS':
+                    progress_callback(min(value / total['flowables'], 1.0))
+            
+            doc.setProgressCallBack(on_progress)
+        
         # Build report content
         story = []
         
@@ -84,16 +329,42 @@ class ReportGenerator:
         story.extend(self._create_recommendations(results))
         
         # Methodology
-        story.extend(self._create_methodology())
+        story.extend(self._create_methodology(is_bm25_ranking(results)))
         
         # Build PDF
         doc.build(story)
-        buffer.seek(0)
+    
+    def _cached_section(self, name, builder):
+        """
+        Get fresh copies of a static section's flowables, parsing them only once
         
-        return buffer
+        Layout state is stored on the flowable during a build, so every report
+        gets shallow copies that share the parsed paragraph text.
+        
+        Args:
+            name (str): Section cache key
+            builder (callable): Builds the section's flowables
+            
+        Returns:
+            list: Flowables ready to add to a story
+        """
+        with self._static_lock:
+            flowables = self._static_sections.get(name)
+            if flowables is None:
+                flowables = self._static_sections[name] = tuple(builder())
+        
+        return [copy.copy(flowable) for flowable in flowables]
     
     def _create_title_page(self):
-        """Create title page content"""
+        """Create title page content; only the report info table changes between reports"""
+        story = self._cached_section('title', self._build_title_heading)
+        story.append(self._create_report_info())
+        story.extend(self._cached_section('disclaimer', self._build_disclaimer))
+        
+        return story
+    
+    def _build_title_heading(self):
+        """Build the static title and subtitle"""
         story = []
         
         # Title
@@ -106,7 +377,10 @@ class ReportGenerator:
         story.append(subtitle)
         story.append(Spacer(1, 1*inch))
         
-        # Report info
+        return story
+    
+    def _create_report_info(self):
+        """Create the report info table with the generation date"""
         current_date = datetime.now().strftime("%B %d, %Y")
         info_data = [
             ["Report Generated:", current_date],
@@ -116,18 +390,13 @@ class ReportGenerator:
         ]
         
         info_table = Table(info_data, colWidths=[2*inch, 3*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        info_table.setStyle(self.report_info_style)
         
-        story.append(info_table)
-        story.append(Spacer(1, 1*inch))
+        return info_table
+    
+    def _build_disclaimer(self):
+        """Build the static disclaimer below the report info"""
+        story = [Spacer(1, 1*inch)]
         
         # Disclaimer
         disclaimer = Paragraph(
@@ -198,56 +467,62 @@ class ReportGenerator:
         
         story.append(Paragraph("Detailed Candidate Rankings", self.heading_style))
         
-        # Create rankings table
-        table_data = [["Rank", "Candidate", "Overall Score", "Keyword Match", "Skills Match", "Experience", "TF-IDF Similarity"]]
-        
-        for i, result in enumerate(results):
-            scores = result['scores']
-            table_data.append([
-                str(i + 1),
-                result['filename'].replace('.pdf', ''),
-                f"{scores['overall_score']:.1f}%",
-                f"{scores['keyword_score']:.1f}%",
-                f"{scores['skills_score']:.1f}%",
-                f"{scores['experience_score']:.1f}%",
-                f"{scores['tfidf_similarity']:.1f}%"
-            ])
-        
-        # Create table
-        rankings_table = Table(table_data, colWidths=[0.6*inch, 1.5*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch])
-        rankings_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
+        # Create rankings tables, one page-sized chunk at a time, from the shared export schema
+        fields = score_fields(results)
+        header = [Paragraph(label, self.table_header_style) for _, label in RANKING_TABLE_COLUMNS + fields]
+        score_width = SCORE_COLUMNS_WIDTH / len(fields) * inch
+        
+        for start in range(0, len(results), RANKINGS_ROWS_PER_TABLE):
+            table_data = [header]
+            
+            for row in iter_result_rows(results[start:start + RANKINGS_ROWS_PER_TABLE], start=start,
+                                        details=False, fields=fields):
+                table_data.append([str(row['rank']), row['candidate']] + [
+                    f"{row[field]:.1f}%" for field, _ in fields
+                ])
+            
+            # Create table
+            rankings_table = Table(
+                table_data,
+                colWidths=[0.6*inch, 1.5*inch] + [score_width] * len(fields),
+                repeatRows=1
+            )
+            rankings_table.setStyle(self.rankings_table_style)
+            story.append(rankings_table)
         
-        story.append(rankings_table)
         story.append(Spacer(1, 0.3*inch))
         
-        # Top candidates details
+        # Top candidates details, capped so large pools don't produce thousands of sections
         if results:
             story.append(Paragraph("Top Candidate Analysis", self.heading_style))
             
-            top_candidate = results[0]
-            top_analysis = f"""
-            <b>Highest Ranked Candidate: {top_candidate['filename'].replace('.pdf', '')}</b><br/>
-            Overall Score: {top_candidate['scores']['overall_score']:.1f}%<br/><br/>
+            detailed = results[:MAX_DETAILED_CANDIDATES]
+            for rank, candidate in enumerate(detailed, start=1):
+                label = "Highest Ranked Candidate" if rank == 1 else f"Rank {rank}"
+                scores = candidate['scores']
+                if 'bm25_score' in scores:
+                    relevance = f"• Lexical Relevance (BM25+): {scores['bm25_score']:.1f}% term-weighted match"
+                else:
+                    relevance = f"• Semantic Similarity: {scores['tfidf_similarity']:.1f}% contextual relevance"
+                candidate_analysis = f"""
+                <b>{label}: {candidate_name(candidate)}</b><br/>
+                Overall Score: {candidate['scores']['overall_score']:.1f}%<br/><br/>
+                
+                <b>Strengths:</b><br/>
+                • Keyword Alignment: {candidate['scores']['keyword_score']:.1f}% match with job requirements<br/>
+                • Technical Skills: {candidate['scores']['skills_score']:.1f}% alignment with required skills<br/>
+                • Experience Level: {candidate['scores']['experience_score']:.1f}% match with experience requirements<br/>
+                {relevance}<br/>
+                """
+                
+                story.append(Paragraph(candidate_analysis, self.body_style))
             
-            <b>Strengths:</b><br/>
-            • Keyword Alignment: {top_candidate['scores']['keyword_score']:.1f}% match with job requirements<br/>
-            • Technical Skills: {top_candidate['scores']['skills_score']:.1f}% alignment with required skills<br/>
-            • Experience Level: {top_candidate['scores']['experience_score']:.1f}% match with experience requirements<br/>
-            • Semantic Similarity: {top_candidate['scores']['tfidf_similarity']:.1f}% contextual relevance<br/>
-            """
-            
-            story.append(Paragraph(top_analysis, self.body_style))
+            if len(results) > len(detailed):
+                story.append(Paragraph(
+                    f"Individual analysis is shown for the top {len(detailed)} of {len(results)} candidates; "
+                    "all candidates are scored in the rankings table above.",
+                    self.body_style
+                ))
         
         return story
     
@@ -268,19 +543,19 @@ class ReportGenerator:
         
         <b>🎯 Excellent Candidates ({len(excellent)} candidates):</b><br/>
         Scores ≥ 80%. Strong alignment with job requirements. Recommended for immediate interview.<br/>
-        {', '.join([r['filename'].replace('.pdf', '') for r in excellent[:3]])}{'...' if len(excellent) > 3 else ''}<br/><br/>
+        {', '.join([candidate_name(r) for r in excellent[:3]])}{'...' if len(excellent) > 3 else ''}<br/><br/>
         
         <b>✅ Good Candidates ({len(good)} candidates):</b><br/>
         Scores 65-79%. Good potential with minor gaps. Recommended for phone screening.<br/>
-        {', '.join([r['filename'].replace('.pdf', '') for r in good[:3]])}{'...' if len(good) > 3 else ''}<br/><br/>
+        {', '.join([candidate_name(r) for r in good[:3]])}{'...' if len(good) > 3 else ''}<br/><br/>
         
         <b>⚠️ Moderate Candidates ({len(moderate)} candidates):</b><br/>
         Scores 50-64%. May require additional evaluation or skills development.<br/>
-        {', '.join([r['filename'].replace('.pdf', '') for r in moderate[:3]])}{'...' if len(moderate) > 3 else ''}<br/><br/>
+        {', '.join([candidate_name(r) for r in moderate[:3]])}{'...' if len(moderate) > 3 else ''}<br/><br/>
         
         <b>❌ Low Match Candidates ({len(low)} candidates):</b><br/>
         Scores < 50%. Limited alignment with current requirements.<br/>
-        {', '.join([r['filename'].replace('.pdf', '') for r in low[:3]])}{'...' if len(low) > 3 else ''}
+        {', '.join([candidate_name(r) for r in low[:3]])}{'...' if len(low) > 3 else ''}
         """
         
         story.append(Paragraph(recommendations, self.body_style))
@@ -288,13 +563,26 @@ class ReportGenerator:
         
         return story
     
-    def _create_methodology(self):
-        """Create methodology section"""
+    def _create_methodology(self, bm25=False):
+        """Create methodology section for the relevance model the results were ranked with"""
+        if bm25:
+            return self._cached_section('methodology_bm25', lambda: self._build_methodology(bm25=True))
+        return self._cached_section('methodology', self._build_methodology)
+    
+    def _build_methodology(self, bm25=False):
+        """Build the static methodology section"""
         story = []
         
         story.append(Paragraph("Scoring Methodology", self.heading_style))
         
-        methodology_text = """
+        if bm25:
+            relevance = ("• <b>Lexical Relevance (25%):</b> BM25+ term weighting with saturation and "
+                         "document length normalization")
+        else:
+            relevance = ("• <b>Semantic Similarity (25%):</b> TF-IDF vectorization with cosine similarity "
+                         "for contextual matching")
+        
+        methodology_text = f"""
         <b>Algorithm Overview:</b><br/>
         The AI-powered ranking system uses a weighted multi-factor approach combining natural language 
         processing and machine learning techniques.<br/><br/>
@@ -303,7 +591,7 @@ class ReportGenerator:
         • <b>Keyword Matching (30%):</b> Direct keyword alignment between resume and job description<br/>
         • <b>Skills Assessment (25%):</b> Technical and soft skills matching using pattern recognition<br/>
         • <b>Experience Evaluation (20%):</b> Years of experience extraction and comparison<br/>
-        • <b>Semantic Similarity (25%):</b> TF-IDF vectorization with cosine similarity for contextual matching<br/><br/>
+        {relevance}<br/><br/>
         
         <b>Technology Stack:</b><br/>
         • SpaCy: Advanced NLP processing, tokenization, and lemmatization<br/>
@@ -321,3 +609,14 @@ class ReportGenerator:
         story.append(Paragraph(methodology_text, self.body_style))
         
         return story
+
+# Per-process generator used by batch report workers, so styles and static sections are built once
+_worker_generator = None
+
+def _render_report_bytes(results, job_description):
+    """Build one report in a worker process and return the PDF bytes"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = ReportGenerator()
+    
+    return _worker_generator.generate_report(results, job_description, None).getvalue()
@@ -1,41 +1,230 @@
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import copy
+import hashlib
 import re
+import threading
 from collections import Counter
+from types import MappingProxyType
+from utils.instrumentation import instrumentation
+from utils.text_normalizer import normalize
 
-class ScoringEngine:
-    """Handles resume scoring and ranking logic"""
+# Component weights for each relevance model; the semantic component carries 25% either way
+RELEVANCE_MODELS = {
+    'tfidf': {
+        'keyword_score': 0.30,
+        'skills_score': 0.25,
+        'experience_score': 0.20,
+        'tfidf_similarity': 0.25
+    },
+    'bm25': {
+        'keyword_score': 0.30,
+        'skills_score': 0.25,
+        'experience_score': 0.20,
+        'bm25_score': 0.25
+    }
+}
+
+# TF-IDF vectorization modes; see ScoringEngine.__init__
+VECTORIZATION_MODES = ('fitted', 'hashing', 'global')
+
+# Fitted TF-IDF settings; every resume is compared with the job description as a fitted pair
+TFIDF_PARAMS = {
+    'max_features': 1000,
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+    'lowercase': True
+}
+
+# BM25+ term analysis of the original texts, shared by scoring and BM25Statistics
+BM25_ANALYZER_PARAMS = {
+    'stop_words': 'english',
+    'lowercase': True
+}
+
+# Settings that can differ between engines derived with ScoringEngine.with_options
+ENGINE_OPTIONS = ('relevance_model', 'vectorization', 'idf_store', 'update_idf_store', 'job_artifacts')
+
+class _SharedModels:
+    """Lazily built models shared by an engine and every engine derived from it"""
     
     def __init__(self):
-        """Initialize the scoring engine with weights and parameters"""
-        # Scoring weights (should sum to 1.0)
-        self.weights = {
-            'keyword_score': 0.30,
-            'skills_score': 0.25,
-            'experience_score': 0.20,
-            'tfidf_similarity': 0.25
-        }
+        self.lock = threading.Lock()
+        self.hashing_tfidf = None
+
+class BM25Statistics:
+    """
+    Collection statistics BM25+ weighs terms with
+    
+    Build one over every resume of an upload and pass it to each scoring
+    call, so a resume's BM25+ score does not depend on how the upload was
+    split into batches.
+    """
+    
+    def __init__(self, num_docs, doc_freqs, avg_length):
+        """
+        Args:
+            num_docs (int): Documents in the collection
+            doc_freqs (dict): Term -> number of documents containing it
+            avg_length (float): Average document length in terms
+        """
+        self.num_docs = num_docs
+        self.doc_freqs = doc_freqs
+        self.avg_length = avg_length
+    
+    @classmethod
+    def from_texts(cls, texts):
+        """
+        Count document frequencies and lengths over a collection
         
-        # Initialize TF-IDF vectorizer
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2),
-            lowercase=True
-        )
+        Args:
+            texts (iterable): Original resume texts; empty texts are skipped
+        
+        Returns:
+            BM25Statistics: Statistics of the collection
+        """
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        analyzer = CountVectorizer(**BM25_ANALYZER_PARAMS).build_analyzer()
+        doc_freqs = Counter()
+        num_docs = total_length = 0
+        for text in texts:
+            if not text:
+                continue
+            terms = analyzer(text)
+            doc_freqs.update(set(terms))
+            num_docs += 1
+            total_length += len(terms)
+        
+        return cls(num_docs, dict(doc_freqs), total_length / num_docs if num_docs else 0.0)
+
+class ScoringEngine:
+    """
+    Handles resume scoring and ranking logic
+    
+    An engine is immutable once built, so one instance can be cached and
+    shared by every session: per-session settings are applied with
+    with_options, which returns a new engine, and every fitted model is
+    local to the request that fits it.
+    """
+    
+    def __init__(self, relevance_model='tfidf', vectorization='fitted', idf_store=None,
+                 update_idf_store=False, job_artifacts=None):
+        """
+        Initialize the scoring engine with weights and parameters
+        
+        Args:
+            relevance_model (str): 'tfidf' (pairwise TF-IDF cosine) or 'bm25' (BM25+ over the upload)
+            vectorization (str): 'fitted' refits a vocabulary per comparison; 'hashing' uses a fixed
+                hashed feature space over the original texts, with running document frequencies of
+                every distinct resume seen (see prepare_upload); 'global' scores transform-only against the persisted IDF of the
+                historical corpus (falling back to fitted TF-IDF while the store is empty)
+            idf_store (IDFStore): Vocabulary and document frequencies used by 'global'
+            update_idf_store (bool): Add each scored batch of resumes to the IDF store after scoring
+            job_artifacts (JobArtifactStore): Prepared job descriptions; keyword, skill and
+                experience extraction is skipped for them
+        """
+        self._validate_options(relevance_model, vectorization)
+        
+        # Scoring weights (should sum to 1.0); a component is only computed when it is weighted
+        # or always shown (keyword, skills, experience and TF-IDF)
+        self.relevance_model = relevance_model
+        self.weights = MappingProxyType(dict(RELEVANCE_MODELS[relevance_model]))
+        
+        # BM25+ parameters: term frequency saturation, length normalization and lower-bound bonus
+        self.bm25_params = MappingProxyType({'k1': 1.2, 'b': 0.75, 'delta': 1.0})
+        
+        self.vectorization = vectorization
+        self.idf_store = idf_store
+        self.update_idf_store = update_idf_store
+        self.job_artifacts = job_artifacts
+        self._shared = _SharedModels()
         
         # Common technical skills for matching
-        self.tech_skills_patterns = [
+        self.tech_skills_patterns = (
             r'\bpython\b', r'\bjava\b', r'\bjavascript\b', r'\bc\+\+\b', r'\bc#\b',
             r'\bruby\b', r'\bphp\b', r'\bgo\b', r'\trust\b', r'\bkotlin\b',
             r'\bhtml\b', r'\bcss\b', r'\breact\b', r'\bangular\b', r'\bvue\b',
             r'\bsql\b', r'\bmysql\b', r'\bpostgresql\b', r'\bmongodb\b',
             r'\baws\b', r'\bazure\b', r'\bgcp\b', r'\bdocker\b', r'\bkubernetes\b',
             r'\bmachine learning\b', r'\bdeep learning\b', r'\btensorflow\b', r'\bpytorch\b'
-        ]
+        )
+        self._tech_skills_regexes = tuple(re.compile(pattern, re.IGNORECASE) for pattern in self.tech_skills_patterns)
+    
+    @staticmethod
+    def _validate_options(relevance_model, vectorization):
+        """Reject unknown relevance models and vectorization modes"""
+        if relevance_model not in RELEVANCE_MODELS:
+            raise ValueError(f"Unknown relevance model: {relevance_model}")
+        if vectorization not in VECTORIZATION_MODES:
+            raise ValueError(f"Unknown vectorization mode: {vectorization}")
+    
+    def with_options(self, **options):
+        """
+        Derive an engine with different settings, leaving this one unchanged
+        
+        The derived engine shares compiled patterns and the running hashing
+        statistics with this one, so deriving per request is cheap.
+        
+        Args:
+            **options: Any of ENGINE_OPTIONS, with the same meaning as in __init__
+        
+        Returns:
+            ScoringEngine: This engine if nothing changes, otherwise a new engine
+        """
+        unknown = set(options) - set(ENGINE_OPTIONS)
+        if unknown:
+            raise TypeError(f"Unknown scoring engine options: {', '.join(sorted(unknown))}")
+        if all(getattr(self, name) == value for name, value in options.items()):
+            return self
+        
+        settings = {name: options.get(name, getattr(self, name)) for name in ENGINE_OPTIONS}
+        self._validate_options(settings['relevance_model'], settings['vectorization'])
+        
+        engine = copy.copy(self)
+        engine.__dict__.update(settings)
+        engine.weights = MappingProxyType(dict(RELEVANCE_MODELS[settings['relevance_model']]))
+        return engine
+    
+    def _prepared_job(self, job_desc_text):
+        """Prepared artifacts of an original job description, if they have been built"""
+        if self.job_artifacts is None:
+            return None
+        return self.job_artifacts.get(job_desc_text)
     
-    def calculate_scores(self, resume_text, job_desc_text, original_resume, original_job_desc):
+    def _job_keywords(self, job_desc_text):
+        """Keywords of an original job description"""
+        prepared = self._prepared_job(job_desc_text)
+        return prepared.keywords if prepared is not None else self._extract_keywords(job_desc_text.lower())
+    
+    def _job_tech_skills(self, job_desc_text):
+        """Technical skills of an original job description"""
+        prepared = self._prepared_job(job_desc_text)
+        return prepared.tech_skills if prepared is not None else self._extract_tech_skills(job_desc_text.lower())
+    
+    def _job_required_years(self, job_desc_text):
+        """Years of experience an original job description asks for"""
+        prepared = self._prepared_job(job_desc_text)
+        return prepared.required_years if prepared is not None else self._extract_years_experience(job_desc_text)
+    
+    @property
+    def hashing_tfidf(self):
+        """Hashing TF-IDF model with running document frequencies, built on first access"""
+        shared = self._shared
+        if shared.hashing_tfidf is None:
+            with shared.lock:
+                if shared.hashing_tfidf is None:
+                    from utils.hashing_vectorizer import HashingTfidf
+                    
+                    shared.hashing_tfidf = HashingTfidf()
+        return shared.hashing_tfidf
+    
+    def _new_vectorizer(self):
+        """A fresh TF-IDF vectorizer; each fit gets its own, so concurrent requests never share fitted state"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        return TfidfVectorizer(**TFIDF_PARAMS)
+    
+    @instrumentation.timed('scoring.calculate_scores')
+    def calculate_scores(self, resume_text, job_desc_text, original_resume, original_job_desc, bm25_stats=None):
         """
         Calculate comprehensive scores for a resume against job description
         
@@ -44,6 +233,8 @@ class ScoringEngine:
             job_desc_text (str): Preprocessed job description text
             original_resume (str): Original resume text
             original_job_desc (str): Original job description text
+            bm25_stats (BM25Statistics): Statistics of the upload the resume belongs to;
+                without them the resume is scored as a collection of one
             
         Returns:
             dict: Dictionary containing all calculated scores
@@ -60,18 +251,71 @@ class ScoringEngine:
         scores['experience_score'] = self._calculate_experience_score(original_resume, original_job_desc)
         
         # 4. TF-IDF similarity score
-        scores['tfidf_similarity'] = self._calculate_tfidf_similarity(resume_text, job_desc_text)
+        if self.vectorization == 'hashing':
+            scores['tfidf_similarity'] = self._calculate_hashing_similarity([original_resume], original_job_desc)[0]
+        else:
+            scores['tfidf_similarity'] = self._calculate_tfidf_similarity(resume_text, job_desc_text)
         
-        # 5. Calculate overall weighted score
+        # 5. BM25 relevance, when weighted
+        if self.weights.get('bm25_score'):
+            scores['bm25_score'] = self._calculate_batch_bm25_scores([original_resume], original_job_desc, bm25_stats)[0]
+        
+        # 6. Calculate overall weighted score
         scores['overall_score'] = self._calculate_overall_score(scores)
         
         return scores
     
+    @instrumentation.timed('scoring.calculate_batch_scores')
+    def calculate_batch_scores(self, resume_texts, job_desc_text, original_resumes, original_job_desc,
+                               bm25_stats=None):
+        """
+        Calculate scores for several resumes against the same job description
+        
+        Text is analyzed once for the whole batch, and each resume's TF-IDF
+        similarity equals a fit on that resume and the job description alone.
+        BM25+ scores depend on collection statistics, so they only stay the
+        same across batches when the caller passes the upload's bm25_stats.
+        
+        Args:
+            resume_texts (list): Preprocessed resume texts
+            job_desc_text (str): Preprocessed job description text
+            original_resumes (list): Original resume texts
+            original_job_desc (str): Original job description text
+            bm25_stats (BM25Statistics): Statistics of the whole upload; without them
+                BM25+ uses statistics of this batch alone
+        
+        Returns:
+            list: One score dictionary per resume, in input order
+        """
+        if self.vectorization == 'hashing':
+            similarities = self._calculate_hashing_similarity(original_resumes, original_job_desc)
+        else:
+            similarities = self._calculate_batch_tfidf_similarity(resume_texts, job_desc_text)
+        bm25_scores = (
+            self._calculate_batch_bm25_scores(original_resumes, original_job_desc, bm25_stats)
+            if self.weights.get('bm25_score') else None
+        )
+        
+        batch_scores = []
+        for i, (original_resume, similarity) in enumerate(zip(original_resumes, similarities)):
+            scores = {
+                'keyword_score': self._calculate_keyword_score(original_resume, original_job_desc),
+                'skills_score': self._calculate_skills_score(original_resume, original_job_desc),
+                'experience_score': self._calculate_experience_score(original_resume, original_job_desc),
+                'tfidf_similarity': similarity
+            }
+            if bm25_scores is not None:
+                scores['bm25_score'] = bm25_scores[i]
+            scores['overall_score'] = self._calculate_overall_score(scores)
+            batch_scores.append(scores)
+        
+        return batch_scores
+    
     def _calculate_keyword_score(self, resume_text, job_desc_text):
         """Calculate keyword matching score"""
         try:
             # Extract keywords from job description
-            job_keywords = self._extract_keywords(job_desc_text.lower())
+            job_keywords = self._job_keywords(job_desc_text)
             
             # Count matches in resume
             resume_lower = resume_text.lower()
@@ -91,7 +335,7 @@ class ScoringEngine:
         """Calculate technical skills matching score"""
         try:
             # Extract technical skills from both texts
-            job_skills = self._extract_tech_skills(job_desc_text.lower())
+            job_skills = self._job_tech_skills(job_desc_text)
             resume_skills = self._extract_tech_skills(resume_text.lower())
             
             if not job_skills:
@@ -110,7 +354,7 @@ class ScoringEngine:
         """Calculate experience-based score"""
         try:
             # Extract required experience from job description
-            required_years = self._extract_years_experience(job_desc_text)
+            required_years = self._job_required_years(job_desc_text)
             
             # Extract candidate experience from resume
             candidate_years = self._extract_years_experience(resume_text)
@@ -142,11 +386,15 @@ class ScoringEngine:
             if not resume_text or not job_desc_text:
                 return 0
             
+            if self.vectorization == 'global':
+                return self._calculate_batch_tfidf_similarity([resume_text], job_desc_text)[0]
+            
             # Fit TF-IDF on both texts
             corpus = [resume_text, job_desc_text]
-            tfidf_matrix = self.vectorizer.fit_transform(corpus)
+            tfidf_matrix = self._new_vectorizer().fit_transform(corpus)
             
             # Calculate cosine similarity
+            from sklearn.metrics.pairwise import cosine_similarity
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
             
             return similarity * 100  # Convert to percentage
@@ -154,6 +402,237 @@ class ScoringEngine:
         except Exception:
             return 0
     
+    @instrumentation.timed('scoring.tfidf_batch')
+    def _calculate_batch_tfidf_similarity(self, resume_texts, job_desc_text):
+        """Calculate TF-IDF cosine similarity of many resumes against one job description"""
+        similarities = [0] * len(resume_texts)
+        try:
+            if not job_desc_text:
+                return similarities
+            
+            # Only non-empty resumes take part in the fit
+            indices = [i for i, text in enumerate(resume_texts) if text]
+            if not indices:
+                return similarities
+            
+            if self.vectorization == 'global' and self.idf_store is not None:
+                return self._calculate_global_tfidf_similarity(resume_texts, job_desc_text, indices)
+            
+            products = self._pairwise_tfidf_similarities([resume_texts[i] for i in indices], job_desc_text)
+            for i, similarity in zip(indices, products):
+                similarities[i] = float(similarity) * 100  # Convert to percentage
+            
+            return similarities
+        
+        except Exception:
+            return similarities
+    
+    @property
+    def uses_upload_statistics(self):
+        """Whether scores depend on the whole upload (BM25+ or hashing), see prepare_upload"""
+        return bool(self.weights.get('bm25_score')) or self.vectorization == 'hashing'
+    
+    def prepare_upload(self, original_resumes):
+        """
+        Collect the statistics of an upload before any of its resumes is scored
+        
+        With 'hashing' vectorization the resumes are added to the running
+        document frequencies, so every batch of the upload is scored under the
+        same IDF; resumes already counted (same content hash) are not counted
+        again. With BM25+ the upload's collection statistics are built.
+        
+        Args:
+            original_resumes (list): Original resume texts of the whole upload
+        
+        Returns:
+            BM25Statistics: Statistics to pass to each scoring call, or None without BM25+
+        """
+        texts = [text for text in original_resumes if text]
+        if self.vectorization == 'hashing' and texts:
+            hashing_tfidf = self.hashing_tfidf
+            hashing_tfidf.partial_fit(
+                hashing_tfidf.transform(texts),
+                digests=[hashlib.sha256(text.encode('utf-8')).digest() for text in texts]
+            )
+        
+        return BM25Statistics.from_texts(texts) if self.weights.get('bm25_score') else None
+    
+    def _calculate_hashing_similarity(self, resume_texts, job_desc_text):
+        """
+        TF-IDF similarity in the hashed feature space under the running document frequencies
+        
+        Nothing is counted here; see prepare_upload.
+        
+        Args:
+            resume_texts (list): Original resume texts
+            job_desc_text (str): Original job description text
+        
+        Returns:
+            list: Similarity per resume (0-100), in input order
+        """
+        similarities = [0] * len(resume_texts)
+        try:
+            indices = [i for i, text in enumerate(resume_texts) if text]
+            if not job_desc_text or not indices:
+                return similarities
+            
+            hashing_tfidf = self.hashing_tfidf
+            products = hashing_tfidf.similarities(
+                hashing_tfidf.transform([resume_texts[i] for i in indices]),
+                hashing_tfidf.transform([job_desc_text])
+            )
+            for i, similarity in zip(indices, products):
+                similarities[i] = float(similarity)
+            return similarities
+        
+        except Exception:
+            return similarities
+    
+    def _calculate_global_tfidf_similarity(self, resume_texts, job_desc_text, indices):
+        """
+        TF-IDF similarity under the persisted corpus IDF
+        
+        Nothing is fitted on the batch, so a resume scores the same whichever
+        resumes it is uploaded with. The batch is added to the store only
+        after scoring, when learning is enabled.
+        """
+        similarities = [0] * len(resume_texts)
+        batch = [resume_texts[i] for i in indices]
+        
+        if self.idf_store.ready:
+            products = self.idf_store.similarities(batch, job_desc_text)
+            for i, similarity in zip(indices, products):
+                similarities[i] = float(similarity)
+        else:
+            # Empty store: score as fitted TF-IDF until statistics exist
+            products = self._pairwise_tfidf_similarities(batch, job_desc_text)
+            for i, similarity in zip(indices, products):
+                similarities[i] = float(similarity) * 100
+        
+        if self.update_idf_store:
+            try:
+                self.idf_store.add_documents(batch)
+            except Exception:
+                pass  # Learning is best effort; scores are already computed
+        
+        return similarities
+    
+    def _pairwise_tfidf_similarities(self, resume_texts, job_desc_text):
+        """
+        TF-IDF cosine of each resume against the job description, each as if fitted on that pair
+        
+        Gives the same result as one two-document TfidfVectorizer fit per resume,
+        but the batch is tokenized once and each pair is scored on its sparse
+        row: the pair's vocabulary is the union of both rows, cut to the most
+        frequent max_features terms in the same order as scikit-learn, and
+        smoothed IDF over two documents is 1 for shared terms and ln(3/2) + 1
+        otherwise.
+        
+        Args:
+            resume_texts (list): Non-empty preprocessed resume texts
+            job_desc_text (str): Preprocessed job description text
+        
+        Returns:
+            numpy.ndarray: Cosine similarity (0-1) per resume
+        """
+        import numpy as np
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        # Unlimited vocabulary, sorted alphabetically like the columns of a pair fit
+        counts = CountVectorizer(
+            **{**TFIDF_PARAMS, 'max_features': None}, dtype=np.float64
+        ).fit_transform([job_desc_text] + list(resume_texts)).tocsr()
+        
+        max_features = TFIDF_PARAMS['max_features']
+        unique_idf = np.log(3 / 2) + 1
+        job_terms, job_counts = counts[0].indices, counts[0].data
+        
+        similarities = np.zeros(len(resume_texts))
+        for row in range(1, counts.shape[0]):
+            start, end = counts.indptr[row], counts.indptr[row + 1]
+            terms = np.union1d(job_terms, counts.indices[start:end])
+            resume_tf = np.zeros(len(terms))
+            resume_tf[np.searchsorted(terms, counts.indices[start:end])] = counts.data[start:end]
+            job_tf = np.zeros(len(terms))
+            job_tf[np.searchsorted(terms, job_terms)] = job_counts
+            
+            if max_features is not None and len(terms) > max_features:
+                keep = (-(resume_tf + job_tf)).argsort()[:max_features]
+                resume_tf, job_tf = resume_tf[keep], job_tf[keep]
+            
+            idf = np.where((resume_tf > 0) & (job_tf > 0), 1.0, unique_idf)
+            resume_vector, job_vector = resume_tf * idf, job_tf * idf
+            norm = np.linalg.norm(resume_vector) * np.linalg.norm(job_vector)
+            similarities[row - 1] = resume_vector @ job_vector / norm if norm else 0.0
+        
+        return similarities
+    
+    @instrumentation.timed('scoring.bm25_batch')
+    def _calculate_batch_bm25_scores(self, resume_texts, job_desc_text, bm25_stats=None):
+        """
+        Score many resumes against the job description with BM25+
+        
+        Term weights and length normalization come from bm25_stats, so a
+        resume scores the same in any batch of the same upload; without them
+        the batch itself is the collection. Every resume is scored with a
+        single sparse matrix-vector product, with the job description's
+        distinct terms as the query. Scores are divided by the query's upper
+        bound (every term saturated) so they read as percentages.
+        
+        Args:
+            resume_texts (list): Original resume texts
+            job_desc_text (str): Original job description text
+            bm25_stats (BM25Statistics): Collection statistics of the upload
+        
+        Returns:
+            list: BM25+ relevance per resume (0-100), in input order
+        """
+        scores = [0] * len(resume_texts)
+        try:
+            indices = [i for i, text in enumerate(resume_texts) if text]
+            if not job_desc_text or not indices:
+                return scores
+            
+            import numpy as np
+            from sklearn.feature_extraction.text import CountVectorizer
+            
+            if bm25_stats is None:
+                bm25_stats = BM25Statistics.from_texts(resume_texts[i] for i in indices)
+            
+            vectorizer = CountVectorizer(**BM25_ANALYZER_PARAMS)
+            counts = vectorizer.fit_transform([job_desc_text] + [resume_texts[i] for i in indices]).tocsr()
+            query = counts[0].indices
+            docs = counts[1:].astype(np.float64)
+            if not len(query):
+                return scores
+            
+            k1, b, delta = self.bm25_params['k1'], self.bm25_params['b'], self.bm25_params['delta']
+            num_docs = bm25_stats.num_docs
+            avg_length = bm25_stats.avg_length or 1.0
+            terms = vectorizer.get_feature_names_out()
+            doc_freqs = np.array([bm25_stats.doc_freqs.get(terms[i], 0) for i in query], dtype=np.float64)
+            
+            # Non-negative Okapi IDF, for query terms only
+            query_weights = np.zeros(docs.shape[1])
+            query_weights[query] = np.log((num_docs - doc_freqs + 0.5) / (doc_freqs + 0.5) + 1)
+            
+            # Saturate each stored term frequency with its document's length normalization
+            doc_lengths = np.asarray(docs.sum(axis=1)).ravel()
+            row_lengths = np.repeat(doc_lengths, np.diff(docs.indptr))
+            tf = docs.data
+            docs.data = tf * (k1 + 1) / (tf + k1 * (1 - b + b * row_lengths / avg_length)) + delta
+            
+            raw = docs @ query_weights
+            upper_bound = query_weights.sum() * (k1 + 1 + delta)
+            
+            for i, value in zip(indices, raw):
+                scores[i] = float(value / upper_bound * 100) if upper_bound > 0 else 0
+            
+            return scores
+        
+        except Exception:
+            return scores
+    
     def _calculate_overall_score(self, scores):
         """Calculate weighted overall score"""
         try:
@@ -169,7 +648,7 @@ class ScoringEngine:
     def _extract_keywords(self, text):
         """Extract important keywords from text"""
         # Remove common stop words and extract meaningful words
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text)
+        words = normalize(text).words
         
         # Filter out very common words
         stop_words = {
@@ -189,8 +668,10 @@ class ScoringEngine:
         """Extract technical skills using regex patterns"""
         skills = set()
         
-        for pattern in self.tech_skills_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        # Single-line form so multi-word skills match across line breaks
+        text = normalize(text).flat
+        for regex in self._tech_skills_regexes:
+            matches = regex.findall(text)
             skills.update([match.lower() for match in matches])
         
         return skills
@@ -220,7 +701,7 @@ class ScoringEngine:
     def get_matched_keywords(self, resume_text, job_desc_text):
         """Get list of keywords that matched between resume and job description"""
         try:
-            job_keywords = set(self._extract_keywords(job_desc_text.lower()))
+            job_keywords = set(self._job_keywords(job_desc_text))
             resume_words = set(self._extract_keywords(resume_text.lower()))
             
             return list(job_keywords.intersection(resume_words))
@@ -228,6 +709,23 @@ class ScoringEngine:
         except Exception:
             return []
     
+    def get_batch_matched_keywords(self, resume_texts, job_desc_text):
+        """Get matched keywords for several resumes, extracting job keywords only once"""
+        try:
+            job_keywords = set(self._job_keywords(job_desc_text))
+        except Exception:
+            return [[] for _ in resume_texts]
+        
+        matched = []
+        for resume_text in resume_texts:
+            try:
+                resume_words = set(self._extract_keywords(resume_text.lower()))
+                matched.append(list(job_keywords.intersection(resume_words)))
+            except Exception:
+                matched.append([])
+        
+        return matched
+    
     def get_insights(self, resume_text, job_desc_text, scores):
         """Generate insights based on scoring results"""
         insights = []
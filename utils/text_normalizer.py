@@ -0,0 +1,95 @@
+import re
+from functools import lru_cache
+
+# Line and page breaks that separate lines in extracted text
+_LINE_BREAKS = re.compile(r'[\r\n\f\v\u2028\u2029]+')
+
+# Characters that are not word characters or basic punctuation
+_SPECIAL_CHARS = re.compile(r'[^\w\s\-.,;:()\[\]/@#&*+=<>|{}~`\'"!?%$]')
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Anything other than ASCII letters, digits and whitespace
+_NON_ALNUM = re.compile(r'[^a-zA-Z0-9\s]')
+
+# Alphabetic words of three or more letters, as used for keyword matching
+_ALPHA_WORDS = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+# Common resume section headings, matched case-insensitively with an optional trailing colon
+_SECTION_HEADING = re.compile(
+    r'(?:professional |work |technical |core |key )?'
+    r'(?:summary|profile|objective|experience|employment|work history|education|skills|competencies|'
+    r'projects|certifications?|awards|publications|languages|interests|references|achievements)'
+    r'(?: and [a-z ]+)?:?',
+    re.IGNORECASE
+)
+
+# Number of normalized documents kept, so every consumer of the same text shares one pass
+NORMALIZE_CACHE_SIZE = 512
+
+class NormalizedText:
+    """Result of normalizing one document"""
+    
+    __slots__ = ('text', 'flat', 'lines', 'sections', 'tokens', 'words')
+    
+    def __init__(self, lines, sections):
+        # Display text: single-spaced lines, line boundaries kept
+        self.lines = lines
+        self.text = "\n".join(lines)
+        
+        # The same text on one line, for phrase matching across line breaks
+        self.flat = " ".join(lines)
+        
+        # (heading, text) pairs; content before the first heading has an empty heading
+        self.sections = sections
+        
+        # Lowercase ASCII alphanumeric tokens
+        self.tokens = tuple(_NON_ALNUM.sub(' ', self.flat.lower()).split())
+        
+        # Alphabetic words of three or more letters, case preserved
+        self.words = tuple(_ALPHA_WORDS.findall(self.flat))
+
+def _is_section_heading(line):
+    """Whether a line looks like a section heading such as 'EXPERIENCE' or 'Technical Skills:'"""
+    if len(line) > 40:
+        return False
+    if _SECTION_HEADING.fullmatch(line):
+        return True
+    return line.isupper() and len(line.split()) <= 4 and any(c.isalpha() for c in line)
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize(text):
+    """
+    Normalize a document once for every downstream consumer
+    
+    Special characters are replaced, whitespace is collapsed within each
+    line and empty lines are dropped. Results are cached by text, so the
+    PDF cleaner, NLP fallback and keyword extraction share one pass.
+    
+    Args:
+        text (str): Raw or extracted text
+    
+    Returns:
+        NormalizedText: Display text, lines, sections and token streams
+    """
+    lines = []
+    sections = []
+    heading, section_lines = "", []
+    
+    for raw_line in _LINE_BREAKS.split(text or ""):
+        line = _WHITESPACE.sub(' ', _SPECIAL_CHARS.sub(' ', raw_line)).strip()
+        if not line:
+            continue
+        lines.append(line)
+        
+        if _is_section_heading(line):
+            if heading or section_lines:
+                sections.append((heading, "\n".join(section_lines)))
+            heading, section_lines = line.rstrip(':'), []
+        else:
+            section_lines.append(line)
+    
+    if heading or section_lines:
+        sections.append((heading, "\n".join(section_lines)))
+    
+    return NormalizedText(tuple(lines), tuple(sections))
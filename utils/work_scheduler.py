@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+from utils.instrumentation import instrumentation
+
+class FairWorkScheduler:
+    """Process-wide bounded worker pool that serves per-session queues in round-robin order"""
+    
+    def __init__(self, max_workers=4):
+        """
+        Initialize the scheduler
+        
+        Args:
+            max_workers (int): Worker threads shared by every session
+        """
+        self.max_workers = max(1, int(max_workers))
+        
+        # Sessions with pending work, in dispatch order; a session moves to the back after each task
+        self._sessions = OrderedDict()
+        self._running = Counter()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._stopped = False
+        
+        self._metrics = {
+            'tasks_submitted': 0,
+            'tasks_completed': 0,
+            'tasks_failed': 0,
+            'tasks_cancelled': 0,
+            'max_pending': 0,
+            'total_wait_seconds': 0.0
+        }
+    
+    def submit(self, session_id, fn, *args, **kwargs):
+        """
+        Queue a task for a session
+        
+        Args:
+            session_id (str): Session the task belongs to
+            fn (callable): Function to run on a worker
+            *args, **kwargs: Arguments for fn
+        
+        Returns:
+            Future: Resolves to the return value of fn
+        """
+        future = Future()
+        
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Scheduler has been shut down")
+            self._sessions.setdefault(session_id, deque()).append(
+                (future, fn, args, kwargs, time.perf_counter())
+            )
+            self._metrics['tasks_submitted'] += 1
+            self._metrics['max_pending'] = max(self._metrics['max_pending'], self._pending_count())
+            self._ensure_workers()
+            self._condition.notify()
+        
+        return future
+    
+    def cancel_session(self, session_id):
+        """
+        Drop a session's tasks that have not started, e.g. when its run is abandoned
+        
+        Args:
+            session_id (str): Session whose pending tasks are cancelled
+        
+        Returns:
+            int: Number of tasks cancelled
+        """
+        with self._condition:
+            tasks = self._sessions.pop(session_id, ())
+            self._metrics['tasks_cancelled'] += len(tasks)
+        
+        for task in tasks:
+            task[0].cancel()
+        return len(tasks)
+    
+    def get_status(self, session_id):
+        """
+        Get a session's place in the queue
+        
+        Args:
+            session_id (str): Session to report on
+        
+        Returns:
+            dict: 'pending' and 'running' tasks of the session, 'position' (sessions
+                served before its next task), 'active_sessions' and 'busy_workers'
+        """
+        with self._condition:
+            order = list(self._sessions)
+            pending = len(self._sessions.get(session_id, ()))
+            return {
+                'pending': pending,
+                'running': self._running[session_id],
+                'position': order.index(session_id) if pending else 0,
+                'active_sessions': len(set(order) | {s for s, n in self._running.items() if n}),
+                'busy_workers': sum(self._running.values()),
+                'max_workers': self.max_workers
+            }
+    
+    def get_metrics(self):
+        """
+        Get pool-wide load and throughput metrics
+        
+        Returns:
+            dict: Current scheduler metrics
+        """
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics['pending'] = self._pending_count()
+            metrics['queued_sessions'] = len(self._sessions)
+            metrics['busy_workers'] = sum(self._running.values())
+        
+        started = metrics['tasks_completed'] + metrics['tasks_failed']
+        metrics['avg_wait_ms'] = metrics['total_wait_seconds'] * 1000 / started if started else 0.0
+        metrics['max_workers'] = self.max_workers
+        return metrics
+    
+    def shutdown(self, wait=True):
+        """Stop accepting tasks and let the workers drain the queues"""
+        with self._condition:
+            self._stopped = True
+            workers = list(self._workers)
+            self._condition.notify_all()
+        
+        if wait:
+            for worker in workers:
+                worker.join()
+    
+    def _pending_count(self):
+        """Tasks waiting across all sessions; call with the condition held"""
+        return sum(len(tasks) for tasks in self._sessions.values())
+    
+    def _ensure_workers(self):
+        """Start worker threads up to the pool size; call with the condition held"""
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._run,
+                name=f"fair-work-scheduler-{len(self._workers)}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+    
+    def _next_task(self):
+        """Take one task from the session at the front, then move that session to the back"""
+        session_id, tasks = next(iter(self._sessions.items()))
+        task = tasks.popleft()
+        del self._sessions[session_id]
+        if tasks:
+            self._sessions[session_id] = tasks
+        return session_id, task
+    
+    def _run(self):
+        """Worker loop: take the next task in round-robin order and run it"""
+        while True:
+            with self._condition:
+                while not self._sessions and not self._stopped:
+                    self._condition.wait()
+                if not self._sessions:
+                    return
+                
+                session_id, (future, fn, args, kwargs, queued_at) = self._next_task()
+                if not future.set_running_or_notify_cancel():
+                    self._metrics['tasks_cancelled'] += 1
+                    continue
+                self._running[session_id] += 1
+                self._metrics['total_wait_seconds'] += time.perf_counter() - queued_at
+            
+            try:
+                with instrumentation.timer('work_scheduler.task'):
+                    result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+                outcome = 'tasks_failed'
+            else:
+                future.set_result(result)
+                outcome = 'tasks_completed'
+            
+            with self._condition:
+                self._running[session_id] -= 1
+                if not self._running[session_id]:
+                    del self._running[session_id]
+                self._metrics[outcome] += 1